@@ -0,0 +1,83 @@
+"""Benchmark writing and reading the node map as text and as binary table.
+
+The node map ``nodenr2svat.dxc`` is written by ``MetaModMapping`` in fixed
+width format and read back by the coupler with ``read_table``. With
+``binary_exchanges=True`` primod writes ``nodenr2svat.npy`` instead, which
+the coupler memory maps. Reading includes the computation of the zero based
+MODFLOW 6 node numbers, which touches every value of the memory mapped table.
+
+Usage::
+
+    python benchmarks/bench_binary_exchanges.py [nrow]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from primod.mapping import NodeSvatMapping
+from primod.mapping.mappingbase import write_binary_table
+
+from imod_coupler.table_reader import read_table
+
+NROW = 1_000_000
+
+
+def create_dataframe(nrow: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "mod_id": rng.integers(1, 9_999_999, nrow),
+            "free": "",
+            "svat": np.arange(1, nrow + 1),
+            "layer": np.ones(nrow, dtype=int),
+        }
+    )
+
+
+def write_text(path: Path, dataframe: pd.DataFrame) -> None:
+    mapping = NodeSvatMapping.__new__(NodeSvatMapping)
+    with open(path, "w") as f:
+        mapping.write_dataframe_fixed_width(f, dataframe)
+
+
+def write_binary(path: Path, dataframe: pd.DataFrame) -> None:
+    write_binary_table(path, dataframe[["mod_id", "svat", "layer"]].to_numpy())
+
+
+def read(path: Path) -> None:
+    table = read_table(path)
+    table[:, 0] - 1
+
+
+def main() -> None:
+    nrow = int(sys.argv[1]) if len(sys.argv) > 1 else NROW
+    dataframe = create_dataframe(nrow)
+    print(f"rows: {nrow}")
+    print(f"{'format':>7} {'write (s)':>10} {'read (s)':>9} {'size (MB)':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, filename, write in (
+            ("text", "nodenr2svat.dxc", write_text),
+            ("binary", "nodenr2svat.npy", write_binary),
+        ):
+            path = Path(tmp_dir) / filename
+            start = time.perf_counter()
+            write(path, dataframe)
+            write_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            read(path)
+            read_seconds = time.perf_counter() - start
+            print(
+                f"{label:>7} {write_seconds:>10.3f} {read_seconds:>9.3f} "
+                f"{path.stat().st_size / 1e6:>10.1f}"
+            )
+        text = read_table(Path(tmp_dir) / "nodenr2svat.dxc")
+        binary = read_table(Path(tmp_dir) / "nodenr2svat.npy")
+        assert np.array_equal(text, binary)
+
+
+if __name__ == "__main__":
+    main()
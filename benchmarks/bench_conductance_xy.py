@@ -0,0 +1,105 @@
+"""Benchmark the coordinates of the coupled cells of river packages.
+
+For every MODFLOW 6 river or drainage package actively coupled to Ribasim,
+``ActiveNodeBasinMapping`` looks up the x and y coordinate of each coupled
+cell. Compares the previous lookup, which built a full ``(y, x)`` meshgrid of
+coordinates per package and indexed it, to ``_get_conductance_xy``, which
+indexes the x and y arrays with the row and column of the coupled cells. The
+default network has the size of the Dutch national hydrological model (LHM):
+several layered packages of sparse cells on a 1300 x 1200 grid. Peak memory is
+measured with ``tracemalloc`` on top of the conductance grids.
+
+Usage::
+
+    python benchmarks/bench_conductance_xy.py [nrow] [ncol] [nlayer] [npackage]
+"""
+
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import numpy as np
+import xarray as xr
+from numpy.typing import NDArray
+from primod.mapping import ActiveNodeBasinMapping
+
+NROW = 1300
+NCOL = 1200
+NLAYER = 4
+NPACKAGE = 6
+# Fraction of the cells with a river or drain
+DENSITY = 0.1
+
+
+def create_packages(
+    nrow: int, ncol: int, nlayer: int, npackage: int
+) -> list[xr.DataArray]:
+    rng = np.random.default_rng(0)
+    coords = {
+        "layer": np.arange(1, nlayer + 1),
+        "y": np.arange(nrow, 0, -1, dtype=float) * 250.0,
+        "x": np.arange(ncol, dtype=float) * 250.0,
+    }
+    packages = []
+    for _ in range(npackage):
+        active = rng.random((nlayer, nrow, ncol)) < DENSITY / nlayer
+        conductance = np.where(active, 1.0, np.nan)
+        packages.append(
+            xr.DataArray(conductance, coords=coords, dims=("layer", "y", "x"))
+        )
+    return packages
+
+
+def conductance_xy_meshgrid(
+    conductance: xr.DataArray, include: NDArray[np.bool_]
+) -> NDArray[np.floating]:
+    x = conductance["x"].to_numpy()
+    y = conductance["y"].to_numpy()
+    n_per_layer = y.size * x.size
+    include2d = np.flatnonzero(include) % n_per_layer
+    yy, xx = np.meshgrid(y, x, indexing="ij")
+    xy = np.column_stack((xx.ravel(), yy.ravel()))
+    conductance_xy: NDArray[np.floating] = xy[include2d]
+    return conductance_xy
+
+
+def measure(
+    get_xy: Callable[[xr.DataArray, NDArray[np.bool_]], NDArray[np.floating]],
+    packages: list[tuple[xr.DataArray, NDArray[np.bool_]]],
+) -> tuple[float, float, list[NDArray[np.floating]]]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    # The mapping of each package is kept until the exchanges are written
+    output = [get_xy(conductance, include) for conductance, include in packages]
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1e6, output
+
+
+def main() -> None:
+    nrow = int(sys.argv[1]) if len(sys.argv) > 1 else NROW
+    ncol = int(sys.argv[2]) if len(sys.argv) > 2 else NCOL
+    nlayer = int(sys.argv[3]) if len(sys.argv) > 3 else NLAYER
+    npackage = int(sys.argv[4]) if len(sys.argv) > 4 else NPACKAGE
+    packages = [
+        (conductance, conductance.notnull().to_numpy())
+        for conductance in create_packages(nrow, ncol, nlayer, npackage)
+    ]
+    ncell = sum(int(include.sum()) for _, include in packages)
+    print(f"{npackage} packages of {nlayer} x {nrow} x {ncol}, {ncell} coupled cells")
+    output = {}
+    for label, get_xy in (
+        ("meshgrid", conductance_xy_meshgrid),
+        ("unravel", ActiveNodeBasinMapping._get_conductance_xy),
+    ):
+        seconds, peak, output[label] = measure(get_xy, packages)
+        print(f"{label:>9} {seconds:>8.3f} s {peak:>9.0f} MB peak")
+    for meshgrid_xy, unravel_xy in zip(output["meshgrid"], output["unravel"]):
+        np.testing.assert_array_equal(meshgrid_xy, unravel_xy)
+    print("output is identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Benchmark the construction of sparse coupling mappings.
+
+Times ``create_mapping`` for coupling tables from 1e3 up to 1e7 source-target
+pairs. The startup cost of a ``MemoryExchange`` should grow linearly with the
+number of coupled pairs.
+
+Usage::
+
+    python benchmarks/bench_create_mapping.py
+"""
+
+import time
+
+import numpy as np
+
+from imod_coupler.utils import create_mapping
+
+
+def bench(npairs: int, operator: str, repeat: int = 3) -> float:
+    rng = np.random.default_rng(0)
+    # n:1 coupling, comparable to svats coupled to MODFLOW 6 nodes
+    ntgt = max(npairs // 4, 1)
+    src_idx = np.arange(npairs, dtype=np.int32)
+    tgt_idx = rng.integers(0, ntgt, size=npairs).astype(np.int32)
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        create_mapping(src_idx, tgt_idx, npairs, ntgt, operator)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    print(f"{'pairs':>10} {'operator':>8} {'seconds':>10} {'ns/pair':>8}")
+    for npairs in (10**3, 10**4, 10**5, 10**6, 10**7):
+        for operator in ("sum", "avg"):
+            seconds = bench(npairs, operator)
+            print(
+                f"{npairs:>10} {operator:>8} {seconds:>10.4f} "
+                f"{seconds / npairs * 1e9:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark the cost per time step of logging an exchange to NetCDF.
+
+Writes an exchange array for up to 1e5 time steps with
+``NetcdfExchangeLogger``, and reports the mean time per write over the last
+steps before each checkpoint. The logger finds repeated times in memory, so
+the cost per write should stay constant as the file grows. For comparison,
+the previous lookup, which read the time variable back from the file on every
+write, is timed up to ``nsteps_readback`` steps: its cost per write grows
+linearly with the number of steps written.
+
+Usage::
+
+    python benchmarks/bench_exchange_logger.py [nsteps] [nid] [nsteps_readback]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from imod_coupler.logging.exchange_collector import NetcdfExchangeLogger
+
+NSTEPS = 100_000
+NID = 1_000
+NSTEPS_READBACK = 10_000
+# Number of writes the cost per write is averaged over
+WINDOW = 1_000
+
+
+class ReadBackExchangeLogger(NetcdfExchangeLogger):
+    """The previous lookup of repeated times, in the file itself"""
+
+    def write_exchange(
+        self, exchange: NDArray[Any], time: float, sync: bool = False
+    ) -> None:
+        if len(self.ds.dimensions) == 0:
+            self.initfile(len(exchange))
+        loc = np.where(self.timevar[:] == time)
+        if np.size(loc) > 0:
+            self.datavar[int(loc[0][0]), :] = exchange[:]
+        else:
+            self.timevar[self.pos] = time
+            self.datavar[self.pos, :] = exchange[:]
+            self.pos += 1
+
+
+def bench(
+    logger_type: type[NetcdfExchangeLogger],
+    output_dir: Path,
+    nsteps: int,
+    nid: int,
+) -> dict[int, float]:
+    exchange = np.random.default_rng(0).random(nid)
+    logger = logger_type("exchange", output_dir, {"type": "netcdf"})
+    checkpoints = [n for n in (1_000, 10_000, 100_000, 1_000_000) if n <= nsteps]
+    cost = {}
+    start = 0.0
+    for step in range(1, nsteps + 1):
+        if step % WINDOW == 1:
+            start = time.perf_counter()
+        logger.write_exchange(exchange, float(step))
+        if step in checkpoints:
+            cost[step] = (time.perf_counter() - start) / WINDOW
+    logger.finalize()
+    return cost
+
+
+def main() -> None:
+    nsteps = int(sys.argv[1]) if len(sys.argv) > 1 else NSTEPS
+    nid = int(sys.argv[2]) if len(sys.argv) > 2 else NID
+    nsteps_readback = int(sys.argv[3]) if len(sys.argv) > 3 else NSTEPS_READBACK
+    print(f"{nid} ids, microseconds per write over the last {WINDOW} steps")
+    print(f"{'steps':>9} {'in memory':>10} {'read back':>10}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        in_memory = bench(NetcdfExchangeLogger, Path(tmpdir) / "a", nsteps, nid)
+        read_back = bench(
+            ReadBackExchangeLogger, Path(tmpdir) / "b", nsteps_readback, nid
+        )
+    for step, seconds in in_memory.items():
+        readback = f"{read_back[step] * 1e6:>10.0f}" if step in read_back else ""
+        print(f"{step:>9} {seconds * 1e6:>10.0f} {readback}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark the slowdown of a coupled time loop by exchange logging.
+
+Runs a time loop of ``nsteps`` steps in which the kernels take ``step_ms``
+milliseconds and ``nexchange`` exchanges of ``nid`` values are logged to
+NetCDF every step. The kernels are simulated by a wait that releases the
+GIL, as the Fortran kernels do when called through ctypes. Compares the loop
+without logging, with synchronous logging, and with the asynchronous
+collector, which only copies the exchanges in the loop and writes them on a
+background thread.
+
+Usage::
+
+    python benchmarks/bench_exchange_logger_async.py [nsteps] [nid] [nexchange] [step_ms]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from imod_coupler.logging.exchange_collector import ExchangeCollector
+
+NSTEPS = 365
+NID = 200_000
+NEXCHANGE = 4
+STEP_MS = 20.0
+
+
+def run(
+    collector: ExchangeCollector | None,
+    nsteps: int,
+    nid: int,
+    nexchange: int,
+    step_ms: float,
+) -> float:
+    exchanges = np.random.default_rng(0).random((nexchange, nid))
+    start = time.perf_counter()
+    for step in range(nsteps):
+        time.sleep(step_ms / 1e3)
+        exchanges += 1.0
+        if collector is not None:
+            for i, exchange in enumerate(exchanges):
+                collector.log_exchange(f"exchange_{i}", exchange, float(step))
+    if collector is not None:
+        collector.finalize()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    nsteps = int(sys.argv[1]) if len(sys.argv) > 1 else NSTEPS
+    nid = int(sys.argv[2]) if len(sys.argv) > 2 else NID
+    nexchange = int(sys.argv[3]) if len(sys.argv) > 3 else NEXCHANGE
+    step_ms = float(sys.argv[4]) if len(sys.argv) > 4 else STEP_MS
+    print(f"{nsteps} steps of {step_ms} ms, {nexchange} exchanges of {nid} ids")
+    baseline = run(None, nsteps, nid, nexchange, step_ms)
+    print(f"{'no logging':>13} {baseline:>8.2f} s")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for label, asynchronous in (("synchronous", False), ("asynchronous", True)):
+            config = {
+                "general": {
+                    "output_dir": Path(tmpdir) / label,
+                    "asynchronous": asynchronous,
+                },
+                "exchanges": {
+                    f"exchange_{i}": {"type": "netcdf"} for i in range(nexchange)
+                },
+            }
+            collector = ExchangeCollector.from_config(config)
+            seconds = run(collector, nsteps, nid, nexchange, step_ms)
+            slowdown = (seconds / baseline - 1.0) * 100.0
+            print(f"{label:>13} {seconds:>8.2f} s {slowdown:>6.1f} % slower")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark the binary exchange logger against the NetCDF logger.
+
+Logs an exchange of ``nid`` values for ``nsteps`` time steps with
+``NetcdfExchangeLogger`` and with ``BinaryExchangeLogger``, storing float64
+and float32, and reports the mean time per write and the size of the file.
+The binary logger copies every time step into a memory mapped file, without
+a call into HDF5.
+
+Usage::
+
+    python benchmarks/bench_exchange_logger_binary.py [nsteps] [nid]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from imod_coupler.logging.exchange_collector import (
+    AbstractExchange,
+    BinaryExchangeLogger,
+    NetcdfExchangeLogger,
+    open_binary_exchange,
+)
+
+NSTEPS = 10_000
+NID = 10_000
+
+
+def bench(logger: AbstractExchange, nsteps: int, nid: int) -> float:
+    exchange = np.random.default_rng(0).random(nid)
+    start = time.perf_counter()
+    for step in range(nsteps):
+        exchange[step % nid] += 1.0
+        logger.write_exchange(exchange, float(step))
+    logger.finalize()
+    return (time.perf_counter() - start) / nsteps
+
+
+def main() -> None:
+    nsteps = int(sys.argv[1]) if len(sys.argv) > 1 else NSTEPS
+    nid = int(sys.argv[2]) if len(sys.argv) > 2 else NID
+    configurations: dict[
+        str,
+        tuple[
+            type[NetcdfExchangeLogger] | type[BinaryExchangeLogger],
+            dict[str, Any],
+            str,
+        ],
+    ] = {
+        "netcdf": (NetcdfExchangeLogger, {"type": "netcdf"}, ".nc"),
+        "binary f8": (BinaryExchangeLogger, {"type": "binary"}, ".bin"),
+        "binary f4": (
+            BinaryExchangeLogger,
+            {"type": "binary", "dtype": "float32"},
+            ".bin",
+        ),
+    }
+    print(f"{nsteps} steps of {nid} ids")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for label, (logger_type, settings, suffix) in configurations.items():
+            output_dir = Path(tmpdir) / label.replace(" ", "_")
+            logger = logger_type("exchange", output_dir, settings)
+            seconds = bench(logger, nsteps, nid)
+            size = (output_dir / f"exchange{suffix}").stat().st_size
+            print(f"{label:>10} {seconds * 1e6:>8.0f} us/write {size / 1e6:>9.1f} MB")
+        ds = open_binary_exchange(Path(tmpdir) / "binary_f8" / "exchange.bin")
+        assert ds["xchg"].shape == (nsteps, nid)
+
+
+if __name__ == "__main__":
+    main()
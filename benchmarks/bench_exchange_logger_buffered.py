@@ -0,0 +1,73 @@
+"""Benchmark buffered, chunked and compressed NetCDF exchange logging.
+
+Logs an exchange of ``nid`` values for ``nsteps`` time steps with
+``NetcdfExchangeLogger``, once per configuration of the output file: one
+write per time step with the default chunking of the NetCDF library, blocks
+of ``buffer_steps`` time steps in chunks of the same length, and the same
+with zlib compression. Reports the run time and the size of the file.
+Exchanges of a coupled model change little between time steps and contain
+repeated values, such as inactive cells; the benchmark exchange mimics that.
+
+Usage::
+
+    python benchmarks/bench_exchange_logger_buffered.py [nsteps] [nid] [buffer_steps]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from imod_coupler.logging.exchange_collector import NetcdfExchangeLogger
+
+NSTEPS = 3_650
+NID = 10_000
+BUFFER_STEPS = 100
+
+
+def bench(output_dir: Path, settings: dict[str, Any], nsteps: int, nid: int) -> float:
+    rng = np.random.default_rng(0)
+    exchange = np.round(rng.random(nid), 3)
+    exchange[rng.random(nid) < 0.3] = 0.0
+    logger = NetcdfExchangeLogger("exchange", output_dir, settings)
+    start = time.perf_counter()
+    for step in range(nsteps):
+        exchange[step % nid] += 1.0
+        logger.write_exchange(exchange, float(step))
+    logger.finalize()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    nsteps = int(sys.argv[1]) if len(sys.argv) > 1 else NSTEPS
+    nid = int(sys.argv[2]) if len(sys.argv) > 2 else NID
+    buffer_steps = int(sys.argv[3]) if len(sys.argv) > 3 else BUFFER_STEPS
+    configurations = {
+        "per step": {"type": "netcdf"},
+        "buffered": {
+            "type": "netcdf",
+            "buffer_steps": buffer_steps,
+            "chunk_time": buffer_steps,
+        },
+        "buffered zlib": {
+            "type": "netcdf",
+            "buffer_steps": buffer_steps,
+            "chunk_time": buffer_steps,
+            "zlib": True,
+            "complevel": 1,
+        },
+    }
+    print(f"{nsteps} steps of {nid} ids, blocks of {buffer_steps} steps")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for label, settings in configurations.items():
+            output_dir = Path(tmpdir) / label.replace(" ", "_")
+            seconds = bench(output_dir, settings, nsteps, nid)
+            size = (output_dir / "exchange.nc").stat().st_size
+            print(f"{label:>14} {seconds:>8.2f} s {size / 1e6:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark logging a selection of a large exchange.
+
+Logs both sides of an exchange of ``nid`` values, the size of the recharge
+exchange of the Dutch national hydrological model (LHM), as
+``MemoryExchange.log`` does, for ``nsteps`` time steps. Compares logging the
+full arrays to logging side "b" only, at ``nselect`` positions, every
+``time_stride``-th time step. Reports the mean time per logged time step of
+the loop and the size of the files.
+
+Usage::
+
+    python benchmarks/bench_exchange_logger_selection.py [nsteps] [nid] [nselect] [time_stride]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from imod_coupler.logging.exchange_collector import ExchangeCollector
+
+NSTEPS = 100
+NID = 1_500_000
+NSELECT = 10_000
+TIME_STRIDE = 5
+
+
+def bench(output_dir: Path, settings: dict[str, Any], nsteps: int, nid: int) -> float:
+    config = {
+        "general": {"output_dir": output_dir},
+        "exchanges": {"recharge": {"type": "netcdf", **settings}},
+    }
+    collector = ExchangeCollector.from_config(config)
+    rng = np.random.default_rng(0)
+    ptr_a = rng.random(nid)
+    ptr_b = rng.random(nid)
+    start = time.perf_counter()
+    for step in range(nsteps):
+        collector.log_exchange("recharge_a", ptr_a, float(step))
+        collector.log_exchange("recharge_b", ptr_b, float(step))
+    collector.finalize()
+    return (time.perf_counter() - start) / nsteps
+
+
+def main() -> None:
+    nsteps = int(sys.argv[1]) if len(sys.argv) > 1 else NSTEPS
+    nid = int(sys.argv[2]) if len(sys.argv) > 2 else NID
+    nselect = int(sys.argv[3]) if len(sys.argv) > 3 else NSELECT
+    time_stride = int(sys.argv[4]) if len(sys.argv) > 4 else TIME_STRIDE
+    index = np.sort(np.random.default_rng(1).choice(nid, nselect, replace=False))
+    configurations: dict[str, dict[str, Any]] = {
+        "full": {"side": "both"},
+        "selection": {
+            "side": "b",
+            "index": index.tolist(),
+            "time_stride": time_stride,
+        },
+    }
+    print(
+        f"{nsteps} steps of {nid} ids, selection of side b at {nselect} ids "
+        f"every {time_stride} steps"
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for label, settings in configurations.items():
+            output_dir = Path(tmpdir) / label
+            seconds = bench(output_dir, settings, nsteps, nid)
+            size = sum(path.stat().st_size for path in output_dir.iterdir())
+            print(f"{label:>10} {seconds * 1e3:>8.2f} ms/step {size / 1e6:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
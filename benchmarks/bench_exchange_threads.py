@@ -0,0 +1,97 @@
+"""Benchmark the speedup of threaded ``MemoryExchange`` against thread count.
+
+The couplings have the size of the Dutch national hydrological model (LHM):
+about 2.5 million MetaSWAP svats coupled to the first layer of a MODFLOW 6
+model with 1.3 million cells per layer. The sparse storage coupling (n:1)
+and the one-to-one recharge coupling are timed separately.
+
+The speedup is bounded by memory bandwidth, and no speedup can be expected
+on a machine with a single core.
+
+Usage::
+
+    python benchmarks/bench_exchange_threads.py [max_threads]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+from loguru import logger
+
+from imod_coupler.logging.exchange_collector import ExchangeCollector
+from imod_coupler.utils import MemoryExchange
+
+NSVAT = 2_500_000
+NNODE_LAYER = 1_300_000
+
+
+def create_storage_exchange(n_threads: int) -> MemoryExchange:
+    rng = np.random.default_rng(0)
+    ptr_a = rng.random(NSVAT)
+    ptr_b = rng.random(3 * NNODE_LAYER)
+    ptr_a_index = np.arange(NSVAT, dtype=np.int32)
+    ptr_b_index = np.sort(rng.integers(0, NNODE_LAYER, size=NSVAT)).astype(np.int32)
+    return MemoryExchange(
+        ptr_a,
+        ptr_b,
+        ptr_a_index,
+        ptr_b_index,
+        ExchangeCollector(),
+        "storage",
+        exchange_operator="sum",
+        n_threads=n_threads,
+    )
+
+
+def create_recharge_exchange(n_threads: int) -> MemoryExchange:
+    rng = np.random.default_rng(0)
+    ptr_a = rng.random(NSVAT)
+    ptr_b = rng.random(NSVAT)
+    index = np.arange(NSVAT, dtype=np.int32)
+    return MemoryExchange(
+        ptr_a,
+        ptr_b,
+        index,
+        index,
+        ExchangeCollector(),
+        "recharge",
+        ptr_b_conversion=rng.random(NSVAT),
+        n_threads=n_threads,
+    )
+
+
+def time_exchange(exchange: MemoryExchange, repeat: int = 20) -> float:
+    exchange.exchange(2.0)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        exchange.exchange(2.0)
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    logger.remove()
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    thread_counts = [1]
+    while thread_counts[-1] * 2 <= max_threads:
+        thread_counts.append(thread_counts[-1] * 2)
+
+    print(f"cores available: {os.cpu_count()}")
+    print(f"{'coupling':>9} {'threads':>8} {'ms/call':>9} {'speedup':>8}")
+    for label, create in (
+        ("storage", create_storage_exchange),
+        ("recharge", create_recharge_exchange),
+    ):
+        reference = None
+        for n_threads in thread_counts:
+            seconds = time_exchange(create(n_threads))
+            reference = seconds if reference is None else reference
+            print(
+                f"{label:>9} {n_threads:>8} {seconds * 1e3:>9.3f} "
+                f"{reference / seconds:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
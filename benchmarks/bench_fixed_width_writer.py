@@ -0,0 +1,67 @@
+"""Benchmark writing ``nodenr2svat.dxc`` with ``MetaModMapping``.
+
+Compares formatting every value with ``format_fixed_width``, row by row, to
+the column formatter of ``write_dataframe_fixed_width``, and checks that both
+write the same bytes. The default size is that of the Dutch national
+hydrological model (LHM).
+
+Usage::
+
+    python benchmarks/bench_fixed_width_writer.py [nrow]
+"""
+
+import io
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from imod.msw.fixed_format import format_fixed_width
+from primod.mapping import NodeSvatMapping
+
+NROW = 2_500_000
+
+
+def create_dataframe(nrow: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "mod_id": rng.integers(1, 9_999_999, nrow),
+            "free": "",
+            "svat": np.arange(1, nrow + 1),
+            "layer": np.ones(nrow, dtype=int),
+        }
+    )
+
+
+def write_rows(file: io.StringIO, dataframe: pd.DataFrame) -> None:
+    metadata_dict = NodeSvatMapping._metadata_dict
+    for row in dataframe.itertuples():
+        for index, metadata in enumerate(metadata_dict.values()):
+            file.write(format_fixed_width(row[index + 1], metadata))
+        file.write("\n")
+
+
+def write_columns(file: io.StringIO, dataframe: pd.DataFrame) -> None:
+    mapping = NodeSvatMapping.__new__(NodeSvatMapping)
+    mapping.write_dataframe_fixed_width(file, dataframe)
+
+
+def main() -> None:
+    nrow = int(sys.argv[1]) if len(sys.argv) > 1 else NROW
+    dataframe = create_dataframe(nrow)
+    print(f"rows: {nrow}")
+    results = {}
+    for label, write in (("rows", write_rows), ("columns", write_columns)):
+        file = io.StringIO()
+        start = time.perf_counter()
+        write(file, dataframe)
+        seconds = time.perf_counter() - start
+        results[label] = file.getvalue()
+        print(f"{label:>8} {seconds:>9.3f} s")
+    assert results["rows"] == results["columns"]
+    print("output is identical")
+
+
+if __name__ == "__main__":
+    main()
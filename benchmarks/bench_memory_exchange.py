@@ -0,0 +1,107 @@
+"""Benchmark the runtime and allocations of ``MemoryExchange.exchange``.
+
+Compares the original expression, which allocates temporaries of the target
+array, with the exchange that works in preallocated buffers. The target array
+is larger than the number of coupled targets, as for the storage coupling to
+all layers of MODFLOW 6: the exchange only touches the coupled rows.
+
+For one-to-one couplings, such as recharge, the gather kernel is compared with
+the sparse mat-vec.
+
+Usage::
+
+    python benchmarks/bench_memory_exchange.py
+"""
+
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import numpy as np
+
+from imod_coupler.logging.exchange_collector import ExchangeCollector
+from imod_coupler.utils import ExchangeStrategy, MemoryExchange
+
+
+def create_exchange(nsvat: int) -> MemoryExchange:
+    rng = np.random.default_rng(0)
+    # MetaSWAP storage -> MODFLOW 6 storage of a three layer model
+    nnode = 3 * nsvat // 2
+    ptr_a = rng.random(nsvat)
+    ptr_b = rng.random(nnode)
+    ptr_a_index = np.arange(nsvat, dtype=np.int32)
+    ptr_b_index = rng.integers(0, nsvat // 2, size=nsvat).astype(np.int32)
+    return MemoryExchange(
+        ptr_a,
+        ptr_b,
+        ptr_a_index,
+        ptr_b_index,
+        ExchangeCollector(),
+        "storage",
+        exchange_operator="sum",
+    )
+
+
+def create_one_to_one_exchange(nsvat: int) -> MemoryExchange:
+    rng = np.random.default_rng(0)
+    # MetaSWAP volume -> MODFLOW 6 recharge, one svat per recharge cell
+    ptr_a = rng.random(nsvat)
+    ptr_b = rng.random(nsvat)
+    index = np.arange(nsvat, dtype=np.int32)
+    return MemoryExchange(
+        ptr_a,
+        ptr_b,
+        index,
+        index,
+        ExchangeCollector(),
+        "recharge",
+        ptr_b_conversion=rng.random(nsvat),
+    )
+
+
+def legacy_exchange(exchange: MemoryExchange, delt: float) -> None:
+    exchange.ptr_b[:] = (
+        exchange.mask[:] * exchange.ptr_b[:]
+        + exchange.mapping.dot(exchange.ptr_a)[:] / delt
+    )
+
+
+def measure(func: Callable[[], None], ncall: int) -> tuple[float, float]:
+    func()  # warm up
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(ncall):
+        func()
+    seconds = (time.perf_counter() - start) / ncall
+    return seconds, peak
+
+
+def main() -> None:
+    print(f"{'svats':>9} {'variant':>9} {'ms/call':>9} {'peak alloc [kB]':>16}")
+    for nsvat in (10**4, 10**5, 10**6):
+        exchange = create_exchange(nsvat)
+        ncall = max(10**7 // nsvat, 10)
+        variants: dict[str, Callable[[], None]] = {
+            "legacy": lambda: legacy_exchange(exchange, 2.0),
+            "buffered": lambda: exchange.exchange(2.0),
+        }
+        for name, func in variants.items():
+            seconds, peak = measure(func, ncall)
+            print(f"{nsvat:>9} {name:>9} {seconds * 1e3:>9.3f} {peak / 1e3:>16.1f}")
+
+    print()
+    print(f"{'svats':>9} {'strategy':>9} {'ms/call':>9}")
+    for nsvat in (10**4, 10**5, 10**6):
+        exchange = create_one_to_one_exchange(nsvat)
+        ncall = max(10**7 // nsvat, 10)
+        for strategy in (ExchangeStrategy.SPARSE, ExchangeStrategy.GATHER):
+            exchange.strategy = strategy
+            seconds, _ = measure(lambda: exchange.exchange(2.0), ncall)
+            print(f"{nsvat:>9} {strategy.value:>9} {seconds * 1e3:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark the resolution of (svat, layer) pairs to MetaSWAP indexes.
+
+Compares the dictionary keyed by (svat, layer) tuples, with a lookup per
+row, to ``SvatLookup``, which searches int64 keys in a sorted array. The
+node map couples every svat, as in ``MetaMod.get_coupled_nodes``.
+
+Usage::
+
+    python benchmarks/bench_svat_lookup.py
+"""
+
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from imod_coupler.utils import SvatLookup
+
+
+def dict_lookup(
+    svat_id: NDArray[np.int32],
+    svat_lay: NDArray[np.int32],
+    svat: NDArray[np.int32],
+    svat_layer: NDArray[np.int32],
+) -> NDArray[np.int32]:
+    svat_lookup: dict[tuple[np.int32, np.int32], int] = {}
+    for vi in range(svat_id.size):
+        svat_lookup[(svat_id[vi], svat_lay[vi])] = vi
+    return np.array(
+        [svat_lookup[svat[ii], svat_layer[ii]] for ii in range(len(svat))],
+        dtype=np.int32,
+    )
+
+
+def sorted_lookup(
+    svat_id: NDArray[np.int32],
+    svat_lay: NDArray[np.int32],
+    svat: NDArray[np.int32],
+    svat_layer: NDArray[np.int32],
+) -> NDArray[np.int32]:
+    return SvatLookup(svat_id, svat_lay).index(svat, svat_layer)
+
+
+def measure(
+    func: Callable[..., NDArray[np.int32]], *args: NDArray[np.int32]
+) -> tuple[float, float, NDArray[np.int32]]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2**20, result
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'svats':>9} {'dict s':>9} {'dict MB':>9} {'sorted s':>9} {'sorted MB':>9}")
+    for nsvat in (10_000, 100_000, 1_000_000):
+        # two svats per cell for half of the cells
+        svat_id = np.repeat(np.arange(1, nsvat // 2 + 1, dtype=np.int32), 2)
+        svat_lay = np.tile(np.array([1, 2], dtype=np.int32), nsvat // 2)
+        order = rng.permutation(nsvat)
+        svat, svat_layer = svat_id[order], svat_lay[order]
+        dict_s, dict_mb, expected = measure(
+            dict_lookup, svat_id, svat_lay, svat, svat_layer
+        )
+        sorted_s, sorted_mb, result = measure(
+            sorted_lookup, svat_id, svat_lay, svat, svat_layer
+        )
+        assert np.array_equal(result, expected)
+        print(
+            f"{nsvat:>9} {dict_s:>9.3f} {dict_mb:>9.1f} "
+            f"{sorted_s:>9.3f} {sorted_mb:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
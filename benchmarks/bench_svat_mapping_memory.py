@@ -0,0 +1,116 @@
+"""Benchmark the peak memory of deriving and writing ``nodenr2svat.dxc``.
+
+Compares the previous derivation, which tiled the MODFLOW 6 node numbers to a
+full ``(subunit, y, x)`` grid and indexed the raveled grids, to
+``NodeSvatMapping``, which keeps one ``(y, x)`` grid of node numbers and
+writes the file in blocks of rows. Peak memory is measured with
+``tracemalloc`` on top of the svat grid, which both start from. The default
+size is that of the Dutch national hydrological model (LHM).
+
+Usage::
+
+    python benchmarks/bench_svat_mapping_memory.py [nrow] [ncol] [nsubunit]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import xarray as xr
+from imod import mf6
+from primod.mapping import NodeSvatMapping
+
+NROW = 1300
+NCOL = 1200
+NSUBUNIT = 8
+
+
+def create_grids(
+    nrow: int, ncol: int, nsubunit: int
+) -> tuple[xr.DataArray, mf6.StructuredDiscretization]:
+    rng = np.random.default_rng(0)
+    coords = {
+        "subunit": np.arange(nsubunit),
+        "y": np.arange(nrow, 0, -1, dtype=float),
+        "x": np.arange(ncol, dtype=float),
+    }
+    active = rng.random((nsubunit, nrow, ncol)) < 0.5
+    svat = np.zeros(active.shape, dtype=np.int64)
+    svat[active] = np.arange(1, active.sum() + 1)
+    svat_da = xr.DataArray(svat, coords=coords, dims=("subunit", "y", "x"))
+    like = xr.ones_like(svat_da.isel(subunit=0, drop=True), dtype=float)
+    dis = mf6.StructuredDiscretization(
+        top=1.0,
+        bottom=like.expand_dims(layer=[1]) * 0.0,
+        idomain=like.expand_dims(layer=[1]).astype(int),
+    )
+    return svat_da, dis
+
+
+def write_tiled(
+    svat: xr.DataArray, dis: mf6.StructuredDiscretization, directory: Path
+) -> None:
+    index = (svat != 0).to_numpy().ravel()
+    idomain_active = (dis["idomain"].sel(layer=1, drop=True) >= 1).to_numpy()
+    mod_id = xr.full_like(svat, fill_value=0, dtype=np.int64)
+    mod_id_1d = np.tile(
+        np.arange(1, idomain_active.sum() + 1), (svat["subunit"].size, 1)
+    )
+    mod_id.to_numpy()[:, idomain_active] = mod_id_1d
+    layer = xr.full_like(svat, 1)
+    columns = {
+        "mod_id": mod_id.to_numpy().ravel()[index],
+        "svat": svat.to_numpy().ravel()[index],
+        "layer": layer.to_numpy().ravel()[index],
+    }
+    mapping = NodeSvatMapping.__new__(NodeSvatMapping)
+    with open(directory / NodeSvatMapping._file_name, "w") as f:
+        mapping.write_columns_fixed_width(f, columns)
+
+
+def write_blocks(
+    svat: xr.DataArray, dis: mf6.StructuredDiscretization, directory: Path
+) -> None:
+    index = (svat != 0).to_numpy().ravel()
+    NodeSvatMapping(svat, dis, index=index).write(directory)
+
+
+def measure(
+    write: Callable[[xr.DataArray, mf6.StructuredDiscretization, Path], None],
+    svat: xr.DataArray,
+    dis: mf6.StructuredDiscretization,
+    directory: Path,
+) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    write(svat, dis, directory)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1e6
+
+
+def main() -> None:
+    nrow = int(sys.argv[1]) if len(sys.argv) > 1 else NROW
+    ncol = int(sys.argv[2]) if len(sys.argv) > 2 else NCOL
+    nsubunit = int(sys.argv[3]) if len(sys.argv) > 3 else NSUBUNIT
+    svat, dis = create_grids(nrow, ncol, nsubunit)
+    print(f"grid: {nsubunit} x {nrow} x {ncol}, svat grid {svat.nbytes / 1e6:.0f} MB")
+    output = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for label, write in (("tiled", write_tiled), ("blocks", write_blocks)):
+            directory = Path(tmpdir) / label
+            directory.mkdir()
+            seconds, peak = measure(write, svat, dis, directory)
+            output[label] = (directory / NodeSvatMapping._file_name).read_bytes()
+            print(f"{label:>8} {seconds:>8.2f} s {peak:>9.0f} MB peak")
+    assert output["tiled"] == output["blocks"]
+    print("output is identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark reading a national-size exchange table.
+
+The table has the size of the node map of the Dutch national hydrological
+model (LHM): 2.5 million rows in the fixed-width format of ``.dxc`` files.
+``read_table`` is compared to parsing the lines in Python and to
+``np.loadtxt`` into the default integer type followed by a conversion to
+``np.int32``, as the ``.tsv`` maps were read before.
+
+Usage::
+
+    python benchmarks/bench_table_reader.py [nrow]
+"""
+
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+from imod_coupler.table_reader import read_table
+
+NROW = 2_500_000
+
+
+def write_table(path: Path, nrow: int) -> None:
+    rng = np.random.default_rng(0)
+    table = np.column_stack(
+        [
+            rng.integers(1, 20_000_000, nrow),
+            np.arange(1, nrow + 1),
+            rng.integers(1, 3, nrow),
+        ]
+    )
+    np.savetxt(path, table, fmt="%10d%10d%2d")
+
+
+def python_lines(path: Path) -> NDArray[np.int32]:
+    with open(path) as f:
+        return np.array([line.split() for line in f], dtype=np.int32)
+
+
+def loadtxt_int64(path: Path) -> NDArray[np.int32]:
+    return np.loadtxt(path, dtype=int, ndmin=2).astype(np.int32)
+
+
+def time_reader(reader: Callable[[Path], NDArray[np.int32]], path: Path) -> float:
+    start = time.perf_counter()
+    reader(path)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    nrow = int(sys.argv[1]) if len(sys.argv) > 1 else NROW
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "nodenr2svat.dxc"
+        write_table(path, nrow)
+        reference = read_table(path)
+        print(f"rows: {nrow}, size: {path.stat().st_size / 1e6:.0f} MB")
+        print(f"{'reader':>14} {'seconds':>9} {'relative':>9}")
+        seconds = {}
+        for label, reader in (
+            ("python lines", python_lines),
+            ("loadtxt int64", loadtxt_int64),
+            ("read_table", read_table),
+        ):
+            assert np.array_equal(reader(path), reference)
+            seconds[label] = min(time_reader(reader, path) for _ in range(3))
+        for label, value in seconds.items():
+            print(f"{label:>14} {value:>9.3f} {value / seconds['read_table']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,9 @@ from loguru import logger
 from imod_coupler import __version__
 from imod_coupler.config import BaseConfig
 from imod_coupler.drivers.driver import get_driver
+from imod_coupler.instrumentation import instrumentation
 from imod_coupler.parser import parse_args
-from imod_coupler.utils import setup_logger
+from imod_coupler.utils import set_exchange_threads, setup_logger
 
 
 def main() -> None:
@@ -37,6 +38,8 @@ def run_coupler(config_path: Path) -> None:
     base_config = BaseConfig(**config_dict)
     setup_logger(base_config.log_level, config_dir / "imod_coupler.log")
     logger.info(f"iMOD Coupler {__version__}")
+    set_exchange_threads(base_config.exchange_threads)
+    instrumentation.enabled = base_config.timing
 
     if base_config.timing:
         start = time.perf_counter()
@@ -1,6 +1,6 @@
 from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PositiveInt
 
 
 class LogLevel(str, Enum):
@@ -25,3 +25,8 @@ class BaseConfig(BaseModel):
     driver_type: DriverType
     driver: BaseModel
     modflow_newton_formulation: bool = False
+    exchange_threads: PositiveInt = 1
+    # The kernels open their input relative to the working directory of the
+    # process, so they only initialize at the same time when they share a
+    # work_dir; kernels in different work_dirs wait for each other.
+    concurrent_initialization: bool = False
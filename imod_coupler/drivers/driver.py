@@ -3,12 +3,16 @@ from __future__ import annotations
 import os
 import sys
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from time import perf_counter
 from typing import Any
 
 from loguru import logger
 
 from imod_coupler.config import BaseConfig
+from imod_coupler.kernelwrappers.working_directory import working_directory_lock
 
 
 def resolve_path(libname: str) -> str:
@@ -31,6 +35,54 @@ def resolve_path(libname: str) -> str:
     return libname  # if resolution failed, give it back to the call site
 
 
+def initialize_kernels(
+    tasks: dict[str, Callable[[], None]], concurrent: bool, timing: bool
+) -> None:
+    """
+    Run the initialization tasks of the kernels, in parallel threads when
+    `concurrent` is true. The kernels release the GIL while initializing, and
+    kernels that depend on the working directory take `working_directory_lock`,
+    so kernels in different working directories still run one after the other.
+    With `timing`, the wall-clock time is logged and compared to the time the
+    tasks would take one after the other, and whether a kernel had to wait for
+    the working directory of another.
+    """
+    seconds: dict[str, float] = {}
+    waits = working_directory_lock.waits
+
+    def run(label: str, task: Callable[[], None]) -> None:
+        start = perf_counter()
+        task()
+        seconds[label] = perf_counter() - start
+
+    start = perf_counter()
+    if concurrent and len(tasks) > 1:
+        with ThreadPoolExecutor(
+            max_workers=len(tasks), thread_name_prefix="initialize"
+        ) as pool:
+            futures = [pool.submit(run, label, task) for label, task in tasks.items()]
+            for future in futures:
+                future.result()
+    else:
+        for label, task in tasks.items():
+            run(label, task)
+    wall_clock = perf_counter() - start
+
+    if timing:
+        for label, task_seconds in seconds.items():
+            logger.info(f"Initialization of {label}: {task_seconds:0.4f} seconds")
+        sequential = sum(seconds.values())
+        logger.info(
+            f"Kernel initialization took {wall_clock:0.4f} seconds, "
+            f"{sequential - wall_clock:0.4f} seconds less than one after the other"
+        )
+        if concurrent and working_directory_lock.waits > waits:
+            logger.info(
+                "The kernels could not initialize at the same time: kernels in "
+                "different working directories wait for each other"
+            )
+
+
 class Driver(ABC):
     """Driver base class
 
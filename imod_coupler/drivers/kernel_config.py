@@ -11,6 +11,11 @@ class Modflow6(BaseModel):
     def resolve_dll(cls, dll: FilePath) -> FilePath:
         return dll.resolve()
 
+    @field_validator("work_dir")
+    @classmethod
+    def resolve_work_dir(cls, work_dir: DirectoryPath) -> DirectoryPath:
+        return work_dir.resolve()
+
     @field_validator("dll_dep_dir")
     @classmethod
     def resolve_dll_dep_dir(
@@ -31,6 +36,11 @@ class Metaswap(BaseModel):
     def resolve_dll(cls, dll: FilePath) -> FilePath:
         return dll.resolve()
 
+    @field_validator("work_dir")
+    @classmethod
+    def resolve_work_dir(cls, work_dir: DirectoryPath) -> DirectoryPath:
+        return work_dir.resolve()
+
     @field_validator("dll_dep_dir")
     @classmethod
     def resolve_dll_dep_dir(
@@ -51,6 +61,11 @@ class Ribasim(BaseModel):
     def resolve_dll(cls, dll: FilePath) -> FilePath:
         return dll.resolve()
 
+    @field_validator("config_file")
+    @classmethod
+    def resolve_config_file(cls, config_file: FilePath) -> FilePath:
+        return config_file.resolve()
+
     @field_validator("dll_dep_dir")
     @classmethod
     def resolve_dll_dep_dir(
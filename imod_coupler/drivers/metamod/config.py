@@ -28,6 +28,7 @@ class Coupling(BaseModel):
     mf6_node_max_layer: FilePath | None = None
 
     output_config_file: FilePath | None = None
+    mapping_cache: bool = False  # cache the coupled indexes next to the node map
 
     @field_validator("mf6_msw_node_map", "mf6_msw_recharge_map", "output_config_file")
     @classmethod
@@ -6,6 +6,7 @@ description:
 
 from __future__ import annotations
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -14,17 +15,20 @@ from loguru import logger
 from numpy.typing import NDArray
 
 from imod_coupler.config import BaseConfig
-from imod_coupler.drivers.driver import Driver
+from imod_coupler.drivers.driver import Driver, initialize_kernels
 from imod_coupler.drivers.metamod.config import MetaModConfig
 from imod_coupler.drivers.metamod.utils import (
     CoupledPhreaticHeads,
     CoupledPhreaticRecharge,
     CoupledPhreaticStorage,
 )
+from imod_coupler.instrumentation import instrumentation
 from imod_coupler.kernelwrappers.mf6_wrapper import Mf6Wrapper
 from imod_coupler.kernelwrappers.msw_wrapper import MswWrapper
 from imod_coupler.logging.exchange_collector import ExchangeCollector
-from imod_coupler.utils import MemoryExchange
+from imod_coupler.mapping_cache import MappingCache
+from imod_coupler.table_reader import read_table
+from imod_coupler.utils import ExchangePlan, MemoryExchange, SvatLookup
 
 
 class MetaMod(Driver):
@@ -36,11 +40,17 @@ class MetaMod(Driver):
     timing: bool  # true, when timing is enabled
     mf6: Mf6Wrapper  # the MODFLOW 6 XMI kernel
     msw: MswWrapper  # the MetaSWAP XMI kernel
+    mapping_cache: MappingCache | None  # cache of the coupled indexes, if enabled
+    coupled_nodes: Future[
+        dict[str, NDArray[np.int32]]
+    ]  # the coupled indexes, read while the kernels initialize
 
     delt: float  # time step from MODFLOW 6 (leading)
 
     enable_sprinkling_groundwater: bool = False
 
+    exchange_logger: ExchangeCollector  # writes the logged exchanges, if configured
+    exchange_plan: ExchangePlan  # fused MetaSWAP to MODFLOW 6 exchanges per iteration
     couplings: dict[
         str,
         MemoryExchange
@@ -56,6 +66,13 @@ class MetaMod(Driver):
         self.coupling_config = metamod_config.coupling[
             0
         ]  # Adapt as soon as we have multimodel support
+        if self.coupling_config.mapping_cache:
+            # store the cache next to the exchange files
+            self.mapping_cache = MappingCache(
+                self.coupling_config.mf6_msw_node_map.parent / "mapping_cache"
+            )
+        else:
+            self.mapping_cache = None
 
     def initialize(self) -> None:
         self.mf6 = Mf6Wrapper(
@@ -70,13 +87,29 @@ class MetaMod(Driver):
             working_directory=self.metamod_config.kernels.metaswap.work_dir,
             timing=self.base_config.timing,
         )
+        # The exchange tables do not depend on the kernels, so they are read
+        # in the background while the kernels initialize. Only binding the
+        # exchanges to the kernel arrays in `set_coupling` waits for them.
+        with ThreadPoolExecutor(thread_name_prefix="coupling_tables") as pool:
+            self.coupled_nodes = pool.submit(
+                self.get_coupled_nodes,
+                self.coupling_config.mf6_msw_node_map,
+                self.coupling_config.mf6_msw_recharge_map,
+                self.coupling_config.mf6_msw_sprinkling_map_groundwater,
+            )
+            initialize_kernels(
+                {"MODFLOW 6": self.initialize_mf6, "MetaSWAP": self.msw.initialize},
+                concurrent=self.base_config.concurrent_initialization,
+                timing=self.base_config.timing,
+            )
+        self.log_version()
+        self.set_coupling()
+
+    def initialize_mf6(self) -> None:
         # Print output to stdout
         self.mf6.set_int("ISTDOUTTOFILE", 0)
         self.mf6.initialize()
         self.mf6.set_head(self.coupling_config.mf6_model)
-        self.msw.initialize()
-        self.log_version()
-        self.set_coupling()
 
     def get_exchange_logger(self) -> ExchangeCollector:
         if self.coupling_config.output_config_file is not None:
@@ -93,52 +126,72 @@ class MetaMod(Driver):
         mf6_msw_recharge_map: Path,
         mf6_msw_sprinkling_map_groundwater: Path | None,
     ) -> dict[str, NDArray[np.int32]]:
-        def svats2index(
-            svat: NDArray[np.int32], svat_layer: NDArray[np.int32]
-        ) -> NDArray[np.int32]:
-            return np.array(
-                [svat_lookup[svat[ii], svat_layer[ii]] for ii in range(len(svat))],
-                dtype=np.int32,
+        """
+        Return the coupled MODFLOW 6 and MetaSWAP indexes, from the mapping
+        cache when enabled and the exchange tables are unchanged
+        """
+        self.enable_sprinkling_groundwater = (
+            mf6_msw_sprinkling_map_groundwater is not None
+        )
+        if self.mapping_cache is None:
+            return self.read_coupled_nodes(
+                mf6_msw_node_map,
+                mf6_msw_recharge_map,
+                mf6_msw_sprinkling_map_groundwater,
             )
+        key = self.mapping_cache.hash_key(
+            self.msw.working_directory / "mod2svat.inp",
+            mf6_msw_node_map,
+            mf6_msw_recharge_map,
+            mf6_msw_sprinkling_map_groundwater,
+        )
+        coupling_tables = self.mapping_cache.load(key)
+        if coupling_tables is None:
+            coupling_tables = self.read_coupled_nodes(
+                mf6_msw_node_map,
+                mf6_msw_recharge_map,
+                mf6_msw_sprinkling_map_groundwater,
+            )
+            self.mapping_cache.save(key, coupling_tables)
+        return coupling_tables
 
-        # create a lookup, with the svat tuples (id, lay) as keys and the
-        # metaswap internal indexes as values
-        svat_lookup: dict[tuple[np.int32, np.int32], int] = {}
+    def read_coupled_nodes(
+        self,
+        mf6_msw_node_map: Path,
+        mf6_msw_recharge_map: Path,
+        mf6_msw_sprinkling_map_groundwater: Path | None,
+    ) -> dict[str, NDArray[np.int32]]:
+        """Read the exchange tables and resolve the MetaSWAP indexes"""
+        # create a lookup of the metaswap internal indexes by (svat, layer)
         msw_mod2svat_file = self.msw.working_directory / "mod2svat.inp"
         if msw_mod2svat_file.is_file():
-            svat_data: NDArray[np.int32] = np.loadtxt(
-                msw_mod2svat_file, dtype=np.int32, ndmin=2
-            )
-            svat_id = svat_data[:, 1]
-            svat_lay = svat_data[:, 2]
-            for vi in range(svat_id.size):
-                svat_lookup[(svat_id[vi], svat_lay[vi])] = vi
+            svat_data: NDArray[np.int32] = read_table(msw_mod2svat_file)
+            svat_lookup = SvatLookup(svat_data[:, 1], svat_data[:, 2])
         else:
             raise ValueError(f"Can't find {msw_mod2svat_file}.")
 
         coupling_tables: dict[str, NDArray[np.int32]] = {}
-        gwf_table = np.loadtxt(mf6_msw_node_map, dtype=np.int32, ndmin=2)
+        gwf_table = read_table(mf6_msw_node_map)
         coupling_tables["mf6_gwf_nodes"] = (
             gwf_table[:, 0] - 1
         )  # mf6 nodes are one based
-        coupling_tables["msw_gwf_nodes"] = svats2index(gwf_table[:, 1], gwf_table[:, 2])
-
-        rch_table: NDArray[np.int32] = np.loadtxt(
-            mf6_msw_recharge_map, dtype=np.int32, ndmin=2
+        coupling_tables["msw_gwf_nodes"] = svat_lookup.index(
+            gwf_table[:, 1], gwf_table[:, 2]
         )
+
+        rch_table: NDArray[np.int32] = read_table(mf6_msw_recharge_map)
         coupling_tables["mf6_rch_nodes"] = rch_table[:, 0] - 1
-        coupling_tables["msw_rch_nodes"] = svats2index(rch_table[:, 1], rch_table[:, 2])
+        coupling_tables["msw_rch_nodes"] = svat_lookup.index(
+            rch_table[:, 1], rch_table[:, 2]
+        )
         if mf6_msw_sprinkling_map_groundwater is not None:
-            well_table: NDArray[np.int32] = np.loadtxt(
-                mf6_msw_sprinkling_map_groundwater,
-                dtype=np.int32,
-                ndmin=2,
+            well_table: NDArray[np.int32] = read_table(
+                mf6_msw_sprinkling_map_groundwater
             )
             coupling_tables["mf6_well_nodes"] = well_table[:, 0] - 1
-            coupling_tables["msw_well_nodes"] = svats2index(
+            coupling_tables["msw_well_nodes"] = svat_lookup.index(
                 well_table[:, 1], well_table[:, 2]
             )
-            self.enable_sprinkling_groundwater = True
         return coupling_tables
 
     def set_coupling(self) -> None:
@@ -169,14 +222,11 @@ class MetaMod(Driver):
         )  # volume to length
 
         # get coupled indexes
-        coupled_nodes = self.get_coupled_nodes(
-            self.coupling_config.mf6_msw_node_map,
-            self.coupling_config.mf6_msw_recharge_map,
-            self.coupling_config.mf6_msw_sprinkling_map_groundwater,
-        )
+        coupled_nodes = self.coupled_nodes.result()
 
         # get exchange logger
         exchange_logger = self.get_exchange_logger()
+        self.exchange_logger = exchange_logger
         # set couplings
         self.couplings = {
             "storage": MemoryExchange(
@@ -208,6 +258,7 @@ class MetaMod(Driver):
                 exchange_logger,
                 "head",
                 exchange_operator="avg",
+                track_changes=True,
             ),
         }
         if self.enable_sprinkling_groundwater:
@@ -225,6 +276,22 @@ class MetaMod(Driver):
                 exchange_operator="sum",
             )
             self.enable_sprinkling_groundwater = True
+        self.set_exchange_plan()
+
+    def set_exchange_plan(self) -> None:
+        """
+        Compile the MetaSWAP to MODFLOW 6 exchanges of an iteration into a
+        single plan; recharge and sprinkling share the MetaSWAP volume array.
+        """
+        self.exchange_plan = ExchangePlan()
+        for key, divide_by_delt in (
+            ("storage", False),
+            ("recharge", True),
+            ("sprinkling", True),
+        ):
+            coupling = self.couplings.get(key)
+            if isinstance(coupling, MemoryExchange):
+                self.exchange_plan.add(coupling, divide_by_delt)
 
     def log_version(self) -> None:
         logger.info(f"MODFLOW version: {self.mf6.get_version()}")
@@ -261,6 +328,7 @@ class MetaMod(Driver):
         self.msw.finalize_time_step()
         self.log_exchanges()
 
+    @instrumentation.timed("log exchanges")
     def log_exchanges(self) -> None:
         for coupling in self.couplings.values():
             coupling.log(
@@ -272,6 +340,8 @@ class MetaMod(Driver):
         self.msw.finalize()
         for coupling in self.couplings.values():
             coupling.finalize_log()
+            coupling.report_exchange_counts()
+        self.exchange_logger.finalize()
 
     def get_current_time(self) -> float:
         return self.mf6.get_current_time()
@@ -283,20 +353,22 @@ class MetaMod(Driver):
         """Execute a single iteration"""
         self.msw.prepare_solve(0)
         self.msw.solve(0)
-        self.couplings["storage"].exchange()
-        self.couplings["recharge"].exchange(self.delt)
-        if self.enable_sprinkling_groundwater:
-            self.couplings["sprinkling"].exchange(self.delt)
+        self.exchange_msw2mod()
         has_converged = self.mf6.solve(sol_id)
         self.couplings["head"].exchange()
         self.msw.finalize_solve(0)
         return has_converged
 
+    def exchange_msw2mod(self) -> None:
+        """Exchange storage, recharge and sprinkling from MetaSWAP to MODFLOW 6"""
+        self.exchange_plan.exchange(self.delt)
+
     def report_timing_totals(self) -> None:
         total_mf6 = self.mf6.report_timing_totals()
         total_msw = self.msw.report_timing_totals()
         total = total_mf6 + total_msw
         logger.info(f"Total elapsed time in numerical kernels: {total:0.4f} seconds")
+        instrumentation.report()
 
 
 class MetaModNewton(MetaMod):
@@ -312,13 +384,10 @@ class MetaModNewton(MetaMod):
 
     def set_coupling(self) -> None:
         # get coupled indexes
-        coupled_nodes = self.get_coupled_nodes(
-            self.coupling_config.mf6_msw_node_map,
-            self.coupling_config.mf6_msw_recharge_map,
-            self.coupling_config.mf6_msw_sprinkling_map_groundwater,
-        )
+        coupled_nodes = self.coupled_nodes.result()
         # get exchange logger
         exchange_logger = self.get_exchange_logger()
+        self.exchange_logger = exchange_logger
         # get conversion terms
         mf6_area = self.mf6.get_area(self.coupling_config.mf6_model)
         conversion_terms_sy = 1.0 / mf6_area
@@ -403,6 +472,7 @@ class MetaModNewton(MetaMod):
                     exchange_logger,
                     "head",
                     exchange_operator="avg",
+                    track_changes=True,
                 ),
             ),
         }
@@ -422,6 +492,13 @@ class MetaModNewton(MetaMod):
             )
             self.enable_sprinkling_groundwater = True
 
+    def exchange_msw2mod(self) -> None:
+        """Exchange storage, recharge and sprinkling from MetaSWAP to MODFLOW 6"""
+        self.couplings["storage"].exchange()
+        self.couplings["recharge"].exchange(self.delt)
+        if self.enable_sprinkling_groundwater:
+            self.couplings["sprinkling"].exchange(self.delt)
+
     def get_first_layer_node_idx(self, node_idx: NDArray[Any]) -> NDArray[np.int32]:
         _, nrow, ncol = self.mf6.get_dis_shape(self.coupling_config.mf6_model)
         userid = self.mf6_get_userid()
@@ -445,11 +522,8 @@ class MetaModNewton(MetaMod):
         self, coupled_nodes: dict[str, NDArray[np.int32]], nlay: int
     ) -> NDArray[np.int32]:
         if self.coupling_config.mf6_node_max_layer is not None:
-            table_node_layer: NDArray[np.int32] = np.loadtxt(
-                self.coupling_config.mf6_node_max_layer,
-                dtype=np.int64,
-                ndmin=2,
-                skiprows=1,
+            table_node_layer: NDArray[np.int32] = read_table(
+                self.coupling_config.mf6_node_max_layer, skiprows=1
             )
             return table_node_layer[:, 1] - 1
         else:
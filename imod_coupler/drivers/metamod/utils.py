@@ -4,6 +4,7 @@ from typing import Any
 from numpy import zeros_like
 from numpy.typing import NDArray
 
+from imod_coupler.instrumentation import instrumentation
 from imod_coupler.kernelwrappers.mf6_newton_wrapper import (
     PhreaticBCArray,
     PhreaticModelArray,
@@ -24,6 +25,9 @@ class CoupledBase(ABC):
     def finalize_log(self) -> None:
         self.coupling.finalize_log()
 
+    def report_exchange_counts(self) -> None:
+        self.coupling.report_exchange_counts()
+
 
 class CoupledPhreaticStorage(CoupledBase):
     def __init__(
@@ -55,6 +59,7 @@ class CoupledPhreaticStorage(CoupledBase):
             max_layer,
         )
 
+    @instrumentation.timed("phreatic storage")
     def exchange(self, time: float | None = None) -> None:
         self.coupling.exchange()  # exchange to top nodes
         self.sto_sy.reset()  # reset befor setting the exchanged values
@@ -84,6 +89,7 @@ class CoupledPhreaticRecharge(CoupledBase):
             max_layer,
         )
 
+    @instrumentation.timed("phreatic recharge")
     def exchange(self, time: float | None = None) -> None:
         self.coupling.exchange()  # exchange to top nodes
         self.recharge.set_at_phreatic(self.coupling.ptr_b)  # set to phreatic nodes
@@ -110,6 +116,7 @@ class CoupledPhreaticHeads(CoupledBase):
             max_layer,
         )
 
+    @instrumentation.timed("phreatic heads")
     def exchange(self, time: float | None = None) -> None:
         self.coupling.ptr_a = (
             self.heads.get_at_phreatic()
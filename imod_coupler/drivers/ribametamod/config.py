@@ -51,11 +51,26 @@ class Coupling(BaseModel):
         "mf6_msw_node_map",
         "mf6_msw_recharge_map",
         "output_config_file",
+        "rib_msw_sprinkling_map_surface_water",
+        "rib_msw_ponding_map_surface_water",
     )
     @classmethod
     def resolve_file_path(cls, file_path: FilePath) -> FilePath:
         return file_path.resolve()
 
+    @field_validator(
+        "mf6_active_river_packages",
+        "mf6_active_drainage_packages",
+        "mf6_passive_river_packages",
+        "mf6_passive_drainage_packages",
+    )
+    @classmethod
+    def resolve_package_file_paths(
+        cls, file_paths: dict[str, FilePath]
+    ) -> dict[str, FilePath]:
+        # the tables are read while the kernels change the working directory
+        return {key: file_path.resolve() for key, file_path in file_paths.items()}
+
     @field_validator("mf6_msw_sprinkling_map_groundwater")
     @classmethod
     def validate_mf6_msw_sprinkling_map(
@@ -3,6 +3,7 @@ from typing import Any
 import numpy as np
 from numpy.typing import NDArray
 
+from imod_coupler.instrumentation import instrumentation
 from imod_coupler.kernelwrappers.mf6_wrapper import Mf6Wrapper
 from imod_coupler.kernelwrappers.ribasim_wrapper import RibasimWrapper
 from imod_coupler.utils import MemoryExchange
@@ -141,6 +142,7 @@ class CoupledExchangeBalance(ExchangeBalance):
             ].nodelist[:]
             self.mf6.packages[api_key].nbound[:] = self.mf6.packages[riv_key].nbound[:]
 
+    @instrumentation.timed("balance reset")
     def reset(self) -> None:
         self.ribasim.drainage_infiltration[:] = 0.0
         super().reset()
@@ -148,6 +150,7 @@ class CoupledExchangeBalance(ExchangeBalance):
         # reset cummulative array for subtimestepping
         self.exchanged_ponding_per_dtsw[:] = 0.0
 
+    @instrumentation.timed("balance add_flux_estimate_mod")
     def add_flux_estimate_mod(
         self, mf6_head: NDArray[np.float64], delt_gw: float
     ) -> None:
@@ -165,18 +168,21 @@ class CoupledExchangeBalance(ExchangeBalance):
             # Flux estimation is always in m3/d; exchange as volume per delt_gw
             self.couplings[package_name].exchange(delt=(1 / delt_gw))
 
+    @instrumentation.timed("balance add_ponding_volume_msw")
     def add_ponding_volume_msw(self) -> None:
         # sw_ponding volumes are accumulated over the delt_gw timestep,
         # resulting in a total volume per delt_gw
         if "sw_ponding" in self.couplings.keys():
             self.couplings["sw_ponding"].add()
 
+    @instrumentation.timed("balance flux_to_ribasim")
     def flux_to_ribasim(self, delt_gw: float, delt_sw: float) -> None:
         demand_per_subtimestep = self.get_demand_flux_sec(delt_gw, delt_sw)
         # exchange to Ribasim; negative demand in exchange class means infiltration from Ribasim
         self.ribasim.drainage_infiltration[:] = demand_per_subtimestep[:]
         self.ribasim.exchange_infiltration_drainage(self.coupled_basins)
 
+    @instrumentation.timed("balance flux_to_modflow")
     def flux_to_modflow(
         self, realised_volume: NDArray[np.float64], delt_gw: float
     ) -> None:
@@ -204,6 +210,7 @@ class CoupledExchangeBalance(ExchangeBalance):
         mf6_demand_flux = np.stack(list(demands.values())).sum(axis=0) / delt_gw
         return (mf6_demand_flux + msw_demand_flux) / day_to_seconds
 
+    @instrumentation.timed("balance log")
     def log(self, itime: float) -> None:
         # flux estimations
         for key in self.mf6_active_packages + self.mf6_passive_packages:
@@ -7,6 +7,8 @@ description:
 from __future__ import annotations
 
 from collections import ChainMap
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from typing import Any
 
 import numpy as np
@@ -14,7 +16,7 @@ from loguru import logger
 from numpy.typing import NDArray
 
 from imod_coupler.config import BaseConfig
-from imod_coupler.drivers.driver import Driver
+from imod_coupler.drivers.driver import Driver, initialize_kernels
 from imod_coupler.drivers.ribametamod.config import Coupling, RibaMetaModConfig
 from imod_coupler.drivers.ribametamod.exchange import CoupledExchangeBalance
 from imod_coupler.drivers.ribametamod.mapping import (
@@ -29,6 +31,7 @@ from imod_coupler.drivers.ribametamod.utils import (
     MemoryExchangeNegativeFractions,
     MemoryExchangePositiveFractions,
 )
+from imod_coupler.instrumentation import instrumentation
 from imod_coupler.kernelwrappers.mf6_wrapper import (
     Mf6Api,
     Mf6Wrapper,
@@ -36,7 +39,7 @@ from imod_coupler.kernelwrappers.mf6_wrapper import (
 from imod_coupler.kernelwrappers.msw_wrapper import MswWrapper
 from imod_coupler.kernelwrappers.ribasim_wrapper import RibasimWrapper
 from imod_coupler.logging.exchange_collector import ExchangeCollector
-from imod_coupler.utils import MemoryExchange
+from imod_coupler.utils import ExchangePlan, MemoryExchange
 
 
 class RibaMetaMod(Driver):
@@ -53,11 +56,15 @@ class RibaMetaMod(Driver):
     has_metaswap: bool  # configured with or without metaswap
     enable_sprinkling_groundwater: bool
     enable_sprinkling_surface_water: bool
+    coupling_tables: dict[
+        str, Future[Any]
+    ]  # the coupled indexes per table, read while the kernels initialize
 
     exchange_balance: (
         CoupledExchangeBalance  # deals with waterbalance between mf6 and Ribasim
     )
     couplings: dict[str, MemoryExchange] = {}  # deals with all exchanges
+    exchange_plan: ExchangePlan  # fused MetaSWAP to MODFLOW 6 exchanges per iteration
 
     # Ribasim variables
     ribasim_infiltration_save: NDArray[Any]
@@ -104,21 +111,24 @@ class RibaMetaMod(Driver):
         else:
             self.has_metaswap = False
 
-        # Print output to stdout
-        self.mf6.set_int("ISTDOUTTOFILE", 0)
-        self.mf6.initialize()
-        self.current_time = self.get_current_time()
-        ribasim_config_file = ""
-        if self.has_ribasim and self.ribametamod_config.kernels.ribasim is not None:
-            ribasim_config_file = str(
-                self.ribametamod_config.kernels.ribasim.config_file
+        # The exchange tables do not depend on the kernels, so they are read
+        # in the background while the kernels initialize. Only binding the
+        # exchanges to the kernel arrays in `couple` waits for them.
+        with ThreadPoolExecutor(thread_name_prefix="coupling_tables") as pool:
+            self.coupling_tables = self.read_coupling_tables(pool)
+            kernels: dict[str, Callable[[], None]] = {"MODFLOW 6": self.initialize_mf6}
+            if self.has_ribasim:
+                kernels["Ribasim"] = self.initialize_ribasim
+            if self.has_metaswap:
+                kernels["MetaSWAP"] = self.initialize_metaswap
+            initialize_kernels(
+                kernels,
+                concurrent=self.base_config.concurrent_initialization,
+                timing=self.base_config.timing,
             )
-            self.ribasim.initialize(ribasim_config_file)
-            self.initialize_mf6_packages(self.coupling_config.mf6_model)
-        if self.has_metaswap:
-            self.msw.initialize()
+            self.current_time = self.get_current_time()
             if self.has_ribasim:
-                self.msw.initialize_surface_water_component()
+                self.initialize_mf6_packages(self.coupling_config.mf6_model)
 
         self.log_version()
 
@@ -130,6 +140,59 @@ class RibaMetaMod(Driver):
             self.exchange_logger = ExchangeCollector()
         self.couple()
 
+    def initialize_mf6(self) -> None:
+        # Print output to stdout
+        self.mf6.set_int("ISTDOUTTOFILE", 0)
+        self.mf6.initialize()
+
+    def initialize_ribasim(self) -> None:
+        assert self.ribametamod_config.kernels.ribasim is not None  # mypy
+        self.ribasim.initialize(
+            str(self.ribametamod_config.kernels.ribasim.config_file)
+        )
+
+    def initialize_metaswap(self) -> None:
+        self.msw.initialize()
+        if self.has_ribasim:
+            self.msw.initialize_surface_water_component()
+
+    def read_coupling_tables(self, pool: Executor) -> dict[str, Future[Any]]:
+        """Submit reading the exchange tables of the configured couplings"""
+        coupling_tables: dict[str, Future[Any]] = {}
+        if self.has_ribasim:
+            coupling_tables["ribasim_active"] = pool.submit(
+                get_coupled_ribasim_modflow_nodes,
+                ChainMap(
+                    self.coupling_config.mf6_active_river_packages,
+                    self.coupling_config.mf6_active_drainage_packages,
+                ),
+            )
+            coupling_tables["ribasim_passive"] = pool.submit(
+                get_coupled_ribasim_modflow_nodes,
+                ChainMap(
+                    self.coupling_config.mf6_passive_river_packages,
+                    self.coupling_config.mf6_passive_drainage_packages,
+                ),
+            )
+        if self.has_metaswap:
+            assert self.coupling_config.mf6_msw_node_map is not None  # mypy
+            assert self.coupling_config.mf6_msw_recharge_map is not None  # mypy
+            assert self.ribametamod_config.kernels.metaswap is not None  # mypy
+            coupling_tables["metaswap"] = pool.submit(
+                get_coupled_modflow_metaswap_nodes,
+                self.coupling_config.mf6_msw_node_map,
+                self.coupling_config.mf6_msw_recharge_map,
+                self.ribametamod_config.kernels.metaswap.work_dir,
+                self.coupling_config.mf6_msw_sprinkling_map_groundwater,
+            )
+            if self.has_ribasim:
+                coupling_tables["ribasim_metaswap"] = pool.submit(
+                    get_coupled_ribasim_metaswap_nodes,
+                    self.coupling_config.rib_msw_ponding_map_surface_water,
+                    self.coupling_config.rib_msw_sprinkling_map_surface_water,
+                )
+        return coupling_tables
+
     def initialize_mf6_packages(self, mf6_flowmodel_key: str) -> None:
         active_river_packages = list(
             self.coupling_config.mf6_active_river_packages.keys()
@@ -160,12 +223,7 @@ class RibaMetaMod(Driver):
             logger.info(f"MetaSWAP version: {self.msw.get_version()}")
 
     def couple_ribasim(self) -> None:
-        coupled_nodes = get_coupled_ribasim_modflow_nodes(
-            ChainMap(
-                self.coupling_config.mf6_active_river_packages,
-                self.coupling_config.mf6_active_drainage_packages,
-            )
-        )
+        coupled_nodes = self.coupling_tables["ribasim_active"].result()
         for package_name, coupled_node in coupled_nodes.items():
             self.coupled_ribasim_basins[coupled_node["basin_index"]] = 1
             # stage rib -> mf6
@@ -220,12 +278,7 @@ class RibaMetaMod(Driver):
                     label=package_name + "_exchange_demand_correction",
                     exchange_operator="sum",
                 )
-        coupled_passive_nodes = get_coupled_ribasim_modflow_nodes(
-            ChainMap(
-                self.coupling_config.mf6_passive_river_packages,
-                self.coupling_config.mf6_passive_drainage_packages,
-            )
-        )
+        coupled_passive_nodes = self.coupling_tables["ribasim_passive"].result()
         for package_name, coupled_node in coupled_passive_nodes.items():
             # q mf6 -> exchange balance
             self.couplings[package_name] = MemoryExchange(
@@ -265,16 +318,7 @@ class RibaMetaMod(Driver):
             1.0 / mf6_area[recharge_nodes]
         )  # volume to length
 
-        assert self.coupling_config.mf6_msw_node_map is not None  # mypy
-        assert self.coupling_config.mf6_msw_recharge_map is not None  # mypy
-        assert self.ribametamod_config.kernels.metaswap is not None  # mypy
-
-        coupled_nodes = get_coupled_modflow_metaswap_nodes(
-            self.coupling_config.mf6_msw_node_map,
-            self.coupling_config.mf6_msw_recharge_map,
-            self.ribametamod_config.kernels.metaswap.work_dir,
-            self.coupling_config.mf6_msw_sprinkling_map_groundwater,
-        )
+        coupled_nodes = self.coupling_tables["metaswap"].result()
         self.couplings["storage"] = MemoryExchange(
             self.msw.get_storage_ptr(),
             self.mf6.get_storage(self.coupling_config.mf6_model),
@@ -304,6 +348,7 @@ class RibaMetaMod(Driver):
             self.exchange_logger,
             "head",
             exchange_operator="avg",
+            track_changes=True,
         )
 
         if self.enable_sprinkling_groundwater:
@@ -321,12 +366,15 @@ class RibaMetaMod(Driver):
                 exchange_operator="sum",
             )
             self.enable_sprinkling_groundwater = True
+        # recharge and sprinkling share the MetaSWAP volume array
+        self.exchange_plan = ExchangePlan()
+        self.exchange_plan.add(self.couplings["storage"])
+        self.exchange_plan.add(self.couplings["recharge"], divide_by_delt=True)
+        if self.enable_sprinkling_groundwater:
+            self.exchange_plan.add(self.couplings["sprinkling"], divide_by_delt=True)
         # Get all MetaSWAP pointers, relevant for coupling with Ribasim
         if self.has_ribasim:
-            coupled_nodes = get_coupled_ribasim_metaswap_nodes(
-                self.coupling_config.rib_msw_ponding_map_surface_water,
-                self.coupling_config.rib_msw_sprinkling_map_surface_water,
-            )
+            coupled_nodes = self.coupling_tables["ribasim_metaswap"].result()
             self.coupled_ribasim_basins[coupled_nodes["ribasim_ponding_nodes"]] = 1
             self.couplings["sw_ponding"] = MemoryExchange(
                 self.msw.get_surfacewater_ponding_allocation_ptr(),
@@ -476,10 +524,7 @@ class RibaMetaMod(Driver):
         """Execute a single iteration"""
         self.msw.prepare_solve(0)
         self.msw.solve(0)
-        self.couplings["storage"].exchange()
-        self.couplings["recharge"].exchange(self.mf6.delt)
-        if self.enable_sprinkling_groundwater:
-            self.couplings["sprinkling"].exchange(self.mf6.delt)
+        self.exchange_plan.exchange(self.mf6.delt)
         has_converged = self.mf6.solve(sol_id)
         self.couplings["head"].exchange()
         self.msw.finalize_solve(0)
@@ -491,6 +536,7 @@ class RibaMetaMod(Driver):
             self.ribasim.finalize()
         for coupling in self.couplings.values():
             coupling.finalize_log()
+            coupling.report_exchange_counts()
         self.exchange_logger.finalize()
 
     def exchange_rib2mod(self) -> None:
@@ -549,7 +595,9 @@ class RibaMetaMod(Driver):
         total_msw = self.msw.report_timing_totals()
         total = total_mf6 + total_ribasim + total_msw
         logger.info(f"Total elapsed time in numerical kernels: {total:0.4f} seconds")
+        instrumentation.report()
 
+    @instrumentation.timed("log exchanges")
     def log_exchanges_dtgw(self) -> None:
         for key, coupling in self.couplings.items():
             if "sprinkling" not in key:
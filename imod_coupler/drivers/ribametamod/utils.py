@@ -32,9 +32,9 @@ class MemoryExchangeFractions(MemoryExchange):
             exchange_operator,
         )
 
-    def exchange(self, delt: float = 1.0) -> None:
+    def _exchange(self, delt: float) -> None:
         """Exchange Kernel a to Kernel b"""
-        self.ptr_b[:] = self.ptr_bb * self.mapping.dot(self.ptr_a)
+        np.multiply(self.ptr_bb, self._matvec(), out=self.ptr_b)
 
 
 class MemoryExchangePositiveFractions(MemoryExchange):
@@ -62,12 +62,10 @@ class MemoryExchangePositiveFractions(MemoryExchange):
             exchange_operator,
         )
 
-    def exchange(self, delt: float = 1.0) -> None:
+    def _exchange(self, delt: float) -> None:
         """Exchange Kernel a to Kernel b"""
         self.ptr_a[:] = np.where(self.ptr_a > 0, self.ptr_a, 0)[:]
-        self.ptr_b[:] = (
-            self.mask[:] * self.ptr_b[:] + self.mapping.dot(self.ptr_a)[:] / delt
-        )
+        super()._exchange(delt)
 
 
 class MemoryExchangeNegativeFractions(MemoryExchange):
@@ -97,8 +95,10 @@ class MemoryExchangeNegativeFractions(MemoryExchange):
             exchange_operator,
         )
 
-    def exchange(self, delt: float = 1.0) -> None:
+    def _exchange(self, delt: float) -> None:
         """Exchange Kernel a to Kernel b"""
-        self.ptr_b[:] = (np.maximum(self.ptr_bb / delt, 0.0)) * (
-            1 - self.mapping.dot(self.ptr_a)
-        )
+        realised = self._matvec()
+        np.subtract(1.0, realised, out=realised)
+        np.divide(self.ptr_bb, delt, out=self.ptr_b)
+        np.maximum(self.ptr_b, 0.0, out=self.ptr_b)
+        np.multiply(self.ptr_b, realised, out=self.ptr_b)
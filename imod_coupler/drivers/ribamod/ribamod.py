@@ -18,9 +18,11 @@ from scipy.sparse import csr_matrix
 from imod_coupler.config import BaseConfig
 from imod_coupler.drivers.driver import Driver
 from imod_coupler.drivers.ribamod.config import Coupling, RibaModConfig
+from imod_coupler.instrumentation import instrumentation
 from imod_coupler.kernelwrappers.mf6_wrapper import Mf6Wrapper
 from imod_coupler.kernelwrappers.ribasim_wrapper import RibasimWrapper
 from imod_coupler.logging.exchange_collector import ExchangeCollector
+from imod_coupler.table_reader import read_table
 
 # iMOD Python sets MODFLOW 6's time unit to days
 # Ribasim's time unit is always seconds
@@ -175,7 +177,7 @@ class RibaMod(Driver):
             self.coupling_config.mf6_active_drainage_packages,
         )
         for key, path in active_tables.items():
-            table = np.loadtxt(path, delimiter="\t", dtype=int, skiprows=1, ndmin=2)
+            table = read_table(path, skiprows=1)
             basin_index, bound_index, subgrid_index = table.T
             data = np.ones_like(basin_index, dtype=np.float64)
 
@@ -199,7 +201,7 @@ class RibaMod(Driver):
             self.coupling_config.mf6_passive_drainage_packages,
         )
         for key, path in passive_tables.items():
-            table = np.loadtxt(path, delimiter="\t", dtype=int, skiprows=1, ndmin=2)
+            table = read_table(path, skiprows=1)
             basin_index, bound_index = table.T
             data = np.ones_like(basin_index, dtype=np.float64)
             mod2rib = csr_matrix(
@@ -213,6 +215,7 @@ class RibaMod(Driver):
         return
 
     @typing.no_type_check
+    @instrumentation.timed("exchange rib2mod")
     def exchange_rib2mod(self) -> None:
         # Mypy refuses to understand this ChainMap for some reason.
         # ChainMaps work fine in other places...
@@ -229,6 +232,7 @@ class RibaMod(Driver):
             )
         return
 
+    @instrumentation.timed("exchange mod2rib")
     def exchange_mod2rib(self) -> None:
         # Zero the accumulator arrays
         self.work_infiltration[:] = 0.0
@@ -301,3 +305,4 @@ class RibaMod(Driver):
         total_ribasim = self.ribasim.report_timing_totals()
         total = total_mf6 + total_ribasim
         logger.info(f"Total elapsed time in numerical kernels: {total:0.4f} seconds")
+        instrumentation.report()
@@ -0,0 +1,113 @@
+"""
+Lightweight instrumentation of the work the coupler does in between the
+kernel calls: exchanges, water balance bookkeeping and logging.
+
+Measurements are only recorded when enabled, which `run_coupler` does when
+`timing = true` in the configuration file.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from time import perf_counter
+from typing import Any, TypeVar
+
+from loguru import logger
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_disabled = nullcontext()
+
+
+class Counter:
+    """Accumulates the calls, seconds and elements moved of a single label"""
+
+    __slots__ = ("owner", "calls", "seconds", "elements", "_start")
+
+    def __init__(self, owner: Instrumentation) -> None:
+        self.owner = owner
+        self.calls = 0
+        self.seconds = 0.0
+        self.elements = 0
+        self._start = 0.0
+
+    def __enter__(self) -> Counter:
+        self.owner._depth += 1
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        seconds = perf_counter() - self._start
+        self.calls += 1
+        self.seconds += seconds
+        self.owner._depth -= 1
+        # nested measurements are part of the outer one
+        if self.owner._depth == 0:
+            self.owner.total_seconds += seconds
+
+
+class Instrumentation:
+    """Per-label counters of the coupler's own work"""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.counters: dict[str, Counter] = {}
+        self.total_seconds = 0.0
+        self._depth = 0
+
+    def reset(self) -> None:
+        self.counters = {}
+        self.total_seconds = 0.0
+        self._depth = 0
+
+    def measure(
+        self, label: str, elements: int = 0
+    ) -> AbstractContextManager[Counter | None]:
+        """
+        Return a context manager that times its body under `label`. When
+        instrumentation is disabled, the returned context manager does nothing.
+        """
+        if not self.enabled:
+            return _disabled
+        counter = self.counters.get(label)
+        if counter is None:
+            counter = self.counters[label] = Counter(self)
+        counter.elements += elements
+        return counter
+
+    def timed(self, label: str) -> Callable[[F], F]:
+        """Decorator to time every call of a function under `label`"""
+
+        def decorator(func: F) -> F:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.measure(label):
+                    return func(*args, **kwargs)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorator
+
+    def report(self) -> float:
+        """Log a table with the counters, and return the total time"""
+        if not self.counters:
+            return self.total_seconds
+        width = max(len(label) for label in self.counters)
+        lines = [f"{'label':<{width}} {'calls':>10} {'seconds':>10} {'elements':>14}"]
+        for label, counter in sorted(
+            self.counters.items(), key=lambda item: -item[1].seconds
+        ):
+            lines.append(
+                f"{label:<{width}} {counter.calls:>10} {counter.seconds:>10.4f} "
+                f"{counter.elements:>14}"
+            )
+        logger.info("Time spent in the coupler:\n" + "\n".join(lines))
+        logger.info(
+            f"Total elapsed time in the coupler: {self.total_seconds:0.4f} seconds"
+        )
+        return self.total_seconds
+
+
+instrumentation = Instrumentation()
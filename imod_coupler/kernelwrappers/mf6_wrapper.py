@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from abc import ABC
 from collections.abc import Sequence
+from os import PathLike
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +10,8 @@ import numpy as np
 from numpy.typing import NDArray
 from xmipy import XmiWrapper
 
+from imod_coupler.kernelwrappers.working_directory import working_directory_lock
+
 
 class Mf6Wrapper(XmiWrapper):
     packages: dict[str, Mf6River | Mf6Drainage | Mf6Api] = {}
@@ -23,6 +26,10 @@ class Mf6Wrapper(XmiWrapper):
     ):
         super().__init__(lib_path, lib_dependency, working_directory, timing)
 
+    def initialize(self, config_file: str | PathLike[Any] = "") -> None:
+        with working_directory_lock.cd(self.working_directory):
+            super().initialize(config_file)
+
     def set_head(self, mf6_flowmodel_key: str) -> None:
         mf6_head_tag = self.get_var_address("X", mf6_flowmodel_key)
         self.head[mf6_flowmodel_key] = self.get_value_ptr(mf6_head_tag)
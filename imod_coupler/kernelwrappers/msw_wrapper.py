@@ -1,10 +1,13 @@
 from ctypes import byref, c_double, c_int
+from os import PathLike
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 from numpy.typing import NDArray
 from xmipy import XmiWrapper
-from xmipy.utils import cd
+
+from imod_coupler.kernelwrappers.working_directory import working_directory_lock
 
 
 class MswWrapper(XmiWrapper):
@@ -17,23 +20,27 @@ class MswWrapper(XmiWrapper):
     ):
         super().__init__(lib_path, lib_dependency, working_directory, timing)
 
+    def initialize(self, config_file: str | PathLike[Any] = "") -> None:
+        with working_directory_lock.cd(self.working_directory):
+            super().initialize(config_file)
+
     def initialize_surface_water_component(self) -> None:
-        with cd(self.working_directory):
+        with working_directory_lock.cd(self.working_directory):
             self._execute_function(self.lib.init_sw_component)
 
     def prepare_surface_water_time_step(self, idtsw: int) -> None:
         idtsw_c = c_int(idtsw)
-        with cd(self.working_directory):
+        with working_directory_lock.cd(self.working_directory):
             self._execute_function(self.lib.perform_sw_time_step, byref(idtsw_c))
 
     def finish_surface_water_time_step(self, idtsw: int) -> None:
         idtsw_c = c_int(idtsw)
-        with cd(self.working_directory):
+        with working_directory_lock.cd(self.working_directory):
             self._execute_function(self.lib.finish_sw_time_step, byref(idtsw_c))
 
     def prepare_time_step_noSW(self, dt: float) -> None:
         dt_c = c_double(dt)
-        with cd(self.working_directory):
+        with working_directory_lock.cd(self.working_directory):
             self._execute_function(self.lib.prepare_time_step_noSW, byref(dt_c))
 
     def get_surfacewater_sprinking_demand_ptr(self) -> NDArray[np.float64]:
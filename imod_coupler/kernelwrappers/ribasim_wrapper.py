@@ -5,6 +5,8 @@ import numpy as np
 from numpy.typing import NDArray
 from xmipy import XmiWrapper
 
+from imod_coupler.kernelwrappers.working_directory import working_directory_lock
+
 
 class RibasimWrapper(XmiWrapper):
     drainage_infiltration: NDArray[np.float64]
@@ -12,7 +14,8 @@ class RibasimWrapper(XmiWrapper):
     infiltration: NDArray[np.float64]
 
     def initialize(self, config_file: str | PathLike[Any] = "") -> None:
-        super().initialize(config_file)
+        with working_directory_lock.cd(self.working_directory):
+            super().initialize(config_file)
         self.set_infiltration_drainage_array()
 
     def finalize(self) -> None:
@@ -0,0 +1,58 @@
+"""
+The working directory is shared by all threads of the process, while the
+kernels open their input files relative to it. `working_directory_lock.cd`
+makes the kernel calls that depend on it safe to run from several threads:
+calls in the same directory run at the same time, calls in another directory
+wait until the directory is no longer in use.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class WorkingDirectoryLock:
+    """Shared lock on the working directory of the process"""
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._directory: Path | None = None
+        self._previous = ""
+        self._users = 0
+        # number of calls that had to wait for another directory
+        self.waits = 0
+
+    @contextmanager
+    def cd(self, directory: str | os.PathLike[str]) -> Iterator[None]:
+        """
+        Change to `directory` for the duration of the context, and change back
+        when the last thread using it leaves
+        """
+        directory = Path(directory).resolve()
+        with self._condition:
+            if self._users > 0 and self._directory != directory:
+                self.waits += 1
+            self._condition.wait_for(
+                lambda: self._users == 0 or self._directory == directory
+            )
+            if self._users == 0:
+                self._previous = os.getcwd()
+                os.chdir(directory)
+                self._directory = directory
+            self._users += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._users -= 1
+                if self._users == 0:
+                    os.chdir(self._previous)
+                    self._directory = None
+                    self._condition.notify_all()
+
+
+working_directory_lock = WorkingDirectoryLock()
@@ -1,13 +1,29 @@
 import abc
+import json
+import queue
+import threading
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Literal
 
 import netCDF4 as nc
 import numpy as np
 import tomli
 from numpy.typing import NDArray
+from pydantic import (
+    BaseModel,
+    NonNegativeInt,
+    PositiveInt,
+    field_validator,
+    model_validator,
+)
 from typing_extensions import Self
 
+if TYPE_CHECKING:
+    import xarray as xr
+
+# Version of the JSON sidecar of binary exchange files
+BINARY_VERSION = 1
+
 
 class AbstractExchange(abc.ABC):
     @abc.abstractmethod
@@ -19,21 +35,134 @@ class AbstractExchange(abc.ABC):
         pass
 
 
+class SelectionSettings(BaseModel):
+    """
+    Selection of the logged values and time steps of an exchange in the output
+    configuration file, shared by all types of loggers
+
+    index: the positions in the exchange array to log
+    id_range: log the positions from the first up to, but not including, the
+        second number, as `range` does; give either `index` or `id_range`
+    time_stride: log every `time_stride`-th time step, starting at the first
+    side: for an exchange between two kernels, log the array of kernel "a",
+        of kernel "b", or of "both", to `<name>_a` and `<name>_b`
+    """
+
+    index: list[NonNegativeInt] | None = None
+    id_range: tuple[NonNegativeInt, PositiveInt] | None = None
+    time_stride: PositiveInt = 1
+    side: Literal["a", "b", "both"] | None = None
+
+    @model_validator(mode="after")
+    def check_ids(self) -> Self:
+        if self.index is not None and self.id_range is not None:
+            raise ValueError("give either index or id_range, not both")
+        if self.index is not None and len(self.index) == 0:
+            raise ValueError("index should contain at least one position")
+        if self.id_range is not None and self.id_range[0] >= self.id_range[1]:
+            raise ValueError(
+                f"id_range should be increasing, found {list(self.id_range)}"
+            )
+        return self
+
+    def selected_ids(self) -> NDArray[np.intp] | None:
+        """The positions in the exchange array to log, or None for all"""
+        if self.index is not None:
+            return np.array(self.index, dtype=np.intp)
+        if self.id_range is not None:
+            return np.arange(*self.id_range, dtype=np.intp)
+        return None
+
+    def names(self, name: str) -> list[str]:
+        """The names of the logged arrays of the exchange"""
+        if self.side is None:
+            return [name]
+        sides = ("a", "b") if self.side == "both" else (self.side,)
+        return [f"{name}_{side}" for side in sides]
+
+
+class ExchangeSelection:
+    """
+    Selects the logged values and time steps of an exchange. The positions are
+    computed once; a logged time step gathers them into a preallocated array.
+    """
+
+    def __init__(self, settings: SelectionSettings):
+        self.index = settings.selected_ids()
+        self.time_stride = settings.time_stride
+        self.step = -1
+        self.time: float | None = None
+        self.out: NDArray[Any] | None = None
+
+    def select(self, exchange: NDArray[Any], time: float) -> NDArray[Any] | None:
+        """The selection of the exchange, or None if the time step is skipped"""
+        # a repeated time, as in an iteration, is the same time step
+        if time != self.time:
+            self.step += 1
+            self.time = time
+        if self.step % self.time_stride != 0:
+            return None
+        if self.index is None:
+            return exchange
+        if self.out is None or self.out.dtype != exchange.dtype:
+            if self.index.max() >= exchange.size:
+                raise ValueError(
+                    f"selected position {self.index.max()} is out of bounds for "
+                    f"an exchange of {exchange.size} values"
+                )
+            self.out = np.empty(self.index.size, dtype=exchange.dtype)
+        return np.take(exchange, self.index, out=self.out)
+
+
+class NetcdfLoggerSettings(SelectionSettings):
+    """
+    Settings of a NetCDF exchange logger in the output configuration file
+
+    buffer_steps: the number of time steps collected in memory and written to
+        the file at once; 1 writes every time step directly
+    chunk_time: the number of time steps in a chunk of the file, by default
+        the NetCDF library decides
+    zlib: compress the exchange with zlib, at level `complevel`
+    sync_every: flush the file to disk at least every `sync_every` time
+        steps; 0 leaves it to the NetCDF library
+    """
+
+    type: str
+    buffer_steps: PositiveInt = 1
+    chunk_time: PositiveInt | None = None
+    zlib: bool = False
+    complevel: Literal[0, 1, 2, 3, 4, 5, 6, 7, 8, 9] = 4
+    sync_every: NonNegativeInt = 0
+
+
 class NetcdfExchangeLogger(AbstractExchange):
     output_file: Path
     name: str
 
     def __init__(self, name: str, output_dir: Path, properties: dict[str, Any]):
+        self.settings = NetcdfLoggerSettings(**properties)
         if not (Path.is_dir(output_dir)):
             Path.mkdir(output_dir)
         output_file = Path.joinpath(output_dir, name + ".nc")
         self.ds = nc.Dataset(output_file, "w")
         self.name = name
+        # Record of each time written so far, so that a repeated time is
+        # found without reading the time variable back from the file
+        self.time_index: dict[float, int] = {}
+        # Records from `flushed` onwards are in the buffer, not yet in the file
+        self.flushed = 0
+        self.synced = 0
 
     def initfile(self, ndx: int) -> None:
+        settings = self.settings
         self.nodedim = self.ds.createDimension("id", ndx)
         self.timedim = self.ds.createDimension("time", None)
-        self.timevar = self.ds.createVariable("time", "f8", ("time",))
+        self.timevar = self.ds.createVariable(
+            "time",
+            "f8",
+            ("time",),
+            chunksizes=None if settings.chunk_time is None else (settings.chunk_time,),
+        )
         self.datavar = self.ds.createVariable(
             "xchg",
             "f8",
@@ -41,35 +170,310 @@ class NetcdfExchangeLogger(AbstractExchange):
                 "time",
                 "id",
             ),
+            zlib=settings.zlib,
+            complevel=settings.complevel,
+            chunksizes=None
+            if settings.chunk_time is None
+            else (settings.chunk_time, ndx),
         )
+        ids = settings.selected_ids()
+        if ids is not None:
+            self.idvar = self.ds.createVariable("id", "i8", ("id",))
+            self.idvar[:] = ids
         self.pos = 0
+        self.buffer: NDArray[np.float64] | None = None
+        if settings.buffer_steps > 1:
+            self.buffer = np.empty((settings.buffer_steps, ndx), dtype=np.float64)
+            self.buffer_time = np.empty(settings.buffer_steps, dtype=np.float64)
 
     def write_exchange(
         self, exchange: NDArray[Any], time: float, sync: bool = False
     ) -> None:
         if len(self.ds.dimensions) == 0:
             self.initfile(len(exchange))
-        loc = np.where(self.timevar[:] == time)
-        if np.size(loc) > 0:
-            first = int(loc[0][0])
-            self.datavar[first, :] = exchange[:]
+        record = self.time_index.get(time)
+        new_record = record is None
+        if record is None:
+            record = self.pos
+        if self.buffer is not None and record >= self.flushed:
+            self.buffer[record - self.flushed] = exchange
+            self.buffer_time[record - self.flushed] = time
         else:
-            self.timevar[self.pos] = time
-            self.datavar[self.pos, :] = exchange[:]
+            if new_record:
+                self.timevar[record] = time
+            self.datavar[record, :] = exchange[:]
+        if new_record:
+            self.time_index[time] = record
             self.pos += 1
+            if self.buffer is None or self.pos - self.flushed == len(self.buffer):
+                self.flush()
         if sync:
-            self.ds.sync()
+            self.flush()
+            self.sync()
+
+    def flush(self) -> None:
+        """Write the buffered time steps to the file"""
+        if self.buffer is not None and self.pos > self.flushed:
+            n = self.pos - self.flushed
+            self.timevar[self.flushed : self.pos] = self.buffer_time[:n]
+            self.datavar[self.flushed : self.pos, :] = self.buffer[:n]
+        self.flushed = self.pos
+        sync_every = self.settings.sync_every
+        if sync_every > 0 and self.flushed - self.synced >= sync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        self.ds.sync()
+        self.synced = self.flushed
 
     def finalize(self) -> None:
+        if not self.ds.isopen():
+            return
+        if len(self.ds.dimensions) > 0:
+            self.flush()
         self.ds.close()
 
 
+class BinaryLoggerSettings(SelectionSettings):
+    """
+    Settings of a binary exchange logger in the output configuration file
+
+    dtype: the type the exchange is stored as
+    initial_steps: the number of time steps the file is first allocated for;
+        it doubles in size when it is full
+    """
+
+    type: str
+    dtype: Literal["float64", "float32"] = "float64"
+    initial_steps: PositiveInt = 64
+
+
+class BinaryExchangeLogger(AbstractExchange):
+    """
+    Logs an exchange to a raw binary file, `<name>.bin`, of one row per time
+    step, through a memory map: a write is a copy into the mapped file. A JSON
+    sidecar, `<name>.json`, holds the type, the number of ids and the times.
+    The file can be opened with `open_binary_exchange`.
+    """
+
+    output_file: Path
+    name: str
+
+    def __init__(self, name: str, output_dir: Path, properties: dict[str, Any]):
+        self.settings = BinaryLoggerSettings(**properties)
+        if not (Path.is_dir(output_dir)):
+            Path.mkdir(output_dir)
+        self.output_file = Path.joinpath(output_dir, name + ".bin")
+        self.sidecar_file = self.output_file.with_suffix(".json")
+        self.name = name
+        self.dtype = np.dtype(self.settings.dtype)
+        self.nid = 0
+        self.time_index: dict[float, int] = {}
+        self.times: list[float] = []
+        self.data: np.memmap[Any, np.dtype[Any]] | None = None
+        self.finalized = False
+        self.output_file.write_bytes(b"")
+
+    def write_exchange(
+        self, exchange: NDArray[Any], time: float, sync: bool = False
+    ) -> None:
+        if self.data is None:
+            self.nid = len(exchange)
+            self._allocate(self.settings.initial_steps)
+        assert self.data is not None
+        record = self.time_index.get(time)
+        if record is not None:
+            self.data[record] = exchange
+        else:
+            record = len(self.times)
+            if record == len(self.data):
+                self._allocate(2 * len(self.data))
+                self.write_sidecar()
+            self.data[record] = exchange
+            self.times.append(time)
+            self.time_index[time] = record
+        if sync:
+            self.data.flush()
+            self.write_sidecar()
+
+    def _allocate(self, nstep: int) -> None:
+        """Resize the file to `nstep` time steps and map it again"""
+        if self.data is not None:
+            self.data.flush()
+            self.data = None
+        with open(self.output_file, "r+b") as f:
+            f.truncate(nstep * self.nid * self.dtype.itemsize)
+        self.data = np.memmap(
+            self.output_file, dtype=self.dtype, mode="r+", shape=(nstep, self.nid)
+        )
+
+    def write_sidecar(self) -> None:
+        sidecar: dict[str, Any] = {
+            "version": BINARY_VERSION,
+            "dtype": self.dtype.str,
+            "nid": self.nid,
+            "time": self.times,
+        }
+        ids = self.settings.selected_ids()
+        if ids is not None:
+            sidecar["id"] = ids.tolist()
+        with open(self.sidecar_file, "w") as f:
+            json.dump(sidecar, f)
+
+    def finalize(self) -> None:
+        if self.finalized:
+            return
+        if self.data is not None:
+            self.data.flush()
+            self.data = None
+        # remove the space allocated for time steps that were not written
+        with open(self.output_file, "r+b") as f:
+            f.truncate(len(self.times) * self.nid * self.dtype.itemsize)
+        self.write_sidecar()
+        self.finalized = True
+
+
+def open_binary_exchange(path: Path | str) -> "xr.Dataset":
+    """
+    Open an exchange written by `BinaryExchangeLogger` as an xarray Dataset,
+    with the same layout as the NetCDF exchange files: a variable `xchg` with
+    dimensions `time` and `id`. The data is memory mapped, so it is only read
+    from disk when it is accessed. Requires xarray.
+
+    Parameters
+    ----------
+    path : Path or str
+        The binary file, or its JSON sidecar
+
+    Returns
+    -------
+    xr.Dataset
+        The logged exchange
+    """
+    import xarray as xr
+
+    path = Path(path)
+    with open(path.with_suffix(".json")) as f:
+        sidecar = json.load(f)
+    dtype = np.dtype(sidecar["dtype"])
+    shape = (len(sidecar["time"]), sidecar["nid"])
+    data: NDArray[Any]
+    if shape[0] * shape[1] == 0:
+        data = np.empty(shape, dtype=dtype)
+    else:
+        data = np.memmap(path.with_suffix(".bin"), dtype=dtype, mode="r", shape=shape)
+    coords = {"time": np.array(sidecar["time"], dtype=np.float64)}
+    if "id" in sidecar:
+        coords["id"] = np.array(sidecar["id"], dtype=np.int64)
+    return xr.Dataset({"xchg": (("time", "id"), data)}, coords=coords)
+
+
+class CollectorSettings(BaseModel):
+    """
+    General settings of the output configuration file
+
+    output_dir: the directory the exchanges are written to, relative to the
+        working directory the configuration is read in
+    asynchronous: write the exchanges on a background thread, so that the
+        time loop only copies them
+    queue_size: the number of logged time steps per exchange that can wait to
+        be written; when they are all in use, logging waits for the writer
+    """
+
+    output_dir: Path
+    asynchronous: bool = False
+    queue_size: PositiveInt = 4
+
+    @field_validator("output_dir")
+    @classmethod
+    def resolve_output_dir(cls, output_dir: Path) -> Path:
+        # the loggers open their files while the kernels change the working
+        # directory, possibly from the writer thread
+        return output_dir.resolve()
+
+
+class ExchangeWriter:
+    """
+    Writes logged exchanges to their loggers on a background thread.
+
+    Every exchange has a pool of `queue_size` preallocated buffers. Logging
+    copies the exchange into a free buffer and queues it; the writer thread
+    writes the queued buffers in order and returns them to the pool. When all
+    buffers of an exchange are queued, logging it waits for the writer.
+
+    A failed write stops all writing: the output would have a gap. Every later
+    call to `put`, `drain` or `close` raises the error of the failed write.
+    """
+
+    def __init__(self, exchanges: dict[str, AbstractExchange], queue_size: int):
+        self.exchanges = exchanges
+        self.queue_size = queue_size
+        self.free: dict[str, queue.Queue[NDArray[Any]]] = {}
+        self.pending: queue.Queue[tuple[str, NDArray[Any], float] | None] = (
+            queue.Queue()
+        )
+        self.error: BaseException | None = None
+        self.thread = threading.Thread(
+            target=self._run, name="exchange_writer", daemon=True
+        )
+        self.thread.start()
+
+    def put(self, name: str, exchange: NDArray[Any], time: float) -> None:
+        self._raise_error()
+        free = self.free.get(name)
+        if free is None:
+            free = queue.Queue()
+            for _ in range(self.queue_size):
+                free.put(np.empty(exchange.shape, dtype=exchange.dtype))
+            self.free[name] = free
+        buffer = free.get()
+        try:
+            np.copyto(buffer, exchange)
+        except BaseException:
+            free.put(buffer)
+            raise
+        self.pending.put((name, buffer, time))
+
+    def drain(self) -> None:
+        """Wait until all queued exchanges are written"""
+        self.pending.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        """Write all queued exchanges and stop the writer thread"""
+        self.pending.put(None)
+        self.thread.join()
+        self._raise_error()
+
+    def _run(self) -> None:
+        while (item := self.pending.get()) is not None:
+            name, buffer, time = item
+            try:
+                # after an error, the queue is emptied without writing, so
+                # that no later time steps are written after the gap
+                if self.error is None:
+                    self.exchanges[name].write_exchange(buffer, time)
+            except BaseException as error:
+                self.error = error
+            finally:
+                self.free[name].put(buffer)
+                self.pending.task_done()
+        self.pending.task_done()
+
+    def _raise_error(self) -> None:
+        if self.error is not None:
+            raise self.error
+
+
 class ExchangeCollector:
     exchanges: dict[str, AbstractExchange]
     output_dir: Path
+    writer: ExchangeWriter | None
 
     def __init__(self, config: dict[str, dict[str, Any]] | None = None):
         self.exchanges = {}
+        self.selections: dict[str, ExchangeSelection] = {}
+        self.writer = None
 
     @classmethod
     def from_file(cls, output_toml_file: Path) -> Self:
@@ -80,20 +484,37 @@ class ExchangeCollector:
     @classmethod
     def from_config(cls, config: dict[str, dict[str, Any]]) -> Self:
         new_instance = cls()
-        general_settings = config["general"]
-        new_instance.output_dir = Path(general_settings["output_dir"])
+        general_settings = CollectorSettings(**config["general"])
+        new_instance.output_dir = general_settings.output_dir
 
         exchanges_config = config["exchanges"]
 
         for exchange_name, dict_def in exchanges_config.items():
-            new_instance.exchanges[exchange_name] = new_instance.create_exchange_object(
-                exchange_name, dict_def
+            selection = SelectionSettings(**dict_def)
+            for name in selection.names(exchange_name):
+                new_instance.exchanges[name] = new_instance.create_exchange_object(
+                    name, dict_def
+                )
+                if selection.selected_ids() is not None or selection.time_stride > 1:
+                    new_instance.selections[name] = ExchangeSelection(selection)
+        if general_settings.asynchronous:
+            new_instance.writer = ExchangeWriter(
+                new_instance.exchanges, general_settings.queue_size
             )
         return new_instance
 
     def log_exchange(self, name: str, exchange: NDArray[Any], time: float) -> None:
         if name in self.exchanges.keys():
-            self.exchanges[name].write_exchange(exchange, time)
+            selection = self.selections.get(name)
+            if selection is not None:
+                selected = selection.select(exchange, time)
+                if selected is None:
+                    return
+                exchange = selected
+            if self.writer is None:
+                self.exchanges[name].write_exchange(exchange, time)
+            else:
+                self.writer.put(name, exchange, time)
 
     def create_exchange_object(
         self, flux_name: str, dict_def: dict[str, Any]
@@ -101,8 +522,21 @@ class ExchangeCollector:
         typename = dict_def["type"]
         if typename == "netcdf":
             return NetcdfExchangeLogger(flux_name, self.output_dir, dict_def)
+        if typename == "binary":
+            return BinaryExchangeLogger(flux_name, self.output_dir, dict_def)
         raise ValueError("unkwnown type of exchange logger")
 
+    def finalize_exchange(self, name: str) -> None:
+        """Write what is logged of the exchange, if present, and close it"""
+        if name in self.exchanges.keys():
+            if self.writer is not None:
+                self.writer.drain()
+            self.exchanges[name].finalize()
+
     def finalize(self) -> None:
-        for exchange in self.exchanges.values():
-            exchange.finalize()
+        try:
+            if self.writer is not None:
+                self.writer.close()
+        finally:
+            for exchange in self.exchanges.values():
+                exchange.finalize()
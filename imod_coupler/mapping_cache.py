@@ -0,0 +1,89 @@
+"""
+On-disk cache of the coupled indexes resolved from the exchange tables.
+
+Every entry is a directory named after a content hash of the exchange tables
+the indexes are resolved from, holding one `.npy` file per array. Entries
+are loaded with memory mapping, so a run on unchanged exchange tables skips
+parsing them.
+
+The sparse mappings built from the indexes are not cached: they also depend
+on conversion terms read from the kernels, and hashing those together with
+the indexes costs about as much as building the mappings.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from loguru import logger
+from numpy.typing import NDArray
+
+CACHE_VERSION = "1"
+_CHUNK_SIZE = 1 << 20
+
+
+class MappingCache:
+    """Directory with resolved coupled indexes, keyed by a content hash"""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+
+    @staticmethod
+    def hash_key(*parts: Path | NDArray[Any] | int | float | str | None) -> str:
+        """
+        Return a content hash of the parts: the contents of files, the dtype,
+        shape and values of arrays, and the value of all other parts.
+        """
+        digest = hashlib.blake2b(CACHE_VERSION.encode(), digest_size=16)
+        for part in parts:
+            if isinstance(part, Path):
+                with open(part, "rb") as f:
+                    while chunk := f.read(_CHUNK_SIZE):
+                        digest.update(chunk)
+            elif isinstance(part, np.ndarray):
+                digest.update(f"{part.dtype.str}{part.shape}".encode())
+                digest.update(np.ascontiguousarray(part).data)
+            else:
+                digest.update(repr(part).encode())
+            # separate the parts, so their boundaries are part of the hash
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def load(self, key: str) -> dict[str, NDArray[Any]] | None:
+        """Return the memory mapped arrays of an entry, or None if absent"""
+        entry = self.directory / key
+        if not entry.is_dir():
+            return None
+        logger.debug(f"loading cached mapping {key}")
+        return {
+            path.stem: np.load(path, mmap_mode="r")
+            for path in sorted(entry.glob("*.npy"))
+        }
+
+    def save(self, key: str, arrays: dict[str, NDArray[Any]]) -> None:
+        """
+        Store the arrays as an entry. The entry is written to a temporary
+        directory first and then renamed, so runs sharing the cache never see
+        a partially written entry.
+        """
+        entry = self.directory / key
+        if entry.is_dir():
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=self.directory))
+        try:
+            for name, array in arrays.items():
+                np.save(tmp_dir / f"{name}.npy", array)
+            os.rename(tmp_dir, entry)
+        except OSError:
+            # another run stored the same entry first, or the cache is not
+            # writable; either way the mapping can still be used
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not entry.is_dir():
+                logger.warning(f"could not store mapping {key} in {self.directory}")
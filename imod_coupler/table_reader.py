@@ -0,0 +1,50 @@
+"""
+Reader for the integer tables exchanged between primod and the coupler:
+`mod2svat.inp`, the fixed-width `.dxc` maps and the tab-separated `.tsv` maps,
+or their binary counterparts: `.npy` files with the same columns, written by
+primod with `binary_exchanges=True`.
+
+All drivers read their exchange tables through `read_table`, so the tables
+are read by a single implementation with a single output type: a
+two-dimensional `np.int32` array, which is what the mappings are built from.
+"""
+
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+def read_table(path: Path | str, skiprows: int = 0) -> NDArray[np.int32]:
+    """
+    Read a table of integers separated by whitespace (spaces or tabs), or a
+    binary table from a `.npy` file.
+
+    Text columns are parsed directly into `np.int32` by the C parser of
+    `np.loadtxt`, without intermediate Python objects or a float array.
+    Binary tables are memory mapped and not parsed at all.
+
+    Parameters
+    ----------
+    path : Path or str
+        The table to read
+    skiprows : int, optional
+        The number of header lines to skip; binary tables have no header
+
+    Returns
+    -------
+    NDArray[np.int32]
+        Array with one row per line and one column per column in the table
+    """
+    if Path(path).suffix == ".npy":
+        binary_table: NDArray[np.int32] = np.load(path, mmap_mode="r")
+        if binary_table.ndim != 2 or binary_table.dtype != np.int32:
+            raise ValueError(
+                f"{path} should contain a two-dimensional int32 array, "
+                f"found {binary_table.ndim} dimension(s) of {binary_table.dtype}"
+            )
+        return binary_table
+    table: NDArray[np.int32] = np.loadtxt(
+        path, dtype=np.int32, skiprows=skiprows, ndmin=2
+    )
+    return table
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
 from pathlib import Path
 from sys import stderr
-from typing import Any
+from time import perf_counter
+from typing import Any, cast
 
 import numpy as np
 from loguru import logger
 from numpy.typing import NDArray
-from scipy.sparse import csr_matrix
+from scipy.sparse import csr_matrix, vstack
+
+try:
+    # private SciPy kernel that accumulates into an existing array; without
+    # it, sparse_dot falls back to the public, allocating `mapping.dot`
+    from scipy.sparse._sparsetools import csr_matvec
+except ImportError:
+    csr_matvec = None
 
 from imod_coupler.config import LogLevel
+from imod_coupler.instrumentation import instrumentation
 from imod_coupler.logging.exchange_collector import ExchangeCollector
 
 
@@ -52,25 +63,88 @@ def create_mapping(
     Tuple
         containing the mapping (csr_matrix) and a mask (numpy array)
     """
+    tgt_idx = np.asarray(tgt_idx)
+    src_idx = np.asarray(src_idx)
     if operator is None and weights is not None:
         dat = weights
     elif operator is not None and weights is None:
-        if operator == "avg" and weights is None:
-            cnt = np.zeros(max(tgt_idx) + 1)
-            for i in range(len(tgt_idx)):
-                cnt[tgt_idx[i]] += 1
-            dat = np.array([1.0 / cnt[xx] for xx in tgt_idx])
-        elif operator == "sum" and weights is None:
+        if operator == "avg":
+            # number of sources contributing to each target
+            cnt = np.bincount(tgt_idx, minlength=ntgt)
+            dat = 1.0 / cnt[tgt_idx]
+        elif operator == "sum":
             dat = np.ones(tgt_idx.shape)
         else:
             raise ValueError("`operator` should be either 'sum' or 'avg'")
     else:
         raise ValueError("either `operator` or 'weights' should be defined")
     map_out = csr_matrix((dat, (tgt_idx, src_idx)), shape=(ntgt, nsrc))
-    mask = np.array([0 if i > 0 else 1 for i in map_out.getnnz(axis=1)])
+    # rows without stored entries are not coupled
+    mask = (np.diff(map_out.indptr) == 0).astype(np.int32)
     return map_out, mask
 
 
+def sparse_dot(
+    mapping: csr_matrix,
+    x: NDArray[np.float64 | np.int32],
+    out: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """
+    Compute the product of a sparse matrix and a vector into `out`,
+    without allocating a new array.
+    """
+    if (
+        csr_matvec is not None
+        and x.dtype == np.float64
+        and x.flags.c_contiguous
+        and mapping.dtype == np.float64
+    ):
+        out.fill(0.0)
+        nrow, ncol = mapping.shape
+        csr_matvec(nrow, ncol, mapping.indptr, mapping.indices, mapping.data, x, out)
+    else:
+        out[:] = mapping.dot(x)
+    return out
+
+
+class SvatLookup:
+    """
+    Lookup of MetaSWAP internal indexes by (svat, layer), as listed in
+    mod2svat.inp. The pairs are combined into a single int64 key, so the
+    lookup is a binary search in a sorted array.
+    """
+
+    def __init__(self, svat_id: NDArray[np.int32], svat_lay: NDArray[np.int32]) -> None:
+        keys = self._keys(svat_id, svat_lay)
+        # stable sort, so that for duplicate pairs the last index is found
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+    @staticmethod
+    def _keys(svat: NDArray[np.int32], layer: NDArray[np.int32]) -> NDArray[np.int64]:
+        return (np.asarray(svat, dtype=np.int64) << 32) | (
+            np.asarray(layer, dtype=np.int64) & 0xFFFFFFFF
+        )
+
+    def index(
+        self, svat: NDArray[np.int32], svat_layer: NDArray[np.int32]
+    ) -> NDArray[np.int32]:
+        """Return the internal indexes of the (svat, layer) pairs"""
+        keys = self._keys(svat, svat_layer)
+        position = np.searchsorted(self.sorted_keys, keys, side="right") - 1
+        found = position >= 0
+        found[found] = self.sorted_keys[position[found]] == keys[found]
+        if not np.all(found):
+            missing = np.flatnonzero(~found)
+            pairs = ", ".join(f"({svat[i]}, {svat_layer[i]})" for i in missing[:10])
+            more = f" and {missing.size - 10} more" if missing.size > 10 else ""
+            raise ValueError(
+                f"{missing.size} (svat, layer) pairs are not present in "
+                f"mod2svat.inp: {pairs}{more}"
+            )
+        return self.order[position].astype(np.int32)
+
+
 def setup_logger(log_level: LogLevel, log_file: Path) -> None:
     # Remove default handler
     logger.remove()
@@ -88,6 +162,69 @@ def setup_logger(log_level: LogLevel, log_file: Path) -> None:
     logger.add(log_file, level=log_level)
 
 
+# rows below which splitting an exchange over threads does not pay off
+MIN_ROWS_PER_THREAD = 50_000
+
+_exchange_threads = 1
+_exchange_pools: dict[int, ThreadPoolExecutor] = {}
+
+
+def set_exchange_threads(n_threads: int) -> None:
+    """
+    Set the default number of threads used by MemoryExchanges that are
+    created afterwards.
+    """
+    global _exchange_threads
+    if n_threads < 1:
+        raise ValueError("`n_threads` should be at least 1")
+    _exchange_threads = n_threads
+
+
+def _get_exchange_pool(n_threads: int) -> ThreadPoolExecutor:
+    """Return the thread pool shared by all exchanges using n_threads"""
+    if n_threads not in _exchange_pools:
+        _exchange_pools[n_threads] = ThreadPoolExecutor(
+            max_workers=n_threads, thread_name_prefix="exchange"
+        )
+    return _exchange_pools[n_threads]
+
+
+def _split_rows(mapping: csr_matrix, n_threads: int) -> list[tuple[slice, csr_matrix]]:
+    """
+    Split the rows of a mapping into at most `n_threads` contiguous blocks
+    with about the same number of stored entries, and at least
+    MIN_ROWS_PER_THREAD rows each. The block mappings share the index and
+    data arrays of the mapping.
+    """
+    nrow = mapping.shape[0]
+    nblocks = max(1, min(n_threads, nrow // MIN_ROWS_PER_THREAD))
+    indptr = mapping.indptr
+    nnz_bounds = indptr[-1] * np.arange(nblocks + 1) // nblocks
+    bounds = np.searchsorted(indptr, nnz_bounds)
+    bounds[0], bounds[-1] = 0, nrow
+    blocks: list[tuple[slice, csr_matrix]] = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        first, last = indptr[start], indptr[stop]
+        block_mapping = csr_matrix(
+            (
+                mapping.data[first:last],
+                mapping.indices[first:last],
+                indptr[start : stop + 1] - first,
+            ),
+            shape=(stop - start, mapping.shape[1]),
+            copy=False,
+        )
+        blocks.append((slice(int(start), int(stop)), block_mapping))
+    return blocks
+
+
+class ExchangeStrategy(str, Enum):
+    """Kernel used by a MemoryExchange to compute the coupled values"""
+
+    SPARSE = "sparse"  # sparse matrix-vector product, for n:m couplings
+    GATHER = "gather"  # indexed gather with weights, for injective couplings
+
+
 class MemoryExchange:
     """Class to handle n:m exchanges between two pointers arrays"""
 
@@ -102,6 +239,8 @@ class MemoryExchange:
         ptr_a_conversion: NDArray[np.float64] | None = None,
         ptr_b_conversion: NDArray[np.float64] | None = None,
         exchange_operator: str | None = None,
+        n_threads: int | None = None,
+        track_changes: bool = False,
     ) -> None:
         self.ptr_a = ptr_a
         self.ptr_b = ptr_b
@@ -110,6 +249,7 @@ class MemoryExchange:
         self.exchange_logger = exchange_logger
         self.exchange_operator = exchange_operator
         self._set_conversion_terms(ptr_a_conversion, ptr_b_conversion)
+        self.label = label
         self.mapping, self.mask = create_mapping(
             self.ptr_a_index,
             self.ptr_b_index,
@@ -118,7 +258,33 @@ class MemoryExchange:
             self.exchange_operator,
             self.conversion_term,
         )
-        self.label = label
+        # Only the coupled rows of ptr_b are touched by an exchange: keep the
+        # compressed mapping for those rows and a work buffer for the mat-vec
+        self.coupled_rows = np.flatnonzero(self.mask == 0)
+        self.coupled_mapping = self.mapping[self.coupled_rows]
+        self._coupled_out = np.zeros(self.coupled_rows.size, dtype=np.float64)
+        # when the coupled rows form a contiguous block, write into it directly
+        self._coupled_slice: slice | None = None
+        if self.coupled_rows.size > 0 and (
+            self.coupled_rows[-1] - self.coupled_rows[0] + 1 == self.coupled_rows.size
+        ):
+            self._coupled_slice = slice(
+                int(self.coupled_rows[0]), int(self.coupled_rows[-1]) + 1
+            )
+        self._set_strategy()
+        self._set_row_blocks(_exchange_threads if n_threads is None else n_threads)
+        self._gather_out: NDArray[np.float64] | None = None
+        self._matvec_out: NDArray[np.float64] | None = None
+        # with change tracking, an exchange is skipped when ptr_a and delt are
+        # equal to those of the last exchange. This assumes that only the
+        # exchange writes to the coupled entries of ptr_b.
+        self.track_changes = track_changes
+        self.n_performed = 0
+        self.n_skipped = 0
+        self._snapshot_delt: float | None = None
+        if track_changes:
+            self._snapshot = np.empty_like(self.ptr_a)
+            self._changed = np.empty(self.ptr_a.shape, dtype=np.bool_)
 
     def _set_conversion_terms(
         self,
@@ -140,6 +306,34 @@ class MemoryExchange:
             )
             self.conversion_term = conversion_term
 
+    def _set_strategy(self) -> None:
+        """
+        Use a gather from ptr_a when every coupled target receives exactly one
+        source value, which is much cheaper than the sparse mat-vec.
+        """
+        entries_per_row = np.diff(self.coupled_mapping.indptr)
+        if np.all(entries_per_row == 1):
+            self.strategy = ExchangeStrategy.GATHER
+            self._gather_index = self.coupled_mapping.indices.astype(np.intp)
+            weights = self.coupled_mapping.data
+            self._gather_weights = None if np.all(weights == 1.0) else weights
+        else:
+            self.strategy = ExchangeStrategy.SPARSE
+        logger.debug(f"{self.label}: using {self.strategy.value} exchange")
+
+    def _set_row_blocks(self, n_threads: int) -> None:
+        """
+        Split the coupled rows into contiguous blocks with about the same
+        number of stored entries, one per thread. NumPy and SciPy release the
+        GIL while computing a block, so the blocks run concurrently.
+        """
+        self.n_threads = n_threads
+        self.row_blocks = _split_rows(self.coupled_mapping, n_threads)
+        nblocks = len(self.row_blocks)
+        self._pool = _get_exchange_pool(nblocks) if nblocks > 1 else None
+        if self._pool is not None:
+            logger.debug(f"{self.label}: exchanging in {nblocks} threads")
+
     def _raise_if_not_compatible(
         self,
         array1: NDArray[np.float64 | np.int32],
@@ -150,22 +344,228 @@ class MemoryExchange:
                 "conversion array should have the same shape as corresponding ptr"
             )
 
+    def _matvec(self, delt: float = 1.0) -> NDArray[np.float64]:
+        """
+        Compute mapping * ptr_a / delt for all rows of ptr_b into a work
+        buffer. The returned array is overwritten by the next call.
+        """
+        if self._matvec_out is None:
+            self._matvec_out = np.zeros(self.ptr_b.size, dtype=np.float64)
+        out = sparse_dot(self.mapping, self.ptr_a, self._matvec_out)
+        if delt != 1.0:
+            np.divide(out, delt, out=out)
+        return out
+
+    def _coupled_matvec(
+        self,
+        delt: float = 1.0,
+        out: NDArray[np.float64] | None = None,
+        block: tuple[slice, csr_matrix] | None = None,
+    ) -> NDArray[np.float64]:
+        """
+        Compute mapping * ptr_a / delt for the coupled rows of ptr_b only, or
+        for a block of those rows. By default the result is written into a
+        work buffer, which is overwritten by the next call.
+        """
+        rows, mapping = (slice(None), self.coupled_mapping) if block is None else block
+        if out is None:
+            out = self._coupled_out[rows]
+        if self.strategy == ExchangeStrategy.GATHER and self.ptr_a.dtype == np.float64:
+            np.take(self.ptr_a, self._gather_index[rows], out=out, mode="clip")
+            if self._gather_weights is not None:
+                np.multiply(out, self._gather_weights[rows], out=out)
+        else:
+            sparse_dot(mapping, self.ptr_a, out)
+        if delt != 1.0:
+            np.divide(out, delt, out=out)
+        return out
+
+    def direct_target(self) -> NDArray[np.float64] | None:
+        """
+        The coupled rows of ptr_b as a view to write the exchange into, or None
+        if they are not a contiguous float64 block
+        """
+        if self._coupled_slice is None or self.ptr_b.dtype != np.float64:
+            return None
+        target = cast(NDArray[np.float64], self.ptr_b[self._coupled_slice])
+        if not (target.flags.c_contiguous and target.flags.writeable):
+            return None
+        return target
+
+    def _exchange_block(self, block: tuple[slice, csr_matrix], delt: float) -> None:
+        rows = block[0]
+        target = self.direct_target()
+        if target is not None:
+            self._coupled_matvec(delt, target[rows], block)
+        else:
+            values = self._coupled_matvec(delt, block=block)
+            self.ptr_b[self.coupled_rows[rows]] = values
+
+    def _source_unchanged(self, delt: float) -> bool:
+        """
+        Compare ptr_a and delt with the last exchange, and store them as
+        snapshot when they differ
+        """
+        if self._snapshot_delt == delt:
+            np.not_equal(self.ptr_a, self._snapshot, out=self._changed)
+            if not self._changed.any():
+                return True
+        np.copyto(self._snapshot, self.ptr_a)
+        self._snapshot_delt = delt
+        return False
+
     def exchange(self, delt: float = 1.0) -> None:
         """Exchange Kernel a to Kernel b"""
-        self.ptr_b[:] = (
-            self.mask[:] * self.ptr_b[:] + self.mapping.dot(self.ptr_a)[:] / delt
-        )
+        with instrumentation.measure("exchange " + self.label, self.coupled_rows.size):
+            self._exchange(delt)
+
+    def _exchange(self, delt: float) -> None:
+        if self.track_changes and self._source_unchanged(delt):
+            self.n_skipped += 1
+            return
+        self.n_performed += 1
+        # equivalent to: ptr_b = mask * ptr_b + mapping * ptr_a / delt
+        if self._pool is None:
+            self._exchange_block(self.row_blocks[0], delt)
+        else:
+            futures = [
+                self._pool.submit(self._exchange_block, block, delt)
+                for block in self.row_blocks
+            ]
+            for future in futures:
+                future.result()
         self.delt = delt
 
     def add(self, delt: float = 1.0) -> None:
         """sum Kernel a to Kernel b"""
-        np.add(self.ptr_b, self.mapping.dot(self.ptr_a)[:] / delt, out=self.ptr_b)
+        with instrumentation.measure("add " + self.label, self.coupled_rows.size):
+            if self._gather_out is None:
+                self._gather_out = np.zeros(self.coupled_rows.size, dtype=np.float64)
+            values = np.take(self.ptr_b, self.coupled_rows, out=self._gather_out)
+            np.add(values, self._coupled_matvec(delt), out=values)
+            self.ptr_b[self.coupled_rows] = values
 
     def log(self, time: float) -> None:
-        self.exchange_logger.log_exchange(self.label + "_a", self.ptr_a[:], time)
-        self.exchange_logger.log_exchange(self.label + "_b", self.ptr_b[:], time)
+        with instrumentation.measure(
+            "log " + self.label, self.ptr_a.size + self.ptr_b.size
+        ):
+            self.exchange_logger.log_exchange(self.label + "_a", self.ptr_a[:], time)
+            self.exchange_logger.log_exchange(self.label + "_b", self.ptr_b[:], time)
 
     def finalize_log(self) -> None:
         """finalizes the exchange within the logger, if present"""
-        if self.label in self.exchange_logger.exchanges.keys():
-            self.exchange_logger.exchanges[self.label].finalize()
+        self.exchange_logger.finalize_exchange(self.label)
+
+    def report_exchange_counts(self) -> None:
+        """reports the number of performed and skipped exchanges"""
+        if self.track_changes:
+            logger.info(
+                f"{self.label}: {self.n_performed} exchanges performed, "
+                f"{self.n_skipped} skipped as unchanged"
+            )
+
+
+class _SourceGroup:
+    """MemoryExchanges of an ExchangePlan that read from the same source array"""
+
+    def __init__(self) -> None:
+        self.members: list[tuple[MemoryExchange, bool]] = []
+
+    def add(self, exchange: MemoryExchange, divide_by_delt: bool) -> None:
+        self.members.append((exchange, divide_by_delt))
+        exchanges = [member for member, _ in self.members]
+        # stack the coupled rows of all members into a single mapping
+        self.mapping = csr_matrix(
+            vstack([member.coupled_mapping for member in exchanges], format="csr")
+        )
+        sizes = [member.coupled_rows.size for member in exchanges]
+        self.offsets = np.concatenate(([0], np.cumsum(sizes)))
+        self._out = np.zeros(self.offsets[-1], dtype=np.float64)
+        # the stacked mat-vec runs on as many threads as its members would
+        n_threads = max(member.n_threads for member in exchanges)
+        self.row_blocks = _split_rows(self.mapping, n_threads)
+        nblocks = len(self.row_blocks)
+        self._pool = _get_exchange_pool(nblocks) if nblocks > 1 else None
+
+    def _matvec(self, ptr_a: NDArray[np.float64 | np.int32]) -> NDArray[np.float64]:
+        if self._pool is None:
+            return sparse_dot(self.mapping, ptr_a, self._out)
+        futures = [
+            self._pool.submit(sparse_dot, block_mapping, ptr_a, self._out[rows])
+            for rows, block_mapping in self.row_blocks
+        ]
+        for future in futures:
+            future.result()
+        return self._out
+
+    def exchange(self, delt: float) -> None:
+        if len(self.members) == 1:
+            exchange, divide_by_delt = self.members[0]
+            exchange.exchange(delt if divide_by_delt else 1.0)
+            return
+        start = perf_counter()
+        values = self._matvec(self.members[0][0].ptr_a)
+        matvec_seconds = perf_counter() - start
+        for imember, (exchange, divide_by_delt) in enumerate(self.members):
+            member_values = values[self.offsets[imember] : self.offsets[imember + 1]]
+            member_delt = delt if divide_by_delt else 1.0
+            with instrumentation.measure(
+                "exchange " + exchange.label, exchange.coupled_rows.size
+            ) as counter:
+                target = exchange.direct_target()
+                if target is not None:
+                    np.divide(member_values, member_delt, out=target)
+                else:
+                    if member_delt != 1.0:
+                        np.divide(member_values, member_delt, out=member_values)
+                    exchange.ptr_b[exchange.coupled_rows] = member_values
+            if counter is not None:
+                # the member's share of the stacked mat-vec, by stored entries
+                share = exchange.coupled_mapping.nnz / max(self.mapping.nnz, 1)
+                counter.seconds += matvec_seconds * share
+            exchange.delt = member_delt
+            exchange.n_performed += 1
+
+
+class ExchangePlan:
+    """
+    Class to run a fixed set of MemoryExchanges as one operation per source.
+
+    Sparse exchanges that read from the same source array are stacked into a
+    single sparse matrix, so only one mat-vec is done per source. Gather
+    exchanges are already a single pass over their source and are run as
+    they are. The result is identical to running the exchanges one by one.
+    """
+
+    def __init__(self) -> None:
+        self.groups: dict[tuple[int, int, str], _SourceGroup] = {}
+        self.direct: list[tuple[MemoryExchange, bool]] = []
+
+    def add(self, exchange: MemoryExchange, divide_by_delt: bool = False) -> None:
+        """
+        Add an exchange to the plan.
+
+        Parameters
+        ----------
+        exchange : MemoryExchange
+            The exchange to run as part of this plan
+        divide_by_delt : bool, optional
+            Whether the exchanged values are divided by the time step passed
+            to `exchange`
+        """
+        if exchange.strategy == ExchangeStrategy.GATHER:
+            self.direct.append((exchange, divide_by_delt))
+            return
+        # kernel pointers to the same memory are distinct numpy arrays,
+        # so group them on their address
+        ptr_a = exchange.ptr_a
+        key = (ptr_a.__array_interface__["data"][0], ptr_a.size, ptr_a.dtype.str)
+        self.groups.setdefault(key, _SourceGroup()).add(exchange, divide_by_delt)
+
+    @instrumentation.timed("exchange plan")
+    def exchange(self, delt: float = 1.0) -> None:
+        """Run all exchanges in the plan"""
+        for exchange, divide_by_delt in self.direct:
+            exchange.exchange(delt if divide_by_delt else 1.0)
+        for group in self.groups.values():
+            group.exchange(delt)
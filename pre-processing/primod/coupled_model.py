@@ -1,9 +1,11 @@
 import abc
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from primod.driver_coupling.driver_coupling_base import DriverCoupling
+from primod.manifest import WriteManifest, write_incremental
 
 
 class CoupledModel(abc.ABC):
@@ -31,23 +33,71 @@ class CoupledModel(abc.ABC):
                     coupling_dict[top_key] = top_value
         return coupling_dict
 
-    def write_exchanges(self, directory: str | Path) -> dict[str, Any]:
+    def write_exchanges(
+        self,
+        directory: str | Path,
+        binary: bool = False,
+        n_workers: int = 1,
+        manifest: WriteManifest | None = None,
+    ) -> dict[str, Any]:
         """
         Write exchanges and return their filenames for the coupler
-        configuration file.
+        configuration file. With ``binary=True``, the exchanges are written as
+        .npy files instead of .dxc and .tsv files. With ``n_workers`` larger
+        than one, the independent exchanges of each coupling, such as the
+        mappings of the MODFLOW 6 packages, are derived and written in a pool
+        of that many threads. The result does not depend on ``n_workers``.
+        With a ``manifest``, exchanges whose inputs and files are unchanged
+        since the last write are not derived and written again.
         """
+        if n_workers < 1:
+            raise ValueError(f"n_workers should be at least 1, received {n_workers}")
         directory = Path(directory)
         exchange_dir = Path(directory) / "exchanges"
         exchange_dir.mkdir(exist_ok=True, parents=True)
 
+        # The couplings are handled one by one, since they modify the models
+        # they share.
+        executor = (
+            ThreadPoolExecutor(n_workers, thread_name_prefix="write_exchanges")
+            if n_workers > 1
+            else None
+        )
         coupling_dicts = []
-        for coupling in self.coupling_list:
-            coupling_dict = coupling.write_exchanges(
-                directory=exchange_dir, coupled_model=self
-            )
-            coupling_dicts.append(coupling_dict)
+        try:
+            for coupling in self.coupling_list:
+                coupling_dict = coupling.write_exchanges(
+                    directory=exchange_dir,
+                    coupled_model=self,
+                    binary=binary,
+                    executor=executor,
+                    manifest=manifest,
+                )
+                coupling_dicts.append(coupling_dict)
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         # FUTURE: if we support multiple MF6 models, group them by name before
         # merging, and return a list of coupling_dicts.
         merged_coupling_dict = self._merge_coupling_dicts(coupling_dicts)
         return merged_coupling_dict
+
+    @staticmethod
+    def _write_model(
+        manifest: WriteManifest | None,
+        key: str,
+        inputs: tuple[Any, ...],
+        model_dir: Path,
+        write: Callable[[Path], Any],
+    ) -> None:
+        """
+        Write a model to model_dir, unless the manifest shows its inputs and
+        files are unchanged since the last write.
+        """
+
+        def write_model() -> tuple[dict[str, Any], list[Path]]:
+            write(model_dir)
+            return {}, [model_dir]
+
+        write_incremental(manifest, key, inputs, write_model)
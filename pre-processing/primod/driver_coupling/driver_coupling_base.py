@@ -1,9 +1,12 @@
 import abc
+from concurrent.futures import Executor
 from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel
 
+from primod.manifest import WriteManifest
+
 
 class DriverCoupling(BaseModel, abc.ABC):
     """
@@ -18,5 +21,18 @@ class DriverCoupling(BaseModel, abc.ABC):
         pass
 
     @abc.abstractmethod
-    def write_exchanges(self, directory: Path, coupled_model: Any) -> dict[str, Any]:
+    def write_exchanges(
+        self,
+        directory: Path,
+        coupled_model: Any,
+        binary: bool = False,
+        executor: Executor | None = None,
+        manifest: WriteManifest | None = None,
+    ) -> dict[str, Any]:
+        """
+        Derive and write the exchanges of this coupling. Independent exchanges
+        are derived and written in the executor, when one is given. With a
+        manifest, exchanges whose inputs and files are unchanged since the last
+        write are skipped.
+        """
         pass
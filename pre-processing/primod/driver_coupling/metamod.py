@@ -1,3 +1,4 @@
+from concurrent.futures import Executor
 from pathlib import Path
 from typing import Any
 
@@ -7,6 +8,8 @@ from imod.mf6 import GroundwaterFlowModel, Modflow6Simulation
 from imod.msw import GridData, MetaSwapModel, Sprinkling
 
 from primod.driver_coupling.driver_coupling_base import DriverCoupling
+from primod.driver_coupling.util import _map
+from primod.manifest import WriteManifest, write_incremental
 from primod.mapping.node_max_layer import ModMaxLayer
 from primod.mapping.node_svat_mapping import NodeSvatMapping
 from primod.mapping.rch_svat_mapping import RechargeSvatMapping
@@ -144,30 +147,72 @@ class MetaModDriverCoupling(DriverCoupling):
         else:
             return grid_mapping, rch_mapping, None, max_layer
 
-    def write_exchanges(self, directory: Path, coupled_model: Any) -> dict[str, Any]:
+    def write_exchanges(
+        self,
+        directory: Path,
+        coupled_model: Any,
+        binary: bool = False,
+        executor: Executor | None = None,
+        manifest: WriteManifest | None = None,
+    ) -> dict[str, Any]:
         mf6_simulation = coupled_model.mf6_simulation
         gwf_model = mf6_simulation[self.mf6_model]
         msw_model = coupled_model.msw_model
 
-        grid_mapping, rch_mapping, well_mapping, max_layer = self.derive_mapping(
-            msw_model=msw_model,
-            gwf_model=gwf_model,
-        )
-
-        coupling_dict: dict[str, Any] = {}
-        coupling_dict["mf6_model"] = self.mf6_model
-        coupling_dict["mf6_msw_node_map"] = grid_mapping.write(directory)
-        coupling_dict["mf6_msw_recharge_pkg"] = self.mf6_recharge_package
-        coupling_dict["mf6_msw_recharge_map"] = rch_mapping.write(directory)
+        def write() -> tuple[dict[str, Any], list[Path]]:
+            grid_mapping, rch_mapping, well_mapping, max_layer = self.derive_mapping(
+                msw_model=msw_model,
+                gwf_model=gwf_model,
+            )
 
-        if well_mapping is not None:
-            coupling_dict["mf6_msw_well_pkg"] = self.mf6_wel_package
-            coupling_dict["mf6_msw_sprinkling_map_groundwater"] = well_mapping.write(
-                directory
+            mappings = [
+                mapping
+                for mapping in (grid_mapping, rch_mapping, well_mapping, max_layer)
+                if mapping is not None
+            ]
+            # the mappings are independent, write them in the executor
+            written = _map(
+                executor, lambda mapping: mapping.write(directory, binary), mappings
             )
-        if max_layer is not None:
-            coupling_dict["mf6_node_max_layer"] = max_layer.write(directory)
-        return coupling_dict
+            filenames = dict(zip(mappings, written))
+
+            coupling_dict: dict[str, Any] = {}
+            coupling_dict["mf6_model"] = self.mf6_model
+            coupling_dict["mf6_msw_node_map"] = filenames[grid_mapping]
+            coupling_dict["mf6_msw_recharge_pkg"] = self.mf6_recharge_package
+            coupling_dict["mf6_msw_recharge_map"] = filenames[rch_mapping]
+
+            if well_mapping is not None:
+                coupling_dict["mf6_msw_well_pkg"] = self.mf6_wel_package
+                coupling_dict["mf6_msw_sprinkling_map_groundwater"] = filenames[
+                    well_mapping
+                ]
+            if max_layer is not None:
+                coupling_dict["mf6_node_max_layer"] = filenames[max_layer]
+            return coupling_dict, [directory.parent / filename for filename in written]
+
+        # the mappings are derived from these packages only; wells with a
+        # screen are assigned to layers with the conductivity of the NPF
+        # package
+        gwf_keys = (
+            gwf_model._get_pkgkey("dis"),
+            gwf_model._get_pkgkey("npf"),
+            self.mf6_recharge_package,
+            self.mf6_wel_package,
+        )
+        inputs = (
+            self,
+            binary,
+            [
+                pkg
+                for pkg in msw_model.values()
+                if isinstance(pkg, GridData | Sprinkling)
+            ],
+            [gwf_model[key] for key in gwf_keys if key in gwf_model],
+        )
+        return write_incremental(
+            manifest, f"MetaModDriverCoupling/{self.mf6_model}", inputs, write
+        )
 
 
 def get_idomain(gwf_model: GroundwaterFlowModel) -> xr.DataArray | None:
@@ -1,4 +1,5 @@
 import copy
+from concurrent.futures import Executor
 from pathlib import Path
 from typing import Any
 
@@ -11,9 +12,11 @@ from imod.msw import GridData, MetaSwapModel, Sprinkling
 
 from primod.driver_coupling.driver_coupling_base import DriverCoupling
 from primod.driver_coupling.util import (
+    _map,
     _nullify_ribasim_exchange_input,
     _validate_node_ids,
 )
+from primod.manifest import WriteManifest, write_incremental
 from primod.mapping.svat_basin_mapping import SvatBasinMapping
 from primod.mapping.svat_user_demand_mapping import SvatUserDemandMapping
 
@@ -124,25 +127,61 @@ class RibaMetaDriverCoupling(DriverCoupling):
         else:
             return svat_basin_mapping, None
 
-    def write_exchanges(self, directory: Path, coupled_model: Any) -> dict[str, Any]:
+    def write_exchanges(
+        self,
+        directory: Path,
+        coupled_model: Any,
+        binary: bool = False,
+        executor: Executor | None = None,
+        manifest: WriteManifest | None = None,
+    ) -> dict[str, Any]:
         ribasim_model = coupled_model.ribasim_model
         msw_model = coupled_model.msw_model
 
-        svat_basin_mapping, svat_user_demand_mapping = self.derive_mapping(
-            ribasim_model=ribasim_model,
-            msw_model=msw_model,
+        def write() -> tuple[dict[str, Any], list[Path]]:
+            svat_basin_mapping, svat_user_demand_mapping = self.derive_mapping(
+                ribasim_model=ribasim_model,
+                msw_model=msw_model,
+            )
+
+            mappings: list[SvatBasinMapping | SvatUserDemandMapping] = [
+                svat_basin_mapping
+            ]
+            if svat_user_demand_mapping is not None:
+                mappings.append(svat_user_demand_mapping)
+            filenames = _map(
+                executor,
+                lambda mapping: mapping.write(directory=directory, binary=binary),
+                mappings,
+            )
+            result = {
+                "filenames": filenames,
+                "basin_index": svat_basin_mapping.dataframe["basin_index"].tolist(),
+            }
+            return result, [directory.parent / filename for filename in filenames]
+
+        inputs = (
+            self,
+            binary,
+            [
+                pkg
+                for pkg in msw_model.values()
+                if isinstance(pkg, GridData | Sprinkling)
+            ],
+            ribasim_model.basin.node.df,
+            ribasim_model.user_demand.node.df,
         )
+        result = write_incremental(manifest, "RibaMetaDriverCoupling", inputs, write)
+        filenames = result["filenames"]
 
         coupling_dict: dict[str, Any] = {}
-        coupling_dict["rib_msw_ponding_map_surface_water"] = svat_basin_mapping.write(
-            directory=directory
-        )
+        coupling_dict["rib_msw_ponding_map_surface_water"] = filenames[0]
 
         # Set Ribasim runoff input to Null for coupled basins
         basin_ids = _validate_node_ids(
             ribasim_model.basin.node.df, self.ribasim_basin_definition
         )
-        coupled_basin_indices = svat_basin_mapping.dataframe["basin_index"]
+        coupled_basin_indices = result["basin_index"]
         coupled_basin_node_ids = basin_ids[coupled_basin_indices]
         _nullify_ribasim_exchange_input(
             ribasim_component=ribasim_model.basin,
@@ -151,11 +190,9 @@ class RibaMetaDriverCoupling(DriverCoupling):
         )
 
         # Now deal with sprinkling if set
-        if svat_user_demand_mapping is not None:
+        if len(filenames) > 1:
             _ = _validate_node_ids(
                 ribasim_model.user_demand.node.df, self.ribasim_user_demand_definition
             )
-            coupling_dict["rib_msw_sprinkling_map_surface_water"] = (
-                svat_user_demand_mapping.write(directory=directory)
-            )
+            coupling_dict["rib_msw_sprinkling_map_surface_water"] = filenames[1]
         return coupling_dict
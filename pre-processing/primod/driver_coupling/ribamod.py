@@ -1,4 +1,5 @@
 import abc
+from concurrent.futures import Executor
 from pathlib import Path
 from typing import Any, cast
 
@@ -11,9 +12,11 @@ from geopandas import gpd
 
 from primod.driver_coupling.driver_coupling_base import DriverCoupling
 from primod.driver_coupling.util import (
+    _map,
     _nullify_ribasim_exchange_input,
     _validate_node_ids,
 )
+from primod.manifest import WriteManifest, write_incremental
 from primod.mapping.node_basin_mapping import ActiveNodeBasinMapping, NodeBasinMapping
 
 
@@ -72,6 +75,9 @@ class RibaModDriverCoupling(DriverCoupling, abc.ABC):
         self,
         directory: Path,
         coupled_model: Any,
+        binary: bool = False,
+        executor: Executor | None = None,
+        manifest: WriteManifest | None = None,
     ) -> dict[str, Any]:
         mf6_simulation = coupled_model.mf6_simulation
         gwf_model = mf6_simulation[self.mf6_model]
@@ -105,26 +111,65 @@ class RibaModDriverCoupling(DriverCoupling, abc.ABC):
         # drainage and infiltration to NoData later on.
         coupling_dict = self._empty_coupling_dict()
         coupling_dict["mf6_model"] = self.mf6_model
-        coupled_basin_indices = []
-        for gwf_package_key in self.mf6_packages:
-            gridded_basin = basin_dataset[gwf_package_key]
-            filename, destination, basin_index = self._write_exchange(
-                directory,
-                gwf_model,
-                gwf_package_key,
-                ribasim_model,
-                basin_ids,
+        if self.mf6_packages:
+            self.setsubgrid_df(ribasim_model)
+        package_basins = [
+            (gwf_package_key, basin_dataset[gwf_package_key])
+            for gwf_package_key in self.mf6_packages
+        ]
+
+        def write_exchange(package_basin: tuple[str, xr.DataArray]) -> dict[str, Any]:
+            gwf_package_key, gridded_basin = package_basin
+
+            def write() -> tuple[dict[str, Any], list[Path]]:
+                filename, destination, basin_index = self._write_exchange(
+                    directory,
+                    gwf_model,
+                    gwf_package_key,
+                    ribasim_model,
+                    basin_ids,
+                    gridded_basin,
+                    binary,
+                )
+                result = {
+                    "filename": filename,
+                    "destination": destination,
+                    "basin_index": basin_index.tolist(),
+                }
+                return result, [directory.parent / filename]
+
+            inputs = (
+                self,
+                binary,
+                gwf_model[gwf_package_key],
                 gridded_basin,
+                basin_ids,
+                self.subgrid_df,
             )
+            key = f"{type(self).__name__}/{self.mf6_model}/{gwf_package_key}"
+            return write_incremental(manifest, key, inputs, write)
+
+        # The packages are independent, derive and write them in the executor;
+        # the models are only modified below, in the order of the packages.
+        exchanges = _map(executor, write_exchange, package_basins)
+        coupled_basin_indices = []
+        for gwf_package_key, exchange in zip(self.mf6_packages, exchanges):
+            destination = exchange["destination"]
+            if destination == "river":
+                # Add a MF6 API package for correction flows
+                gwf_model["api_" + gwf_package_key] = imod.mf6.ApiPackage(
+                    maxbound=gwf_model[gwf_package_key]._max_active_n(),
+                    save_flows=True,
+                )
             coupling_dict[f"mf6_{self._prefix}_{destination}_packages"][
                 gwf_package_key
-            ] = filename
-            coupled_basin_indices.append(basin_index)
+            ] = exchange["filename"]
+            coupled_basin_indices.append(exchange["basin_index"])
 
         # join all index lists in coupled_basin_indices
         all_coupled_basin_indices = []
         for cpl in coupled_basin_indices:
-            all_coupled_basin_indices += cpl.tolist()
+            all_coupled_basin_indices += cpl
         # force uniqueness onto the combined list
         coupled_basin_indices = list(set(all_coupled_basin_indices))
         coupled_basin_node_ids = basin_ids[coupled_basin_indices]
@@ -144,10 +189,10 @@ class RibaModDriverCoupling(DriverCoupling, abc.ABC):
         ribasim_model: ribasim.Model,
         basin_ids: pd.Series,
         gridded_basin: xr.DataArray,
-    ) -> tuple[str, str, pd.DataFrame]:
+        binary: bool = False,
+    ) -> tuple[str, str, pd.Series]:
         package = gwf_model[gwf_package_key]
 
-        self.setsubgrid_df(ribasim_model)
         mapping = self.derive_mapping(
             name=gwf_package_key,
             gridded_basin=gridded_basin,
@@ -162,11 +207,6 @@ class RibaModDriverCoupling(DriverCoupling, abc.ABC):
             )
 
         if isinstance(package, imod.mf6.River):
-            # Add a MF6 API package for correction flows
-            gwf_model["api_" + gwf_package_key] = imod.mf6.ApiPackage(
-                maxbound=package._max_active_n(),
-                save_flows=True,
-            )
             destination = "river"
             #  check if not coupling passive when adding a river package
             if isinstance(self, RibaModPassiveDriverCoupling):
@@ -208,7 +248,7 @@ class RibaModDriverCoupling(DriverCoupling, abc.ABC):
                     f"Expected River or Drainage, received: {type(package).__name__}"
                 )
 
-        filename = mapping.write(directory=directory)
+        filename = mapping.write(directory=directory, binary=binary)
         return filename, destination, mapping.dataframe["basin_index"]
 
 
@@ -1,3 +1,7 @@
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor
+from typing import TypeVar
+
 import geopandas as gpd
 import numpy as np
 import pandas as pd
@@ -9,6 +13,9 @@ from ribasim.config import Basin, UserDemand
 
 from primod.typing import Int
 
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 def _get_gwf_modelnames(mf6_simulation: Modflow6Simulation) -> list[str]:
     """
@@ -122,3 +129,15 @@ def _nullify_ribasim_exchange_input(
     _nullify(ribasim_component.static.df)
     _nullify(ribasim_component.time.df)
     return
+
+
+def _map(
+    executor: Executor | None, function: Callable[[T], R], items: Iterable[T]
+) -> list[R]:
+    """
+    Apply function to the items, in the executor when one is given. The
+    results are in the order of the items, so they merge deterministically.
+    """
+    if executor is None:
+        return [function(item) for item in items]
+    return list(executor.map(function, items))
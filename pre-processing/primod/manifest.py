@@ -0,0 +1,223 @@
+"""
+Manifest for incremental writes of coupled models.
+
+The manifest is stored in the directory a coupled model is written to. For
+every unit of work, such as an exchange file or one of the models, it holds a
+content hash of the inputs the unit is derived from and of the files it
+wrote. When the inputs and the files are unchanged on a next write, the unit
+is skipped.
+"""
+
+import hashlib
+import json
+import pickle
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import xarray as xr
+from pydantic import BaseModel
+
+MANIFEST_VERSION = 1
+_CHUNK_SIZE = 1 << 20
+
+# Attributes that describe how or where an object was written, rather than
+# its contents
+_UNHASHED_ATTRIBUTES = frozenset(("_template", "_validation_context", "directory"))
+
+
+class WriteManifest:
+    """
+    Content hashes of the inputs and outputs of the units written to a
+    directory.
+
+    Parameters
+    ----------
+    directory: Path
+        Directory the coupled model is written to. The manifest is stored in
+        this directory, and all outputs are recorded relative to it.
+    """
+
+    file_name = "primod_manifest.json"
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        path = self.directory / self.file_name
+        if path.is_file():
+            with open(path) as f:
+                content = json.load(f)
+            if content.get("version") == MANIFEST_VERSION:
+                self._entries = content["entries"]
+
+    @staticmethod
+    def hash_inputs(*parts: Any) -> str:
+        """
+        Return a content hash of the parts: the values of arrays, datasets and
+        dataframes, the items of mappings and sequences, and the attributes of
+        other objects such as the packages of a model.
+        """
+        digest = hashlib.blake2b(str(MANIFEST_VERSION).encode(), digest_size=16)
+        for part in parts:
+            _update(digest, part, set())
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            while chunk := f.read(_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def lookup(self, key: str, input_hash: str) -> dict[str, Any] | None:
+        """
+        Return the result recorded for the unit, or None if the unit has to be
+        written: its inputs changed, or its outputs were removed or modified.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry["inputs"] != input_hash:
+            return None
+        for name, output_hash in entry["outputs"].items():
+            path = self.directory / name
+            if not path.is_file() or self.hash_file(path) != output_hash:
+                return None
+        result: dict[str, Any] = entry["result"]
+        return result
+
+    def record(
+        self,
+        key: str,
+        input_hash: str,
+        outputs: Iterable[Path],
+        result: dict[str, Any],
+    ) -> None:
+        """
+        Record the inputs, outputs and result of a unit that was written. The
+        files in output directories are recorded one by one.
+        """
+        files: list[Path] = []
+        for output in outputs:
+            if output.is_dir():
+                files.extend(path for path in output.rglob("*") if path.is_file())
+            else:
+                files.append(output)
+        entry = {
+            "inputs": input_hash,
+            "outputs": {
+                path.relative_to(self.directory).as_posix(): self.hash_file(path)
+                for path in sorted(files)
+            },
+            "result": result,
+        }
+        with self._lock:
+            self._entries[key] = entry
+
+    def save(self) -> None:
+        with self._lock:
+            content = {"version": MANIFEST_VERSION, "entries": self._entries}
+        with open(self.directory / self.file_name, "w") as f:
+            json.dump(content, f, indent=1)
+
+
+def write_incremental(
+    manifest: WriteManifest | None,
+    key: str,
+    inputs: tuple[Any, ...],
+    write: Callable[[], tuple[dict[str, Any], list[Path]]],
+) -> dict[str, Any]:
+    """
+    Call ``write``, unless the manifest shows its inputs and outputs are
+    unchanged since the last write.
+
+    Parameters
+    ----------
+    manifest: WriteManifest or None
+        The manifest of the directory; None writes unconditionally.
+    key: str
+        Unique name of the unit in the manifest.
+    inputs: tuple
+        Everything the outputs of ``write`` are derived from.
+    write: Callable
+        Writes the unit and returns its result, which has to be JSON
+        serializable, and the files or directories it wrote.
+
+    Returns
+    -------
+    dict
+        The result of ``write``, or the recorded result if it was skipped.
+    """
+    if manifest is None:
+        result, _ = write()
+        return result
+    input_hash = manifest.hash_inputs(*inputs)
+    recorded = manifest.lookup(key, input_hash)
+    if recorded is not None:
+        return recorded
+    result, outputs = write()
+    manifest.record(key, input_hash, outputs, result)
+    return result
+
+
+def _update(digest: "hashlib.blake2b", part: Any, seen: set[int]) -> None:
+    digest.update(type(part).__qualname__.encode())
+    if part is None or isinstance(part, bool | int | float | str | Path):
+        digest.update(repr(part).encode())
+    elif isinstance(part, np.ndarray):
+        digest.update(f"{part.dtype.str}{part.shape}".encode())
+        if part.dtype.hasobject:
+            digest.update(pickle.dumps(part.tolist()))
+        else:
+            digest.update(np.ascontiguousarray(part).reshape(-1).view(np.uint8).data)
+    elif isinstance(part, xr.DataArray):
+        _update(digest, part.to_dataset(name=str(part.name)), seen)
+    elif isinstance(part, xr.Dataset):
+        for name, variable in sorted(part.variables.items(), key=lambda x: str(x[0])):
+            _update(digest, (str(name), variable.dims, variable.to_numpy()), seen)
+        _update(digest, part.attrs, seen)
+    elif isinstance(part, pd.DataFrame | pd.Series):
+        if isinstance(part, gpd.GeoDataFrame):
+            part = part.to_wkb()
+        names = part.columns if isinstance(part, pd.DataFrame) else [part.name]
+        digest.update(repr(list(names)).encode())
+        _update(digest, pd.util.hash_pandas_object(part).to_numpy(), seen)
+    elif isinstance(part, BaseModel):
+        _update(digest, dict(part), seen)
+    elif isinstance(part, Mapping):
+        for key, value in part.items():
+            _update(digest, (key, value), seen)
+        # models are mappings of packages, with options as attributes
+        if hasattr(part, "__dict__"):
+            _update_attributes(digest, part, seen)
+    elif isinstance(part, list | tuple):
+        digest.update(str(len(part)).encode())
+        for item in part:
+            _update(digest, item, seen)
+    elif hasattr(part, "__dict__"):
+        _update_attributes(digest, part, seen)
+    else:
+        # an object that changes content without changing its pickle is
+        # unlikely; the reverse only causes an unnecessary write
+        try:
+            digest.update(pickle.dumps(part))
+        except Exception:
+            digest.update(repr(part).encode())
+    digest.update(b"\x00")
+
+
+def _update_attributes(digest: "hashlib.blake2b", part: Any, seen: set[int]) -> None:
+    if id(part) in seen:
+        return
+    seen.add(id(part))
+    for name, value in vars(part).items():
+        if name == "data" and isinstance(part, Mapping):
+            continue
+        if name in _UNHASHED_ATTRIBUTES:
+            continue
+        _update(digest, (name, value), seen)
@@ -1,8 +1,10 @@
 import abc
+from collections.abc import Iterator
 from io import TextIOWrapper
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 import xarray as xr
 from imod.msw.fixed_format import VariableMetaData, format_fixed_width
@@ -13,7 +15,7 @@ class GenericMapping(abc.ABC):
     name: str
     dataframe: pd.DataFrame
 
-    def write(self, directory: Path) -> str:
+    def write(self, directory: Path, binary: bool = False) -> str:
         """
         Write mapping to .tsv  file
 
@@ -21,10 +23,17 @@ class GenericMapping(abc.ABC):
         ----------
         directory: str or Path
             directory in which exchange file should be written
+        binary: bool
+            Write the columns as a two-dimensional int32 array to a .npy file
+            instead, which the coupler reads memory mapped.
 
         """
-        filename = f"{self.name}.tsv"
-        self.dataframe.to_csv(directory / filename, sep="\t", index=False)
+        if binary:
+            filename = f"{self.name}.npy"
+            write_binary_table(directory / filename, self.dataframe.to_numpy())
+        else:
+            filename = f"{self.name}.tsv"
+            self.dataframe.to_csv(directory / filename, sep="\t", index=False)
         return f"./{directory.name}/{filename}"
 
 
@@ -66,13 +75,15 @@ class MetaModMapping(abc.ABC):
             "You can create a new package with a selection by calling (**dataset.sel(**selection))"
         )
 
-    def _check_range(self, dataframe: pd.DataFrame) -> None:
-        for varname in dataframe:
+    def _check_range(self, columns: dict[str, Any]) -> None:
+        for varname, values in columns.items():
             min_value = self._metadata_dict[varname].min_value
             max_value = self._metadata_dict[varname].max_value
-            if (dataframe[varname] < min_value).any() or (
-                dataframe[varname] > max_value
-            ).any():
+            values = np.asarray(values)
+            if min_value is None or max_value is None or values.size == 0:
+                continue
+            # fmin and fmax skip NaN, like the element-wise comparisons did
+            if np.fmin.reduce(values) < min_value or np.fmax.reduce(values) > max_value:
                 raise ValueError(
                     f"{varname}: not all values are within range ({min_value}-{max_value})."
                 )
@@ -80,34 +91,102 @@ class MetaModMapping(abc.ABC):
     def write_dataframe_fixed_width(
         self, file: TextIOWrapper, dataframe: pd.DataFrame
     ) -> None:
-        for row in dataframe.itertuples():
-            for index, metadata in enumerate(self._metadata_dict.values()):
-                content = format_fixed_width(row[index + 1], metadata)
-                file.write(content)
-            file.write("\n")
-
-    def _index_da(self, da: pd.DataFrame, index: NDArray[Any]) -> Any:
-        return da.to_numpy().ravel()[index]
+        self.write_columns_fixed_width(
+            file,
+            {
+                varname: dataframe.iloc[:, index].to_numpy()
+                for index, varname in enumerate(self._metadata_dict)
+            },
+        )
 
-    def _render(
-        self, file: TextIOWrapper, index: NDArray[Any], svat: pd.DataFrame
+    def write_columns_fixed_width(
+        self, file: TextIOWrapper, columns: dict[str, Any]
     ) -> None:
-        data_dict = {"svat": svat.to_numpy().ravel()[index]}
+        """
+        Write the columns in fixed width format. Columns missing from
+        ``columns`` are written empty. Lines are formatted and written in
+        blocks, so the text of the whole file is never in memory at once.
+        """
+        nrow = max(
+            (np.size(values) for values in columns.values() if np.ndim(values)),
+            default=0,
+        )
+        for start in range(0, nrow, _WRITE_BLOCK_ROWS):
+            stop = min(start + _WRITE_BLOCK_ROWS, nrow)
+            block = [
+                _format_fixed_width_column(
+                    _column_block(columns.get(varname, ""), start, stop), metadata
+                )
+                for varname, metadata in self._metadata_dict.items()
+            ]
+            if any(column is None for column in block):
+                # values the column formatter does not support, format them
+                # one by one instead
+                for row in range(start, stop):
+                    for varname, metadata in self._metadata_dict.items():
+                        value = _column_block(columns.get(varname, ""), row, row + 1)
+                        file.write(format_fixed_width(value[0], metadata))
+                    file.write("\n")
+                continue
+            newline = np.full((stop - start, 1), ord("\n"), dtype=np.uint8)
+            lines = np.concatenate([*block, newline], axis=1)
+            file.write(lines.tobytes().decode("ascii"))
+
+    def _index_da(self, da: xr.DataArray, index: NDArray[Any]) -> Any:
+        return _take(da, index)
+
+    def _get_columns(self, index: NDArray[Any], svat: pd.DataFrame) -> dict[str, Any]:
+        data_dict = {"svat": self._index_da(svat, index)}
 
         for var in self._with_subunit:
             data_dict[var] = self._index_da(self.dataset[var], index)
+        return data_dict
 
-        for var in self._to_fill:
-            data_dict[var] = ""
+    def _n_rows(self, index: NDArray[Any]) -> int:
+        return int(np.count_nonzero(index))
 
-        dataframe = pd.DataFrame(
-            data=data_dict, columns=list(self._metadata_dict.keys())
-        )
+    def _column_blocks(
+        self, index: NDArray[Any], svat: pd.DataFrame
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Yield the columns for consecutive blocks of the cells in index, so only
+        one block of the columns is in memory at a time.
+        """
+        for start in range(0, index.size, _WRITE_BLOCK_ROWS):
+            block = np.flatnonzero(index[start : start + _WRITE_BLOCK_ROWS])
+            if block.size > 0:
+                yield self._get_columns(block + start, svat)
+
+    def _render(
+        self, file: TextIOWrapper, index: NDArray[Any], svat: pd.DataFrame
+    ) -> None:
+        for data_dict in self._column_blocks(index, svat):
+            self._check_range(data_dict)
+            self.write_columns_fixed_width(file, data_dict)
 
-        self._check_range(dataframe)
-        self.write_dataframe_fixed_width(file, dataframe)
+    def _render_binary(
+        self, path: Path, index: NDArray[Any], svat: pd.DataFrame
+    ) -> None:
+        # the columns of the .dxc file, without the empty ones
+        columns = [var for var in self._metadata_dict if var not in self._to_fill]
+        n_rows = self._n_rows(index)
+        if n_rows == 0:
+            write_binary_table(path, np.empty((0, len(columns)), dtype=np.int32))
+            return
+        # fill the file block by block, instead of stacking all columns first
+        table = np.lib.format.open_memmap(
+            path, mode="w+", dtype=np.int32, shape=(n_rows, len(columns))
+        )
+        start = 0
+        for data_dict in self._column_blocks(index, svat):
+            self._check_range(data_dict)
+            block = np.column_stack([data_dict[var] for var in columns])
+            table[start : start + len(block)] = _to_int32(path, block)
+            start += len(block)
+        table.flush()
+        del table
 
-    def write(self, directory: str | Path) -> str:
+    def write(self, directory: str | Path, binary: bool = False) -> str:
         """
         Write mapping to .dxc file.
 
@@ -115,7 +194,9 @@ class MetaModMapping(abc.ABC):
         ----------
         directory: str or Path
             directory in which exchange file should be written
-        index: np.array
+        binary: bool
+            Write the columns as a two-dimensional int32 array to a .npy file
+            instead, which the coupler reads memory mapped.
 
         """
         # Force to Path
@@ -123,6 +204,107 @@ class MetaModMapping(abc.ABC):
         # TODO: figure out how to please mypy with the slots here?
         index = self.index  # type: ignore
 
+        if binary:
+            filename = Path(self._file_name).with_suffix(".npy").name
+            self._render_binary(
+                directory / filename, index=index, svat=self.dataset["svat"]
+            )
+            return f"./{directory.name}/{filename}"
+
         with open(directory / self._file_name, "w") as f:
             self._render(f, index=index, svat=self.dataset["svat"])
         return f"./{directory.name}/{self._file_name}"
+
+
+# the number of lines that are formatted at once, and the number of svat grid
+# cells the columns of a block are read from
+_WRITE_BLOCK_ROWS = 250_000
+
+
+def _take(da: xr.DataArray, index: NDArray[Any]) -> NDArray[Any]:
+    """
+    Return the values of da at the flat positions in index (or where index is
+    True), without flattening or loading the whole array. This works on
+    broadcast views and dask arrays as well.
+    """
+    if index.dtype == bool:
+        index = np.flatnonzero(index)
+    positions = np.unravel_index(index, da.shape)
+    data = da.data
+    if hasattr(data, "vindex"):
+        # dask arrays only support point-wise indexing through vindex
+        return np.asarray(data.vindex[positions])
+    return np.asarray(data[positions])
+
+
+def expand_subunit(grid: xr.DataArray, svat: xr.DataArray) -> xr.DataArray:
+    """
+    Expand a (y, x) grid to the dimensions of svat. The result is a read-only
+    view on grid: the grid is not copied for every subunit.
+    """
+    subunit = svat["subunit"].to_numpy()
+    return grid.expand_dims(subunit=subunit).transpose(*svat.dims)
+
+
+def _column_block(values: Any, start: int, stop: int) -> NDArray[Any]:
+    """Return rows start to stop of a column; scalars fill the whole column"""
+    if np.ndim(values) == 0:
+        return np.full(stop - start, values, dtype=object)
+    return np.asarray(values)[start:stop]
+
+
+def _format_fixed_width_column(
+    values: NDArray[Any], metadata: VariableMetaData
+) -> NDArray[np.uint8] | None:
+    """
+    Format a column as ``format_fixed_width`` formats every value in it, as an
+    array with one row of ``column_width`` ASCII characters per value. Returns
+    None for values this does not support: floating point metadata, negative
+    integers and integers or strings wider than the column.
+    """
+    width = metadata.column_width
+    nrow = values.shape[0]
+    if metadata.dtype is str:
+        if values.dtype.kind in "OU" and (values == "").all():
+            return np.full((nrow, width), ord(" "), dtype=np.uint8)
+        text = "".join(f"{str(value):{width}}" for value in values)
+        if len(text) != nrow * width or not text.isascii():
+            return None
+        return np.frombuffer(text.encode("ascii"), dtype=np.uint8).reshape(nrow, width)
+    if metadata.dtype is not int or values.dtype.kind not in "biuf":
+        return None
+    if nrow == 0:
+        return np.empty((0, width), dtype=np.uint8)
+    if values.dtype.kind == "f" and not np.isfinite(values).all():
+        return None
+    # int() truncates towards zero, as does the conversion to int64
+    if values.min() <= -1 or values.max() >= 10**width:
+        return None
+    integers = values.astype(np.int64)
+    column = np.full((nrow, width), ord(" "), dtype=np.uint8)
+    for position in range(len(str(integers.max()))):
+        power = 10**position
+        digit = (integers // power % 10 + ord("0")).astype(np.uint8)
+        if position == 0:
+            # zero is written as a single 0
+            column[:, -1] = digit
+        else:
+            column[:, -1 - position] = np.where(integers >= power, digit, ord(" "))
+    return column
+
+
+def write_binary_table(path: Path, table: NDArray[Any]) -> None:
+    """
+    Write a table of integers to a .npy file as a two-dimensional int32 array,
+    the binary counterpart of the .dxc and .tsv exchange files.
+    """
+    table = np.asarray(table)
+    np.save(path, _to_int32(path, table).reshape(table.shape[0], -1))
+
+
+def _to_int32(path: Path, table: NDArray[Any]) -> NDArray[np.int32]:
+    if table.size > 0 and (
+        table.min() < np.iinfo(np.int32).min or table.max() > np.iinfo(np.int32).max
+    ):
+        raise ValueError(f"{path.name}: values do not fit in a 32 bit integer.")
+    return table.astype(np.int32)
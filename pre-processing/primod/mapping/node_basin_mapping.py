@@ -174,15 +174,16 @@ class ActiveNodeBasinMapping(NodeBasinMapping):
         conductance: xr.DataArray, include: NDArray[Bool]
     ) -> NDArray[Float]:
         # Include incorporates the layer dimension
-        # We don't want to replicate x and y for each layer.
-        # Instead, compute the indices into the x and y array for a single layer.
+        # We don't want to replicate x and y for each layer, nor create a
+        # (y, x) grid of coordinates: compute the row and column of the
+        # included cells in a single layer, and index the x and y arrays.
         x = conductance["x"].to_numpy()
         y = conductance["y"].to_numpy()
         n_per_layer = y.size * x.size
-        include2d = np.flatnonzero(include) % n_per_layer
-        yy, xx = np.meshgrid(y, x, indexing="ij")
-        xy = np.column_stack((xx.ravel(), yy.ravel()))
-        conductance_xy: NDArray[Float] = xy[include2d]
+        row, column = np.unravel_index(
+            np.flatnonzero(include) % n_per_layer, (y.size, x.size)
+        )
+        conductance_xy: NDArray[Float] = np.column_stack((x[column], y[row]))
         return conductance_xy
 
     @staticmethod
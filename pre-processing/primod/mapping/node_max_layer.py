@@ -5,6 +5,8 @@ import numpy as np
 import pandas as pd
 import xarray as xr
 
+from primod.mapping.mappingbase import write_binary_table
+
 
 class ModMaxLayer:
     dataset: dict[str, Any]
@@ -23,7 +25,7 @@ class ModMaxLayer:
             dtype=np.int64
         )
 
-    def write(self, directory: str | Path) -> str:
+    def write(self, directory: str | Path, binary: bool = False) -> str:
         """
         Write mapping to .dxc file.
 
@@ -31,13 +33,22 @@ class ModMaxLayer:
         ----------
         directory: str or Path
             directory in which exchange file should be written
-        index: np.array
+        binary: bool
+            Write the columns as a two-dimensional int32 array to a .npy file
+            instead, which the coupler reads memory mapped.
 
         """
         # Force to Path
         directory = Path(directory)
         # TODO: figure out how to please mypy with the slots here?
 
+        if binary:
+            filename = Path(self._file_name).with_suffix(".npy").name
+            write_binary_table(
+                directory / filename, pd.DataFrame(self.dataset).to_numpy()
+            )
+            return f"./{directory.name}/{filename}"
+
         pd.DataFrame(self.dataset).to_csv(
             directory / self._file_name, sep="\t", index=False
         )
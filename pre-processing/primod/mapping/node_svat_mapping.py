@@ -4,7 +4,7 @@ from imod import mf6
 from imod.msw.fixed_format import VariableMetaData
 from numpy.typing import NDArray
 
-from primod.mapping.mappingbase import MetaModMapping
+from primod.mapping.mappingbase import MetaModMapping, expand_subunit
 from primod.typing import Int
 
 
@@ -44,7 +44,9 @@ class NodeSvatMapping(MetaModMapping):
         super().__init__()
         self.index = index
         self.dataset["svat"] = svat
-        self.dataset["layer"] = xr.full_like(svat, 1)
+        self.dataset["layer"] = expand_subunit(
+            xr.full_like(svat.isel(subunit=0, drop=True), 1), svat
+        )
         idomain_top_layer = modflow_dis["idomain"].sel(layer=1, drop=True)
         # Test if equal to or larger than 1, to ignore idomain == -1 as well.
         # Don't assign to self.dataset, as grid extent might differ from svat
@@ -57,26 +59,24 @@ class NodeSvatMapping(MetaModMapping):
         Create modflow indices for the recharge layer, which is where
         infiltration will take place.
         """
-        self.dataset["mod_id"] = xr.full_like(
-            self.dataset["svat"], fill_value=0, dtype=np.int64
-        )
-
-        n_subunit = self.dataset["subunit"].size
-        n_mod = self.idomain_active.sum()
-
+        svat = self.dataset["svat"]
         idomain_active = self.idomain_active.to_numpy()
-
-        # idomain does not have a subunit dimension, so tile for n_subunits
-        mod_id_1d = np.tile(np.arange(1, n_mod + 1), (n_subunit, 1))
-
-        self.dataset["mod_id"].to_numpy()[:, idomain_active] = mod_id_1d
+        mod_id = np.zeros(idomain_active.shape, dtype=np.int64)
+        mod_id[idomain_active] = np.arange(1, np.count_nonzero(idomain_active) + 1)
+        # idomain does not have a subunit dimension, the ids are the same for
+        # every subunit
+        self.dataset["mod_id"] = expand_subunit(
+            svat.isel(subunit=0, drop=True).copy(data=mod_id), svat
+        )
 
     def _pkgcheck(self) -> None:
-        # Check if active msw cell inactive in idomain
-        active = self.dataset["svat"] != 0
-        inactive_in_idomain = active > self.idomain_active
+        # Check if active msw cell inactive in idomain, one subunit at a time
+        svat = self.dataset["svat"]
+        for subunit in range(svat.sizes["subunit"]):
+            active = svat.isel(subunit=subunit) != 0
+            inactive_in_idomain = active > self.idomain_active
 
-        if inactive_in_idomain.any():
-            raise ValueError(
-                "Active MetaSWAP cell detected in inactive cell in Modflow6 idomain"
-            )
+            if inactive_in_idomain.any():
+                raise ValueError(
+                    "Active MetaSWAP cell detected in inactive cell in Modflow6 idomain"
+                )
@@ -4,7 +4,7 @@ from imod import mf6
 from imod.msw.fixed_format import VariableMetaData
 from numpy.typing import NDArray
 
-from primod.mapping.mappingbase import MetaModMapping
+from primod.mapping.mappingbase import MetaModMapping, expand_subunit
 from primod.typing import Int
 
 
@@ -41,7 +41,9 @@ class RechargeSvatMapping(MetaModMapping):
         super().__init__()
         self.index = index
         self.dataset["svat"] = svat
-        self.dataset["layer"] = xr.full_like(svat, 1)
+        self.dataset["layer"] = expand_subunit(
+            xr.full_like(svat.isel(subunit=0, drop=True), 1), svat
+        )
         rate = recharge.dataset["rate"]
         if "layer" in rate.dims:
             rate_no_layer = rate.squeeze("layer", drop=True)
@@ -53,19 +55,15 @@ class RechargeSvatMapping(MetaModMapping):
         self._create_rch_id()
 
     def _create_rch_id(self) -> None:
-        self.dataset["rch_id"] = xr.full_like(
-            self.dataset["svat"], fill_value=0, dtype=np.int64
-        )
-
-        n_subunit = self.dataset["subunit"].size
-        n_rch = np.array(self.dataset["rch_active"]).sum()
-
+        svat = self.dataset["svat"]
         rch_active = self.dataset["rch_active"].to_numpy()
-
-        # recharge does not have a subunit dimension, so tile for n_subunits
-        rch_id: NDArray[np.int_] = np.tile(np.arange(1, n_rch + 1), (n_subunit, 1))
-
-        self.dataset["rch_id"].to_numpy()[:, rch_active] = rch_id
+        rch_id: NDArray[np.int_] = np.zeros(rch_active.shape, dtype=np.int64)
+        rch_id[rch_active] = np.arange(1, np.count_nonzero(rch_active) + 1)
+        # recharge does not have a subunit dimension, the ids are the same for
+        # every subunit
+        self.dataset["rch_id"] = expand_subunit(
+            svat.isel(subunit=0, drop=True).copy(data=rch_id), svat
+        )
 
     def _pkgcheck(self) -> None:
         rch_dims = self.dataset["rch_active"].dims
@@ -75,11 +73,13 @@ class RechargeSvatMapping(MetaModMapping):
                 f"{rch_dims} instead"
             )
 
-        # Check if active msw cell inactive in recharge
-        active = self.dataset["svat"] != 0
-        inactive_in_rch = active > self.dataset["rch_active"]
+        # Check if active msw cell inactive in recharge, one subunit at a time
+        svat = self.dataset["svat"]
+        for subunit in range(svat.sizes["subunit"]):
+            active = svat.isel(subunit=subunit) != 0
+            inactive_in_rch = active > self.dataset["rch_active"]
 
-        if inactive_in_rch.any():
-            raise ValueError(
-                "Active MetaSWAP cell detected in inactive cell in Modflow6 recharge"
-            )
+            if inactive_in_rch.any():
+                raise ValueError(
+                    "Active MetaSWAP cell detected in inactive cell in Modflow6 recharge"
+                )
@@ -1,4 +1,4 @@
-from io import TextIOWrapper
+from collections.abc import Iterator
 from typing import Any
 
 import numpy as np
@@ -78,18 +78,16 @@ class WellSvatMapping(MetaModMapping):
 
         return (well_id_1d, well_svat_1d, layer_1d)
 
-    def _render(self, file: TextIOWrapper, *args: Any, **kwargs: Any) -> None:
+    def _get_columns(self, *args: Any, **kwargs: Any) -> dict[str, Any]:
         data_dict: dict[str, Any] = {}
         data_dict["svat"] = self.dataset["svat"].to_numpy()
         data_dict["layer"] = self.dataset["layer"].to_numpy()
         data_dict["wel_id"] = self.dataset["wel_id"].to_numpy()
+        return data_dict
 
-        for var in self._to_fill:
-            data_dict[var] = ""
+    def _n_rows(self, *args: Any) -> int:
+        return int(self.dataset["svat"].size)
 
-        dataframe = pd.DataFrame(
-            data=data_dict, columns=list(self._metadata_dict.keys())
-        )
-
-        self._check_range(dataframe)
-        self.write_dataframe_fixed_width(file, dataframe)
+    def _column_blocks(self, *args: Any) -> Iterator[dict[str, Any]]:
+        # the columns are the wells, not the svat grid
+        yield self._get_columns()
@@ -8,6 +8,7 @@ from imod.msw import MetaSwapModel
 
 from primod.coupled_model import CoupledModel
 from primod.driver_coupling.metamod import MetaModDriverCoupling
+from primod.manifest import WriteManifest
 from primod.model_mixin import MetaModMixin
 
 
@@ -48,6 +49,9 @@ class MetaMod(CoupledModel, MetaModMixin):
         metaswap_dll: str | Path,
         metaswap_dll_dependency: str | Path,
         modflow6_write_kwargs: dict[str, Any] | None = None,
+        binary_exchanges: bool = False,
+        n_workers: int = 1,
+        incremental: bool = False,
     ) -> None:
         """
         Write MetaSWAP and Modflow 6 model with exchange files, as well as a
@@ -75,6 +79,20 @@ class MetaMod(CoupledModel, MetaModMixin):
             Modflow6 models. You can use this for example to turn off the
             validation at writing (``validation=False``) or to write text files
             (``binary=False``)
+        binary_exchanges: bool
+            Write the exchange files as .npy files with int32 columns instead
+            of .dxc and .tsv text files. The coupler reads these memory mapped,
+            which speeds up writing and coupler initialization for large
+            models.
+        n_workers: int
+            Number of threads in which independent exchanges, such as the
+            mappings of separate MODFLOW 6 packages, are derived and written.
+            The default of 1 writes them one by one.
+        incremental: bool
+            Only write what changed since the last write to ``directory``. A
+            manifest with content hashes of the inputs and outputs of every
+            exchange file and model is kept in the directory; exchanges and
+            models whose inputs and files are unchanged are skipped.
         """
 
         if modflow6_write_kwargs is None:
@@ -85,7 +103,13 @@ class MetaMod(CoupledModel, MetaModMixin):
         directory.mkdir(parents=True, exist_ok=True)
 
         # Write exchange files
-        coupling_dict = self.write_exchanges(directory)
+        manifest = WriteManifest(directory) if incremental else None
+        coupling_dict = self.write_exchanges(
+            directory,
+            binary=binary_exchanges,
+            n_workers=n_workers,
+            manifest=manifest,
+        )
         self.write_toml(
             directory,
             modflow6_dll,
@@ -98,20 +122,29 @@ class MetaMod(CoupledModel, MetaModMixin):
         # For some reason the Modflow 6 model has to be written first, before
         # writing the MetaSWAP model. Else we get an Access Violation Error when
         # running the coupler.
-        self.mf6_simulation.write(
+        self._write_model(
+            manifest,
+            "modflow6",
+            (self.mf6_simulation, modflow6_write_kwargs),
             directory / self._modflow6_model_dir,
-            **modflow6_write_kwargs,
+            lambda model_dir: self.mf6_simulation.write(
+                model_dir, **modflow6_write_kwargs
+            ),
         )
 
         mf6_dis_pkg, mf6_wel_pkg = self.get_mf6_pkgs_for_metaswap(
             coupling_dict, self.mf6_simulation
         )
 
-        self.msw_model.write(
+        self._write_model(
+            manifest,
+            "metaswap",
+            (self.msw_model, mf6_dis_pkg, mf6_wel_pkg),
             directory / self._metaswap_model_dir,
-            mf6_dis_pkg,
-            mf6_wel_pkg,
+            lambda model_dir: self.msw_model.write(model_dir, mf6_dis_pkg, mf6_wel_pkg),
         )
+        if manifest is not None:
+            manifest.save()
 
     def write_toml(
         self,
@@ -9,6 +9,7 @@ from imod.msw import MetaSwapModel
 
 from primod.coupled_model import CoupledModel
 from primod.driver_coupling.driver_coupling_base import DriverCoupling
+from primod.manifest import WriteManifest
 from primod.model_mixin import MetaModMixin
 
 
@@ -53,6 +54,9 @@ class RibaMetaMod(CoupledModel, MetaModMixin):
         metaswap_dll_dependency: str | Path,
         modflow6_write_kwargs: dict[str, Any] | None = None,
         output_config_file: str | Path | None = None,
+        binary_exchanges: bool = False,
+        n_workers: int = 1,
+        incremental: bool = False,
     ) -> None:
         """
         Write Ribasim, MetaSWAP and Modflow 6 model with exchange files, as well as a
@@ -86,6 +90,20 @@ class RibaMetaMod(CoupledModel, MetaModMixin):
             (``binary=False``)
         output_config_file: str or Path
             Optional file for logging exchange fluxes to nc-file for dubugging purposes
+        binary_exchanges: bool
+            Write the exchange files as .npy files with int32 columns instead
+            of .dxc and .tsv text files. The coupler reads these memory mapped,
+            which speeds up writing and coupler initialization for large
+            models.
+        n_workers: int
+            Number of threads in which independent exchanges, such as the
+            mappings of separate MODFLOW 6 packages, are derived and written.
+            The default of 1 writes them one by one.
+        incremental: bool
+            Only write what changed since the last write to ``directory``. A
+            manifest with content hashes of the inputs and outputs of every
+            exchange file and model is kept in the directory; exchanges and
+            models whose inputs and files are unchanged are skipped.
         """
 
         if modflow6_write_kwargs is None:
@@ -96,7 +114,13 @@ class RibaMetaMod(CoupledModel, MetaModMixin):
         directory.mkdir(parents=True, exist_ok=True)
 
         # Write exchange files
-        coupling_dict = self.write_exchanges(directory)
+        manifest = WriteManifest(directory) if incremental else None
+        coupling_dict = self.write_exchanges(
+            directory,
+            binary=binary_exchanges,
+            n_workers=n_workers,
+            manifest=manifest,
+        )
         self.write_toml(
             directory,
             coupling_dict,
@@ -109,17 +133,34 @@ class RibaMetaMod(CoupledModel, MetaModMixin):
         )
 
         # Write models
-        self.mf6_simulation.write(
+        self._write_model(
+            manifest,
+            "modflow6",
+            (self.mf6_simulation, modflow6_write_kwargs),
             directory / self._modflow6_model_dir,
-            **modflow6_write_kwargs,
+            lambda model_dir: self.mf6_simulation.write(
+                model_dir, **modflow6_write_kwargs
+            ),
         )
         mf6_dis_pkg, mf6_wel_pkg = self.get_mf6_pkgs_for_metaswap(
             coupling_dict, self.mf6_simulation
         )
-        self.msw_model.write(
-            directory / self._metaswap_model_dir, mf6_dis_pkg, mf6_wel_pkg
+        self._write_model(
+            manifest,
+            "metaswap",
+            (self.msw_model, mf6_dis_pkg, mf6_wel_pkg),
+            directory / self._metaswap_model_dir,
+            lambda model_dir: self.msw_model.write(model_dir, mf6_dis_pkg, mf6_wel_pkg),
+        )
+        self._write_model(
+            manifest,
+            "ribasim",
+            (self.ribasim_model,),
+            directory / self._ribasim_model_dir,
+            lambda model_dir: self.ribasim_model.write(model_dir / "ribasim.toml"),
         )
-        self.ribasim_model.write(directory / self._ribasim_model_dir / "ribasim.toml")
+        if manifest is not None:
+            manifest.save()
 
     def write_toml(
         self,
@@ -11,6 +11,7 @@ from primod.driver_coupling.ribamod import RibaModDriverCoupling
 from primod.driver_coupling.util import (
     _validate_time_window,
 )
+from primod.manifest import WriteManifest
 
 
 class RibaMod(CoupledModel):
@@ -51,6 +52,9 @@ class RibaMod(CoupledModel):
         ribasim_dll: str | Path,
         ribasim_dll_dependency: str | Path,
         modflow6_write_kwargs: dict[str, Any] | None = None,
+        binary_exchanges: bool = False,
+        n_workers: int = 1,
+        incremental: bool = False,
     ) -> None:
         """
         Write Ribasim and Modflow 6 model with exchange files, as well as a
@@ -73,6 +77,20 @@ class RibaMod(CoupledModel):
             Modflow6 models. You can use this for example to turn off the
             validation at writing (``validation=False``) or to write text files
             (``binary=False``)
+        binary_exchanges: bool
+            Write the exchange files as .npy files with int32 columns instead
+            of .dxc and .tsv text files. The coupler reads these memory mapped,
+            which speeds up writing and coupler initialization for large
+            models.
+        n_workers: int
+            Number of threads in which independent exchanges, such as the
+            mappings of separate MODFLOW 6 packages, are derived and written.
+            The default of 1 writes them one by one.
+        incremental: bool
+            Only write what changed since the last write to ``directory``. A
+            manifest with content hashes of the inputs and outputs of every
+            exchange file and model is kept in the directory; exchanges and
+            models whose inputs and files are unchanged are skipped.
         """
 
         if modflow6_write_kwargs is None:
@@ -83,7 +101,13 @@ class RibaMod(CoupledModel):
         directory.mkdir(parents=True, exist_ok=True)
 
         # Write exchanges
-        coupling_dict = self.write_exchanges(directory)
+        manifest = WriteManifest(directory) if incremental else None
+        coupling_dict = self.write_exchanges(
+            directory,
+            binary=binary_exchanges,
+            n_workers=n_workers,
+            manifest=manifest,
+        )
         self.write_toml(
             directory,
             coupling_dict,
@@ -93,11 +117,24 @@ class RibaMod(CoupledModel):
         )
 
         # Write models
-        self.mf6_simulation.write(
+        self._write_model(
+            manifest,
+            "modflow6",
+            (self.mf6_simulation, modflow6_write_kwargs),
             directory / self._modflow6_model_dir,
-            **modflow6_write_kwargs,
+            lambda model_dir: self.mf6_simulation.write(
+                model_dir, **modflow6_write_kwargs
+            ),
+        )
+        self._write_model(
+            manifest,
+            "ribasim",
+            (self.ribasim_model,),
+            directory / self._ribasim_model_dir,
+            lambda model_dir: self.ribasim_model.write(model_dir / "ribasim.toml"),
         )
-        self.ribasim_model.write(directory / self._ribasim_model_dir / "ribasim.toml")
+        if manifest is not None:
+            manifest.save()
 
     def write_toml(
         self,
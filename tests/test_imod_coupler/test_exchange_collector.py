@@ -1,4 +1,6 @@
+import threading
 from pathlib import Path
+from typing import Any
 
 import netCDF4 as nc
 import numpy as np
@@ -7,7 +9,11 @@ import tomli
 from numpy.testing import assert_equal
 from numpy.typing import NDArray
 
-from imod_coupler.logging.exchange_collector import ExchangeCollector
+from imod_coupler.logging.exchange_collector import (
+    AbstractExchange,
+    ExchangeCollector,
+    open_binary_exchange,
+)
 
 
 def test_exchange_collector_read(tmp_path_dev: Path, output_config_toml: str) -> None:
@@ -120,3 +126,372 @@ def test_exchange_collector_can_initialized_without_input():
 
     exchange_collector.log_exchange("example_stage_output", some_array, 8.0)
     exchange_collector.finalize()
+
+
+class WriteOnlyVariable:
+    """A NetCDF variable that fails when it is read"""
+
+    def __init__(self, variable: nc.Variable) -> None:
+        self.variable = variable
+
+    def __setitem__(self, key: object, value: object) -> None:
+        self.variable[key] = value
+
+    def __getitem__(self, key: object) -> None:
+        raise AssertionError("the logger should not read the file back")
+
+
+def test_exchange_collector_overwrites_without_reading_the_file(
+    tmp_path_dev: Path, output_config_toml: str
+) -> None:
+    """
+    Repeated times are found in memory, so writing a time step does not read
+    the time variable back from the file.
+    """
+    config_dict = tomli.loads(output_config_toml)
+    config_dict["general"]["output_dir"] = tmp_path_dev
+    exchange_collector = ExchangeCollector.from_config(config_dict)
+    netcdf_logger = exchange_collector.exchanges["example_stage_output"]
+
+    exchange_collector.log_exchange("example_stage_output", np.zeros(3), 0.0)
+    netcdf_logger.timevar = WriteOnlyVariable(netcdf_logger.timevar)
+    for time in range(1, 10):
+        exchange_collector.log_exchange(
+            "example_stage_output", np.full(3, float(time)), float(time)
+        )
+    exchange_collector.log_exchange("example_stage_output", np.full(3, -1.0), 0.0)
+    exchange_collector.log_exchange("example_stage_output", np.full(3, -5.0), 5.0)
+    exchange_collector.finalize()
+
+    ds = nc.Dataset(tmp_path_dev / "example_stage_output.nc", "r")
+    dat = ds.variables["xchg"][:]
+    tim = ds.variables["time"][:]
+    assert_equal(tim[:], np.arange(10.0))
+    assert_equal(dat[:, 0], [-1.0, 1.0, 2.0, 3.0, 4.0, -5.0, 6.0, 7.0, 8.0, 9.0])
+
+
+def test_exchange_collector_buffered(tmp_path_dev: Path) -> None:
+    """
+    Buffered time steps are written in blocks, with the chunking and
+    compression of the configuration. A repeated time overwrites the record in
+    the buffer, or in the file when its block was already written.
+    """
+    config_dict = {
+        "general": {"output_dir": tmp_path_dev},
+        "exchanges": {
+            "example_stage_output": {
+                "type": "netcdf",
+                "buffer_steps": 4,
+                "chunk_time": 8,
+                "zlib": True,
+                "complevel": 6,
+                "sync_every": 8,
+            }
+        },
+    }
+    exchange_collector = ExchangeCollector.from_config(config_dict)
+    netcdf_logger = exchange_collector.exchanges["example_stage_output"]
+
+    for time in range(10):
+        exchange_collector.log_exchange(
+            "example_stage_output", np.full(3, float(time)), float(time)
+        )
+        if time == 5:
+            # the first block is in the file, the second in the buffer
+            assert netcdf_logger.flushed == 4
+            assert netcdf_logger.ds.dimensions["time"].size == 4
+    assert netcdf_logger.synced == 8
+    exchange_collector.log_exchange("example_stage_output", np.full(3, -1.0), 1.0)
+    exchange_collector.log_exchange("example_stage_output", np.full(3, -9.0), 9.0)
+    exchange_collector.finalize()
+    # finalizing again, as MemoryExchange.finalize_log does, is harmless
+    netcdf_logger.finalize()
+
+    ds = nc.Dataset(tmp_path_dev / "example_stage_output.nc", "r")
+    xchg = ds.variables["xchg"]
+    assert xchg.chunking() == [8, 3]
+    assert xchg.filters()["zlib"]
+    assert xchg.filters()["complevel"] == 6
+    assert_equal(ds.variables["time"][:], np.arange(10.0))
+    assert_equal(xchg[:, 0], [0.0, -1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, -9.0])
+
+
+def test_exchange_collector_rejects_invalid_settings(tmp_path_dev: Path) -> None:
+    config_dict = {
+        "general": {"output_dir": tmp_path_dev},
+        "exchanges": {
+            "example_stage_output": {"type": "netcdf", "buffer_steps": 0},
+        },
+    }
+    with pytest.raises(ValueError, match="buffer_steps"):
+        ExchangeCollector.from_config(config_dict)
+
+
+class GatedExchange(AbstractExchange):
+    """Exchange logger that writes to a list once the gate is opened"""
+
+    def __init__(self) -> None:
+        self.gate = threading.Event()
+        self.written: list[tuple[float, NDArray[np.float64]]] = []
+
+    def write_exchange(self, exchange: NDArray[Any], time: float) -> None:
+        self.gate.wait()
+        if time < 0.0:
+            raise ValueError("negative time")
+        self.written.append((time, exchange.copy()))
+
+    def finalize(self) -> None:
+        pass
+
+
+def test_exchange_collector_asynchronous(
+    tmp_path_dev: Path, output_config_toml: str
+) -> None:
+    """
+    The asynchronous collector writes copies of the logged exchanges on a
+    background thread, which are all in the file after finalize.
+    """
+    config_dict = tomli.loads(output_config_toml)
+    config_dict["general"]["output_dir"] = tmp_path_dev
+    config_dict["general"]["asynchronous"] = True
+    exchange_collector = ExchangeCollector.from_config(config_dict)
+
+    exchange = np.zeros(5)
+    for time in range(20):
+        exchange[:] = time
+        exchange_collector.log_exchange("example_flux_output", exchange, float(time))
+    exchange_collector.log_exchange("example_flux_output", np.full(5, -1.0), 3.0)
+    exchange_collector.finalize()
+
+    ds = nc.Dataset(tmp_path_dev / "example_flux_output.nc", "r")
+    expected = np.arange(20.0)
+    expected[3] = -1.0
+    assert_equal(ds.variables["time"][:], np.arange(20.0))
+    assert_equal(ds.variables["xchg"][:, 4], expected)
+
+
+def test_exchange_collector_asynchronous_backpressure(tmp_path_dev: Path) -> None:
+    """
+    When all buffers of an exchange wait to be written, logging it waits for
+    the writer thread.
+    """
+    config_dict = {"general": {"output_dir": tmp_path_dev}, "exchanges": {}}
+    config_dict["general"]["asynchronous"] = True
+    config_dict["general"]["queue_size"] = 2
+    exchange_collector = ExchangeCollector.from_config(config_dict)
+    gated = GatedExchange()
+    exchange_collector.exchanges["gated"] = gated
+
+    exchange_collector.log_exchange("gated", np.zeros(3), 0.0)
+    exchange_collector.log_exchange("gated", np.ones(3), 1.0)
+    third = threading.Thread(
+        target=exchange_collector.log_exchange, args=("gated", np.full(3, 2.0), 2.0)
+    )
+    third.start()
+    third.join(timeout=0.2)
+    assert third.is_alive()
+
+    gated.gate.set()
+    third.join()
+    exchange_collector.finalize()
+    assert [time for time, _ in gated.written] == [0.0, 1.0, 2.0]
+    assert_equal(gated.written[2][1], np.full(3, 2.0))
+
+
+def test_exchange_collector_asynchronous_raises_write_errors(
+    tmp_path_dev: Path,
+) -> None:
+    config_dict = {"general": {"output_dir": tmp_path_dev}, "exchanges": {}}
+    config_dict["general"]["asynchronous"] = True
+    exchange_collector = ExchangeCollector.from_config(config_dict)
+    gated = GatedExchange()
+    gated.gate.set()
+    exchange_collector.exchanges["gated"] = gated
+
+    exchange_collector.log_exchange("gated", np.zeros(3), -1.0)
+    with pytest.raises(ValueError, match="negative time"):
+        exchange_collector.finalize()
+
+
+def test_exchange_collector_asynchronous_keeps_write_errors(
+    tmp_path_dev: Path,
+) -> None:
+    """
+    After a failed write nothing more is written, and every later call raises
+    the error, so that a gap in the output cannot go unnoticed.
+    """
+    config_dict = {"general": {"output_dir": tmp_path_dev}, "exchanges": {}}
+    config_dict["general"]["asynchronous"] = True
+    exchange_collector = ExchangeCollector.from_config(config_dict)
+    gated = GatedExchange()
+    exchange_collector.exchanges["gated"] = gated
+
+    # the time steps after the failing one are queued before it is written
+    for time in (-1.0, 1.0, 2.0):
+        exchange_collector.log_exchange("gated", np.zeros(3), time)
+    gated.gate.set()
+    writer = exchange_collector.writer
+    assert writer is not None
+    with pytest.raises(ValueError, match="negative time"):
+        writer.drain()
+    with pytest.raises(ValueError, match="negative time"):
+        exchange_collector.log_exchange("gated", np.zeros(3), 3.0)
+    with pytest.raises(ValueError, match="negative time"):
+        writer.close()
+    with pytest.raises(ValueError, match="negative time"):
+        exchange_collector.finalize()
+    assert gated.written == []
+
+
+@pytest.mark.parametrize("dtype", ["float64", "float32"])
+def test_exchange_collector_binary(tmp_path_dev: Path, dtype: str) -> None:
+    """
+    The binary logger grows its file as time steps are logged, overwrites
+    repeated times and can be opened as an xarray Dataset.
+    """
+    config_dict = {
+        "general": {"output_dir": tmp_path_dev},
+        "exchanges": {
+            "example_flux_output": {
+                "type": "binary",
+                "dtype": dtype,
+                "initial_steps": 2,
+            }
+        },
+    }
+    exchange_collector = ExchangeCollector.from_config(config_dict)
+    for time in range(7):
+        exchange_collector.log_exchange(
+            "example_flux_output", np.arange(4.0) + time, float(time)
+        )
+    exchange_collector.log_exchange("example_flux_output", np.full(4, -1.0), 2.0)
+    exchange_collector.finalize()
+
+    expected = np.arange(4.0) + np.arange(7.0)[:, np.newaxis]
+    expected[2] = -1.0
+    output_file = tmp_path_dev / "example_flux_output.bin"
+    assert output_file.stat().st_size == expected.size * np.dtype(dtype).itemsize
+    ds = open_binary_exchange(output_file)
+    assert ds["xchg"].dims == ("time", "id")
+    assert ds["xchg"].dtype == dtype
+    assert_equal(ds["time"].to_numpy(), np.arange(7.0))
+    assert_equal(ds["xchg"].to_numpy(), expected)
+
+
+def test_exchange_collector_binary_empty(tmp_path_dev: Path) -> None:
+    config_dict = {
+        "general": {"output_dir": tmp_path_dev},
+        "exchanges": {"example_flux_output": {"type": "binary"}},
+    }
+    exchange_collector = ExchangeCollector.from_config(config_dict)
+    exchange_collector.finalize()
+
+    ds = open_binary_exchange(tmp_path_dev / "example_flux_output.json")
+    assert ds["xchg"].shape == (0, 0)
+
+
+def test_exchange_collector_selection(tmp_path_dev: Path) -> None:
+    """
+    Only the selected positions, time steps and sides of an exchange are
+    logged; the positions are stored as the id coordinate.
+    """
+    config_dict = {
+        "general": {"output_dir": tmp_path_dev},
+        "exchanges": {
+            "storage": {"type": "netcdf", "index": [4, 0, 2], "side": "both"},
+            "recharge": {
+                "type": "binary",
+                "id_range": [1, 3],
+                "time_stride": 3,
+                "side": "b",
+            },
+        },
+    }
+    exchange_collector = ExchangeCollector.from_config(config_dict)
+    assert set(exchange_collector.exchanges) == {"storage_a", "storage_b", "recharge_b"}
+
+    exchange = np.arange(5.0)
+    for time in range(7):
+        for label in ("storage", "recharge"):
+            exchange_collector.log_exchange(label + "_a", exchange + time, float(time))
+            exchange_collector.log_exchange(label + "_b", -exchange - time, float(time))
+    # a repeated time is the same time step
+    exchange_collector.log_exchange("recharge_b", np.full(5, 9.0), 6.0)
+    exchange_collector.finalize()
+
+    ds = nc.Dataset(tmp_path_dev / "storage_a.nc", "r")
+    assert_equal(ds.variables["id"][:], [4, 0, 2])
+    assert_equal(
+        ds.variables["xchg"][:],
+        np.array([4.0, 0.0, 2.0]) + np.arange(7.0)[:, np.newaxis],
+    )
+    assert (tmp_path_dev / "storage_b.nc").exists()
+    assert not (tmp_path_dev / "recharge_a.bin").exists()
+    recharge = open_binary_exchange(tmp_path_dev / "recharge_b.bin")
+    assert_equal(recharge["id"].to_numpy(), [1, 2])
+    assert_equal(recharge["time"].to_numpy(), [0.0, 3.0, 6.0])
+    assert_equal(recharge["xchg"].to_numpy(), [[-1.0, -2.0], [-4.0, -5.0], [9.0, 9.0]])
+
+
+@pytest.mark.parametrize(
+    "selection, message",
+    [
+        ({"index": [1], "id_range": [0, 2]}, "either index or id_range"),
+        ({"index": []}, "at least one position"),
+        ({"id_range": [3, 2]}, "id_range should be increasing"),
+        ({"time_stride": 0}, "time_stride"),
+        ({"side": "c"}, "side"),
+    ],
+)
+def test_exchange_collector_rejects_invalid_selection(
+    tmp_path_dev: Path, selection: dict[str, Any], message: str
+) -> None:
+    config_dict = {
+        "general": {"output_dir": tmp_path_dev},
+        "exchanges": {"storage": {"type": "netcdf", **selection}},
+    }
+    with pytest.raises(ValueError, match=message):
+        ExchangeCollector.from_config(config_dict)
+
+
+def test_exchange_collector_selection_out_of_bounds(tmp_path_dev: Path) -> None:
+    config_dict = {
+        "general": {"output_dir": tmp_path_dev},
+        "exchanges": {"storage": {"type": "netcdf", "id_range": [2, 6]}},
+    }
+    exchange_collector = ExchangeCollector.from_config(config_dict)
+    with pytest.raises(ValueError, match="position 5 is out of bounds"):
+        exchange_collector.log_exchange("storage", np.zeros(5), 0.0)
+    exchange_collector.finalize()
+
+
+def test_exchange_collector_asynchronous_changed_working_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    A relative output directory is resolved when the configuration is read,
+    so the writer thread finds its files while the kernels change the working
+    directory.
+    """
+    monkeypatch.chdir(tmp_path)
+    config_dict = {
+        "general": {"output_dir": "out", "asynchronous": True},
+        "exchanges": {
+            "flux": {"type": "binary", "initial_steps": 1},
+            "stage": {"type": "netcdf", "buffer_steps": 2},
+        },
+    }
+    exchange_collector = ExchangeCollector.from_config(config_dict)
+    kernel_dir = tmp_path / "kernel"
+    kernel_dir.mkdir()
+    monkeypatch.chdir(kernel_dir)
+    for time in range(5):
+        exchange_collector.log_exchange("flux", np.full(3, float(time)), float(time))
+        exchange_collector.log_exchange("stage", np.full(3, float(time)), float(time))
+    exchange_collector.finalize()
+
+    assert not (kernel_dir / "out").exists()
+    flux = open_binary_exchange(tmp_path / "out" / "flux.bin")
+    assert_equal(flux["xchg"].to_numpy()[:, 0], np.arange(5.0))
+    ds = nc.Dataset(tmp_path / "out" / "stage.nc", "r")
+    assert_equal(ds.variables["xchg"][:, 0], np.arange(5.0))
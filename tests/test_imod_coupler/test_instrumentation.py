@@ -0,0 +1,89 @@
+import numpy as np
+
+from imod_coupler.instrumentation import Instrumentation, instrumentation
+from imod_coupler.logging.exchange_collector import ExchangeCollector
+from imod_coupler.utils import ExchangePlan, MemoryExchange
+
+
+def test_disabled_instrumentation_records_nothing():
+    counters = Instrumentation()
+    with counters.measure("exchange", 10):
+        pass
+    assert counters.counters == {}
+    assert counters.total_seconds == 0.0
+
+
+def test_nested_measurements_count_once_in_total():
+    counters = Instrumentation()
+    counters.enabled = True
+
+    @counters.timed("outer")
+    def outer() -> None:
+        with counters.measure("inner", 5):
+            pass
+
+    outer()
+    outer()
+    assert counters.counters["outer"].calls == 2
+    assert counters.counters["inner"].calls == 2
+    assert counters.counters["inner"].elements == 10
+    assert counters.total_seconds == counters.counters["outer"].seconds
+    assert counters.report() == counters.total_seconds
+
+
+def test_memory_exchange_is_instrumented():
+    exchange = MemoryExchange(
+        np.array([1.0, 2.0, 3.0]),
+        np.array([0.0, 0.0, 0.0, 0.0]),
+        np.array([0, 1, 2], dtype=np.int32),
+        np.array([0, 1, 1], dtype=np.int32),
+        ExchangeCollector(),
+        "recharge",
+        exchange_operator="sum",
+    )
+    instrumentation.enabled = True
+    try:
+        exchange.exchange()
+        exchange.add()
+        counter = instrumentation.counters["exchange recharge"]
+        assert counter.calls == 1
+        assert counter.elements == 2
+        assert instrumentation.counters["add recharge"].calls == 1
+    finally:
+        instrumentation.enabled = False
+        instrumentation.reset()
+
+
+def test_exchange_plan_instruments_every_member():
+    source = np.array([1.0, 2.0, 3.0])
+    plan = ExchangePlan()
+    for label in ("recharge", "sprinkling"):
+        plan.add(
+            MemoryExchange(
+                source,
+                np.zeros(4),
+                np.array([0, 1, 2], dtype=np.int32),
+                np.array([0, 1, 1], dtype=np.int32),
+                ExchangeCollector(),
+                label,
+                exchange_operator="sum",
+            ),
+            divide_by_delt=True,
+        )
+    assert len(plan.groups) == 1
+    instrumentation.enabled = True
+    try:
+        plan.exchange(0.5)
+        plan_counter = instrumentation.counters["exchange plan"]
+        members = [
+            instrumentation.counters["exchange " + label]
+            for label in ("recharge", "sprinkling")
+        ]
+        for counter in members:
+            assert counter.calls == 1
+            assert counter.elements == 2
+        assert sum(counter.seconds for counter in members) <= plan_counter.seconds
+        assert instrumentation.total_seconds == plan_counter.seconds
+    finally:
+        instrumentation.enabled = False
+        instrumentation.reset()
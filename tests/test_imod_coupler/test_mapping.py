@@ -5,7 +5,7 @@ from numpy.testing import assert_almost_equal, assert_array_equal
 from primod.mapping.rch_svat_mapping import RechargeSvatMapping
 from pytest_cases import parametrize_with_cases
 
-from imod_coupler.utils import create_mapping
+from imod_coupler.utils import SvatLookup, create_mapping
 
 
 @parametrize_with_cases(
@@ -58,3 +58,45 @@ def test_recharge_mapping_fail(
 
     with pytest.raises(ValueError):
         RechargeSvatMapping(svat, recharge, index=index)
+
+
+def test_create_mapping_avg_large_n_1():
+    """
+    The averaging weights of all sources coupled to a single target should sum
+    to one, also when the coupling table is large and unordered.
+    """
+    rng = np.random.default_rng(0)
+    nsrc = 10_000
+    ntgt = 2_500
+    src_idx = np.arange(nsrc)
+    # leave the last targets uncoupled
+    tgt_idx = rng.integers(0, ntgt - 10, size=nsrc)
+
+    map_out, mask = create_mapping(src_idx, tgt_idx, nsrc, ntgt, "avg")
+
+    row_sum = np.asarray(map_out.sum(axis=1)).ravel()
+    coupled = np.unique(tgt_idx)
+    assert_almost_equal(row_sum[coupled], 1.0)
+    expected_mask = np.ones(ntgt, dtype=int)
+    expected_mask[coupled] = 0
+    assert_array_equal(mask, expected_mask)
+
+
+def test_svat_lookup():
+    svat_id = np.array([3, 1, 1, 2, 3], dtype=np.int32)
+    svat_lay = np.array([1, 1, 2, 1, 2], dtype=np.int32)
+    lookup = SvatLookup(svat_id, svat_lay)
+    index = lookup.index(
+        np.array([1, 3, 3, 2, 1], dtype=np.int32),
+        np.array([2, 1, 2, 1, 1], dtype=np.int32),
+    )
+    assert_array_equal(index, [2, 0, 4, 3, 1])
+    assert index.dtype == np.int32
+
+
+def test_svat_lookup_missing_pairs():
+    lookup = SvatLookup(np.array([1, 2], dtype=np.int32), np.array([1, 1]))
+    with pytest.raises(
+        ValueError, match=r"2 \(svat, layer\) pairs.*\(2, 2\), \(0, 1\)"
+    ):
+        lookup.index(np.array([1, 2, 0], dtype=np.int32), np.array([1, 2, 1]))
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from imod_coupler.mapping_cache import MappingCache
+
+
+def test_hash_key_depends_on_content(tmp_path: Path):
+    table = tmp_path / "table.dxc"
+    table.write_text("1 1 1\n")
+    key = MappingCache.hash_key(table, np.arange(3), 3)
+    assert key == MappingCache.hash_key(table, np.arange(3), 3)
+    assert key != MappingCache.hash_key(table, np.arange(3), 4)
+    assert key != MappingCache.hash_key(table, np.arange(3, dtype=np.int32), 3)
+    table.write_text("1 1 2\n")
+    assert key != MappingCache.hash_key(table, np.arange(3), 3)
+
+
+def test_save_and_load(tmp_path: Path):
+    cache = MappingCache(tmp_path / "cache")
+    assert cache.load("key") is None
+    cache.save("key", {"a": np.arange(3), "b": np.zeros(0)})
+    arrays = cache.load("key")
+    assert arrays is not None
+    assert_array_equal(arrays["a"], np.arange(3))
+    assert isinstance(arrays["a"], np.memmap)
+    assert arrays["b"].size == 0
+    # no temporary directories are left behind
+    assert [path.name for path in cache.directory.iterdir()] == ["key"]
@@ -0,0 +1,309 @@
+import tracemalloc
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from imod_coupler import utils
+from imod_coupler.logging.exchange_collector import ExchangeCollector
+from imod_coupler.utils import ExchangePlan, ExchangeStrategy, MemoryExchange
+
+
+def legacy_exchange(exchange: MemoryExchange, delt: float) -> np.ndarray:
+    return (
+        exchange.mask[:] * exchange.ptr_b[:]
+        + exchange.mapping.dot(exchange.ptr_a)[:] / delt
+    )
+
+
+def n_1_exchange(ntgt: int = 100, operator: str = "avg") -> MemoryExchange:
+    rng = np.random.default_rng(0)
+    nsrc = 4 * ntgt
+    ptr_a = rng.random(nsrc)
+    ptr_b = rng.random(ntgt)
+    # leave the first targets uncoupled
+    ptr_b_index = rng.integers(10, ntgt, size=nsrc).astype(np.int32)
+    ptr_a_index = np.arange(nsrc, dtype=np.int32)
+    return MemoryExchange(
+        ptr_a,
+        ptr_b,
+        ptr_a_index,
+        ptr_b_index,
+        ExchangeCollector(),
+        "test",
+        exchange_operator=operator,
+    )
+
+
+def one_to_one_exchange(nsrc: int = 100) -> MemoryExchange:
+    rng = np.random.default_rng(0)
+    ntgt = 2 * nsrc
+    ptr_a = rng.random(nsrc)
+    ptr_b = rng.random(ntgt)
+    ptr_a_index = np.arange(nsrc, dtype=np.int32)
+    ptr_b_index = rng.permutation(ntgt)[:nsrc].astype(np.int32)
+    return MemoryExchange(
+        ptr_a,
+        ptr_b,
+        ptr_a_index,
+        ptr_b_index,
+        ExchangeCollector(),
+        "test",
+        ptr_b_conversion=rng.random(ntgt),
+    )
+
+
+def test_exchange_matches_sparse_expression():
+    exchange = n_1_exchange()
+    assert exchange.strategy == ExchangeStrategy.SPARSE
+    expected = legacy_exchange(exchange, 0.5)
+    exchange.exchange(0.5)
+    assert_array_equal(exchange.ptr_b, expected)
+
+
+def test_add_matches_sparse_expression():
+    exchange = n_1_exchange(operator="sum")
+    expected = exchange.ptr_b + exchange.mapping.dot(exchange.ptr_a) / 2.0
+    exchange.add(2.0)
+    assert_array_equal(exchange.ptr_b, expected)
+
+
+def test_exchange_writes_into_kernel_array():
+    exchange = n_1_exchange()
+    ptr_b = exchange.ptr_b
+    exchange.exchange()
+    assert exchange.ptr_b is ptr_b
+
+
+def test_exchange_does_not_allocate_arrays():
+    exchange = n_1_exchange(ntgt=100_000)
+    exchange.exchange(2.0)  # warm up
+    tracemalloc.start()
+    for _ in range(10):
+        exchange.exchange(2.0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # a single temporary of the target array would already be 800 kB
+    assert peak < exchange.ptr_b.nbytes // 10
+
+
+def test_exchange_only_touches_coupled_rows():
+    exchange = n_1_exchange()
+    uncoupled = exchange.mask == 1
+    before = exchange.ptr_b[uncoupled].copy()
+    exchange.exchange()
+    assert_array_equal(exchange.ptr_b[uncoupled], before)
+    assert_array_equal(exchange.coupled_rows, np.flatnonzero(~uncoupled))
+    assert exchange.coupled_mapping.shape == (
+        exchange.coupled_rows.size,
+        exchange.ptr_a.size,
+    )
+
+
+def test_one_to_one_exchange_uses_gather():
+    exchange = one_to_one_exchange()
+    assert exchange.strategy == ExchangeStrategy.GATHER
+    expected = legacy_exchange(exchange, 0.5)
+    exchange.exchange(0.5)
+    assert_array_equal(exchange.ptr_b, expected)
+
+
+def test_exchange_to_contiguous_block():
+    ptr_a = np.array([1.0, 2.0, 3.0, 4.0])
+    ptr_b = np.array([-1.0, -1.0, -1.0, -1.0, -1.0, -1.0])
+    exchange = MemoryExchange(
+        ptr_a,
+        ptr_b,
+        np.array([0, 1, 2, 3], dtype=np.int32),
+        np.array([1, 1, 2, 3], dtype=np.int32),
+        ExchangeCollector(),
+        "test",
+        exchange_operator="sum",
+    )
+    exchange.exchange(2.0)
+    assert_array_equal(ptr_b, [-1.0, 1.5, 1.5, 2.0, -1.0, -1.0])
+
+
+def test_exchange_plan_matches_sequential_exchanges():
+    rng = np.random.default_rng(1)
+    source = rng.random(50)
+    targets = [rng.random(20), rng.random(30), rng.random(20)]
+    sequential = [target.copy() for target in targets]
+
+    def exchanges(ptr_bs: list[np.ndarray]) -> list[MemoryExchange]:
+        # the first two exchanges read the same memory through distinct views
+        ptr_as = [source[:], source.view(), rng.random(50)]
+        return [
+            MemoryExchange(
+                ptr_a,
+                ptr_b,
+                np.arange(50, dtype=np.int32),
+                np.arange(50, dtype=np.int32) % (ptr_b.size - 5),
+                ExchangeCollector(),
+                f"test_{iexchange}",
+                exchange_operator="sum",
+            )
+            for iexchange, (ptr_a, ptr_b) in enumerate(zip(ptr_as, ptr_bs))
+        ]
+
+    rng = np.random.default_rng(2)
+    for exchange, divide_by_delt in zip(exchanges(sequential), (False, True, True)):
+        exchange.exchange(0.25 if divide_by_delt else 1.0)
+
+    rng = np.random.default_rng(2)
+    plan = ExchangePlan()
+    for exchange, divide_by_delt in zip(exchanges(targets), (False, True, True)):
+        plan.add(exchange, divide_by_delt)
+    assert len(plan.groups) == 2
+    plan.exchange(0.25)
+
+    for target, expected in zip(targets, sequential):
+        assert_array_equal(target, expected)
+
+
+def test_threaded_exchange_matches_single_thread(monkeypatch):
+    monkeypatch.setattr(utils, "MIN_ROWS_PER_THREAD", 10)
+    single = n_1_exchange(ntgt=1000)
+    threaded = n_1_exchange(ntgt=1000)
+    threaded._set_row_blocks(4)
+    assert len(threaded.row_blocks) == 4
+    assert threaded.row_blocks[-1][0].stop == threaded.coupled_rows.size
+    single.exchange(0.5)
+    threaded.exchange(0.5)
+    assert_array_equal(threaded.ptr_b, single.ptr_b)
+
+
+def test_threaded_gather_exchange_matches_single_thread(monkeypatch):
+    monkeypatch.setattr(utils, "MIN_ROWS_PER_THREAD", 10)
+    single = one_to_one_exchange()
+    # restored by monkeypatch after the test
+    monkeypatch.setattr(utils, "_exchange_threads", 1)
+    utils.set_exchange_threads(3)
+    threaded = one_to_one_exchange()
+    assert threaded.strategy == ExchangeStrategy.GATHER
+    assert len(threaded.row_blocks) == 3
+    single.exchange(2.0)
+    threaded.exchange(2.0)
+    assert_array_equal(threaded.ptr_b, single.ptr_b)
+
+
+def test_threaded_exchange_plan_uses_pool(monkeypatch):
+    """
+    The stacked mat-vec of exchanges that read the same source is split over
+    the threads of its members.
+    """
+    monkeypatch.setattr(utils, "MIN_ROWS_PER_THREAD", 10)
+    source = np.random.default_rng(3).random(100)
+
+    def exchanges(n_threads: int) -> list[MemoryExchange]:
+        return [
+            MemoryExchange(
+                source,
+                np.zeros(ntgt),
+                np.arange(100, dtype=np.int32),
+                np.arange(100, dtype=np.int32) % ntgt,
+                ExchangeCollector(),
+                f"test_{ntgt}",
+                exchange_operator="avg",
+                n_threads=n_threads,
+            )
+            for ntgt in (40, 60)
+        ]
+
+    sequential = exchanges(1)
+    for exchange in sequential:
+        exchange.exchange(0.5)
+
+    plan = ExchangePlan()
+    for exchange in exchanges(3):
+        plan.add(exchange, divide_by_delt=True)
+    (group,) = plan.groups.values()
+    assert group._pool is not None
+    assert len(group.row_blocks) == 3
+    submitted = []
+    submit = group._pool.submit
+
+    def count_submit(*args, **kwargs):
+        submitted.append(args[0])
+        return submit(*args, **kwargs)
+
+    monkeypatch.setattr(group._pool, "submit", count_submit)
+    plan.exchange(0.5)
+    assert len(submitted) == 3
+    for (exchange, _), expected in zip(group.members, sequential):
+        assert_array_equal(exchange.ptr_b, expected.ptr_b)
+
+
+def test_exchange_skips_unchanged_source():
+    exchange = MemoryExchange(
+        np.array([1.0, 2.0, 3.0]),
+        np.array([0.0, 0.0, 0.0]),
+        np.array([0, 1, 2], dtype=np.int32),
+        np.array([2, 1, 0], dtype=np.int32),
+        ExchangeCollector(),
+        "head",
+        exchange_operator="avg",
+        track_changes=True,
+    )
+    exchange.exchange()
+    exchange.ptr_b[:] = -1.0
+    # same source and time step: the exchange is a no-op
+    exchange.exchange()
+    assert_array_equal(exchange.ptr_b, [-1.0, -1.0, -1.0])
+    exchange.exchange(2.0)
+    assert_array_equal(exchange.ptr_b, [1.5, 1.0, 0.5])
+    exchange.ptr_a[1] = 4.0
+    exchange.exchange(2.0)
+    assert_array_equal(exchange.ptr_b, [1.5, 2.0, 0.5])
+    assert exchange.n_performed == 3
+    assert exchange.n_skipped == 1
+
+
+def test_exchange_plan_to_contiguous_block_of_other_type():
+    """
+    Targets that are a contiguous block of coupled rows, but not a contiguous
+    float64 array, are assigned the exchanged values instead of being written
+    into directly.
+    """
+    source = np.array([1.0, 2.0, 3.0, 4.0])
+    targets = [
+        np.full(6, -1, dtype=np.int32),
+        np.full(12, -1.0)[::2],
+        np.full(6, -1.0),
+    ]
+    plan = ExchangePlan()
+    for ptr_b in targets:
+        plan.add(
+            MemoryExchange(
+                source,
+                ptr_b,
+                np.array([0, 1, 2, 3], dtype=np.int32),
+                np.array([1, 1, 2, 3], dtype=np.int32),
+                ExchangeCollector(),
+                "test",
+                exchange_operator="sum",
+            ),
+            divide_by_delt=True,
+        )
+    assert len(plan.groups) == 1
+    plan.exchange(0.5)
+
+    expected = [-1.0, 6.0, 6.0, 8.0, -1.0, -1.0]
+    for ptr_b in targets:
+        assert_array_equal(ptr_b, expected)
+
+
+def test_sparse_dot_without_private_scipy_kernel(monkeypatch):
+    """
+    Without SciPy's private csr_matvec, sparse_dot falls back to the public
+    mapping.dot, with the same result.
+    """
+    exchange = n_1_exchange()
+    expected = legacy_exchange(exchange, 2.0)
+    out = np.full(exchange.ptr_b.size, np.nan)
+    direct = utils.sparse_dot(exchange.mapping, exchange.ptr_a, out).copy()
+
+    monkeypatch.setattr(utils, "csr_matvec", None)
+    out[:] = np.nan
+    assert_array_equal(utils.sparse_dot(exchange.mapping, exchange.ptr_a, out), direct)
+    exchange.exchange(2.0)
+    np.testing.assert_allclose(exchange.ptr_b, expected)
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from imod_coupler.table_reader import read_table
+
+
+def test_read_fixed_width(tmp_path: Path):
+    path = tmp_path / "nodenr2svat.dxc"
+    path.write_text("         1         1 1\n        12       104 2\n")
+    table = read_table(path)
+    assert table.dtype == np.int32
+    assert_array_equal(table, [[1, 1, 1], [12, 104, 2]])
+
+
+def test_read_tab_separated_with_header(tmp_path: Path):
+    path = tmp_path / "riv.tsv"
+    path.write_text("basin_index\tbound_index\n0\t3\n2\t5\n")
+    table = read_table(path, skiprows=1)
+    assert table.dtype == np.int32
+    assert_array_equal(table, [[0, 3], [2, 5]])
+
+
+def test_read_single_row_is_two_dimensional(tmp_path: Path):
+    path = tmp_path / "rchindex2svat.dxc"
+    path.write_text("         7         3 1\n")
+    assert read_table(path).shape == (1, 3)
+
+
+def test_read_binary_table(tmp_path: Path):
+    path = tmp_path / "nodenr2svat.npy"
+    np.save(path, np.array([[1, 1, 1], [12, 104, 2]], dtype=np.int32))
+    table = read_table(path, skiprows=1)
+    assert isinstance(table, np.memmap)
+    assert_array_equal(table, [[1, 1, 1], [12, 104, 2]])
+
+
+def test_read_binary_table_wrong_dtype(tmp_path: Path):
+    path = tmp_path / "nodenr2svat.npy"
+    np.save(path, np.array([[1, 1, 1]], dtype=np.int64))
+    with pytest.raises(ValueError, match="int32"):
+        read_table(path)
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from imod_coupler.drivers.driver import initialize_kernels
+from imod_coupler.kernelwrappers.working_directory import (
+    WorkingDirectoryLock,
+    working_directory_lock,
+)
+
+
+def test_cd_restores_working_directory(tmp_path: Path):
+    lock = WorkingDirectoryLock()
+    cwd = os.getcwd()
+    with lock.cd(tmp_path):
+        assert Path.cwd() == tmp_path.resolve()
+    assert os.getcwd() == cwd
+
+
+def test_cd_shares_directory_and_serializes_others(tmp_path: Path):
+    lock = WorkingDirectoryLock()
+    cwd = os.getcwd()
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    seen: list[tuple[str, Path]] = []
+    inside = threading.Barrier(2, timeout=5.0)
+
+    def run(label: str, directory: Path, barrier: threading.Barrier | None) -> None:
+        with lock.cd(directory):
+            if barrier is not None:
+                # both threads in the same directory are inside at once
+                barrier.wait()
+            time.sleep(0.01)
+            seen.append((label, Path.cwd()))
+
+    threads = [
+        threading.Thread(target=run, args=("a", first, inside)),
+        threading.Thread(target=run, args=("b", first, inside)),
+        threading.Thread(target=run, args=("c", second, None)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expected = {"a": first.resolve(), "b": first.resolve(), "c": second.resolve()}
+    assert len(seen) == 3
+    for label, directory in seen:
+        assert directory == expected[label]
+    assert os.getcwd() == cwd
+
+
+def test_initialize_kernels_concurrent():
+    started = threading.Barrier(2, timeout=5.0)
+    done: list[str] = []
+
+    def task(label: str) -> None:
+        # only returns when both tasks run at the same time
+        started.wait()
+        done.append(label)
+
+    initialize_kernels(
+        {"a": lambda: task("a"), "b": lambda: task("b")},
+        concurrent=True,
+        timing=True,
+    )
+    assert sorted(done) == ["a", "b"]
+
+
+def test_initialize_kernels_sequential():
+    order: list[str] = []
+    initialize_kernels(
+        {"a": lambda: order.append("a"), "b": lambda: order.append("b")},
+        concurrent=False,
+        timing=False,
+    )
+    assert order == ["a", "b"]
+
+
+def test_initialize_kernels_logs_when_directories_differ(tmp_path: Path):
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    first_inside = threading.Event()
+
+    def task(directory: Path) -> None:
+        with working_directory_lock.cd(directory):
+            first_inside.set()
+            time.sleep(0.05)
+
+    def wait_then_task(directory: Path) -> None:
+        # only enters the lock once the first task holds it
+        first_inside.wait(timeout=5.0)
+        task(directory)
+
+    messages: list[str] = []
+    handler = logger.add(messages.append, format="{message}")
+    try:
+        initialize_kernels(
+            {"a": lambda: task(first), "b": lambda: wait_then_task(second)},
+            concurrent=True,
+            timing=True,
+        )
+    finally:
+        logger.remove(handler)
+    assert any("could not initialize at the same time" in m for m in messages)
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import xarray as xr
+from primod.manifest import WriteManifest, write_incremental
+
+
+def test_hash_inputs():
+    def make_dataset(value: float) -> xr.Dataset:
+        da = xr.DataArray(
+            np.full((2, 3), value), coords={"y": [1.0, 0.0], "x": [0, 1, 2]}
+        )
+        return xr.Dataset({"rate": da, "name": "rch"})
+
+    hash_inputs = WriteManifest.hash_inputs
+    assert hash_inputs(make_dataset(1.0)) == hash_inputs(make_dataset(1.0))
+    assert hash_inputs(make_dataset(1.0)) != hash_inputs(make_dataset(2.0))
+    assert hash_inputs({"a": 1}) != hash_inputs({"b": 1})
+    assert hash_inputs([1, 2], 3) != hash_inputs([1], 2, 3)
+    df = pd.DataFrame({"node_id": [1, 2], "level": [0.5, 1.0]})
+    assert hash_inputs(df) == hash_inputs(df.copy())
+    assert hash_inputs(df) != hash_inputs(df.rename(columns={"level": "area"}))
+
+
+def test_write_incremental(tmp_path):
+    written = []
+
+    def write() -> tuple[dict, list]:
+        written.append(1)
+        (tmp_path / "model").mkdir(exist_ok=True)
+        (tmp_path / "model" / "model.txt").write_text("model")
+        return {"filename": "model.txt"}, [tmp_path / "model"]
+
+    manifest = WriteManifest(tmp_path)
+    result = write_incremental(manifest, "model", (1.0,), write)
+    manifest.save()
+    assert result == {"filename": "model.txt"}
+    assert len(written) == 1
+
+    manifest = WriteManifest(tmp_path)
+    assert write_incremental(manifest, "model", (1.0,), write) == result
+    assert len(written) == 1
+    write_incremental(manifest, "model", (2.0,), write)
+    assert len(written) == 2
+
+    (tmp_path / "model" / "model.txt").unlink()
+    write_incremental(manifest, "model", (2.0,), write)
+    assert len(written) == 3
+
+    write_incremental(None, "model", (2.0,), write)
+    assert len(written) == 4
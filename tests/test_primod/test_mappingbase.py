@@ -0,0 +1,91 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from imod.msw.fixed_format import VariableMetaData, format_fixed_width
+from primod.mapping import mappingbase
+from primod.mapping.node_svat_mapping import NodeSvatMapping
+
+
+def reference_fixed_width(dataframe: pd.DataFrame, metadata_dict: dict) -> str:
+    lines = []
+    for row in dataframe.itertuples(index=False):
+        lines.append(
+            "".join(
+                format_fixed_width(value, metadata)
+                for value, metadata in zip(row, metadata_dict.values())
+            )
+        )
+    return "".join(line + "\n" for line in lines)
+
+
+@pytest.mark.parametrize(
+    "mod_id",
+    [
+        np.array([1, 9, 10, 9999999, 1234567], dtype=np.int64),
+        np.array([0, 1, 100, 10, 5], dtype=np.int32),
+        np.array([1.0, 2.9, 10.0, 9999999.0, 0.5]),
+        # wider than the column, falls back to formatting value by value
+        np.array([1, 2, 3, 4, 12345678901]),
+    ],
+)
+def test_write_dataframe_fixed_width(mod_id):
+    dataframe = pd.DataFrame(
+        {
+            "mod_id": mod_id,
+            "free": "",
+            "svat": np.array([1, 2, 3, 4, 5]),
+            "layer": np.array([1, 1, 1, 2, 9999]),
+        }
+    )
+    mapping = NodeSvatMapping.__new__(NodeSvatMapping)
+    file = io.StringIO()
+    mapping.write_dataframe_fixed_width(file, dataframe)
+    assert file.getvalue() == reference_fixed_width(
+        dataframe, NodeSvatMapping._metadata_dict
+    )
+
+
+def test_write_dataframe_fixed_width_strings():
+    metadata_dict = {
+        "name": VariableMetaData(4, None, None, str),
+        "value": VariableMetaData(3, 0, 999, int),
+    }
+    dataframe = pd.DataFrame({"name": ["a", "bcd", ""], "value": [1, 0, 999]})
+    mapping = NodeSvatMapping.__new__(NodeSvatMapping)
+    mapping._metadata_dict = metadata_dict
+    file = io.StringIO()
+    mapping.write_dataframe_fixed_width(file, dataframe)
+    assert file.getvalue() == reference_fixed_width(dataframe, metadata_dict)
+
+
+def test_write_columns_fixed_width_in_blocks(monkeypatch):
+    monkeypatch.setattr(mappingbase, "_WRITE_BLOCK_ROWS", 2)
+    columns = {
+        "mod_id": np.array([1, 2, 3, 4, 12345678901]),
+        "svat": np.array([1, 2, 3, 4, 5]),
+        "layer": np.array([1, 1, 1, 2, 9999]),
+    }
+    mapping = NodeSvatMapping.__new__(NodeSvatMapping)
+    file = io.StringIO()
+    mapping.write_columns_fixed_width(file, columns)
+    dataframe = pd.DataFrame({**columns, "free": ""})[list(mapping._metadata_dict)]
+    assert file.getvalue() == reference_fixed_width(
+        dataframe, NodeSvatMapping._metadata_dict
+    )
+
+
+def test_check_range():
+    mapping = NodeSvatMapping.__new__(NodeSvatMapping)
+    mapping._check_range(
+        {
+            "mod_id": np.array([1.0, np.nan, 9999999.0]),
+            "svat": np.array([], dtype=np.int32),
+            "layer": np.array([0, 9999]),
+        }
+    )
+    with pytest.raises(ValueError, match="layer"):
+        mapping._check_range({"layer": np.array([np.nan, 10000.0])})
+    with pytest.raises(ValueError, match="svat"):
+        mapping._check_range({"svat": np.array([0, 1])})
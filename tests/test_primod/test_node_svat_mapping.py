@@ -7,6 +7,7 @@ import xarray as xr
 from imod import mf6
 from numpy.testing import assert_equal
 from primod import mapping
+from primod.mapping import mappingbase
 
 
 def test_simple_model(fixed_format_parser):
@@ -60,6 +61,62 @@ def test_simple_model(fixed_format_parser):
     assert_equal(results["layer"], np.array([1, 1, 1, 1]))
 
 
+def test_simple_model_chunked(fixed_format_parser, monkeypatch, tmp_path):
+    # write the mapping of a dask-backed svat grid one row at a time
+    monkeypatch.setattr(mappingbase, "_WRITE_BLOCK_ROWS", 1)
+    x = [1.0, 2.0, 3.0]
+    y = [3.0, 2.0, 1.0]
+    subunit = [0, 1]
+    dx = 1.0
+    dy = -1.0
+    # fmt: off
+    svat = xr.DataArray(
+        np.array(
+            [
+                [[0, 1, 0],
+                 [0, 0, 0],
+                 [0, 2, 0]],
+
+                [[0, 3, 0],
+                 [0, 4, 0],
+                 [0, 0, 0]],
+            ]
+        ),
+        dims=("subunit", "y", "x"),
+        coords={"subunit": subunit, "y": y, "x": x, "dx": dx, "dy": dy}
+    )
+    # fmt: on
+    index = (svat != 0).to_numpy().ravel()
+
+    like = xr.full_like(svat.sel(subunit=1, drop=True), 1.0, dtype=float).expand_dims(
+        layer=[1, 2, 3]
+    )
+
+    dis = mf6.StructuredDiscretization(
+        top=1.0,
+        bottom=xr.full_like(like, 0.0),
+        idomain=xr.full_like(like, 1, dtype=int),
+    )
+
+    grid_data = mapping.node_svat_mapping.NodeSvatMapping(
+        svat.chunk({"y": 1}), dis, index=index
+    )
+    grid_data.write(tmp_path)
+    grid_data.write(tmp_path, binary=True)
+
+    results = fixed_format_parser(
+        tmp_path / mapping.node_svat_mapping.NodeSvatMapping._file_name,
+        mapping.node_svat_mapping.NodeSvatMapping._metadata_dict,
+    )
+    assert_equal(results["mod_id"], np.array([2, 8, 2, 5]))
+    assert_equal(results["svat"], np.array([1, 2, 3, 4]))
+    assert_equal(results["layer"], np.array([1, 1, 1, 1]))
+    assert_equal(
+        np.load(tmp_path / "nodenr2svat.npy"),
+        np.array([[2, 1, 1], [8, 2, 1], [2, 3, 1], [5, 4, 1]], dtype=np.int32),
+    )
+
+
 def test_simple_model_1_subunit(fixed_format_parser):
     x = [1.0, 2.0, 3.0]
     y = [3.0, 2.0, 1.0]
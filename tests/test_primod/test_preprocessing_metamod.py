@@ -1,13 +1,18 @@
 import numpy as np
 import pytest
+import xarray as xr
+from imod import mf6
 from numpy.testing import assert_equal
 from primod import MetaMod, MetaModDriverCoupling
+from primod.manifest import WriteManifest
 from primod.mapping import (
     NodeSvatMapping,
     RechargeSvatMapping,
     WellSvatMapping,
 )
 
+from imod_coupler.table_reader import read_table
+
 # tomllib part of Python 3.11, else use tomli
 try:
     import tomllib
@@ -43,6 +48,31 @@ def test_metamod_write(prepared_msw_model, coupled_mf6_model, tmp_path):
     assert len(list(output_dir.rglob(r"*.wel"))) == 1
 
 
+def test_metamod_write_incremental(prepared_msw_model, coupled_mf6_model, tmp_path):
+    output_dir = tmp_path / "metamod"
+
+    driver_coupling = MetaModDriverCoupling(
+        mf6_model="GWF_1", mf6_wel_package="wells_msw", mf6_recharge_package="rch_msw"
+    )
+    coupled_models = MetaMod(
+        prepared_msw_model,
+        coupled_mf6_model,
+        coupling_list=[driver_coupling],
+    )
+
+    args = (output_dir, "./modflow6.dll", "./metaswap.dll", "./metaswap")
+    coupled_models.write(*args, incremental=True)
+    assert (output_dir / WriteManifest.file_name).exists()
+    modified = {
+        path: path.stat().st_mtime_ns
+        for path in output_dir.rglob("*")
+        if path.suffix in (".dxc", ".inp", ".bin", ".nam")
+    }
+
+    coupled_models.write(*args, incremental=True)
+    assert {path: path.stat().st_mtime_ns for path in modified} == modified
+
+
 def test_metamod_write_exchange(
     prepared_msw_model, coupled_mf6_model, fixed_format_parser, tmp_path
 ):
@@ -112,6 +142,136 @@ def test_metamod_write_exchange(
     )
 
 
+def test_metamod_write_exchange_binary(prepared_msw_model, coupled_mf6_model, tmp_path):
+    driver_coupling = MetaModDriverCoupling(
+        mf6_model="GWF_1", mf6_wel_package="wells_msw", mf6_recharge_package="rch_msw"
+    )
+    coupled_models = MetaMod(
+        prepared_msw_model, coupled_mf6_model, coupling_list=[driver_coupling]
+    )
+
+    text_dict = coupled_models.write_exchanges(tmp_path / "text")
+    binary_dict = coupled_models.write_exchanges(tmp_path / "binary", binary=True)
+
+    for key in (
+        "mf6_msw_node_map",
+        "mf6_msw_recharge_map",
+        "mf6_msw_sprinkling_map_groundwater",
+    ):
+        assert binary_dict[key].endswith(".npy")
+        binary_table = read_table(tmp_path / "binary" / binary_dict[key])
+        text_table = read_table(tmp_path / "text" / text_dict[key])
+        assert_equal(binary_table, text_table)
+
+
+def test_metamod_write_exchanges_n_workers(
+    prepared_msw_model, coupled_mf6_model, tmp_path
+):
+    driver_coupling = MetaModDriverCoupling(
+        mf6_model="GWF_1", mf6_wel_package="wells_msw", mf6_recharge_package="rch_msw"
+    )
+    coupled_models = MetaMod(
+        prepared_msw_model, coupled_mf6_model, coupling_list=[driver_coupling]
+    )
+
+    serial_dict = coupled_models.write_exchanges(tmp_path / "serial")
+    parallel_dict = coupled_models.write_exchanges(tmp_path / "parallel", n_workers=3)
+
+    assert list(parallel_dict.items()) == list(serial_dict.items())
+    for mapping in (NodeSvatMapping, RechargeSvatMapping, WellSvatMapping):
+        filename = f"exchanges/{mapping._file_name}"
+        serial_text = (tmp_path / "serial" / filename).read_text()
+        parallel_text = (tmp_path / "parallel" / filename).read_text()
+        assert parallel_text == serial_text
+
+    with pytest.raises(ValueError, match="n_workers"):
+        coupled_models.write_exchanges(tmp_path / "invalid", n_workers=0)
+
+
+def test_metamod_write_exchanges_incremental(
+    prepared_msw_model, coupled_mf6_model, tmp_path, monkeypatch
+):
+    driver_coupling = MetaModDriverCoupling(
+        mf6_model="GWF_1", mf6_wel_package="wells_msw", mf6_recharge_package="rch_msw"
+    )
+    coupled_models = MetaMod(
+        prepared_msw_model, coupled_mf6_model, coupling_list=[driver_coupling]
+    )
+    derived = []
+    derive_mapping = MetaModDriverCoupling.derive_mapping
+    monkeypatch.setattr(
+        MetaModDriverCoupling,
+        "derive_mapping",
+        lambda self, **kwargs: derived.append(1) or derive_mapping(self, **kwargs),
+    )
+
+    def write_exchanges() -> dict:
+        manifest = WriteManifest(tmp_path)
+        coupling_dict = coupled_models.write_exchanges(tmp_path, manifest=manifest)
+        manifest.save()
+        return coupling_dict
+
+    coupling_dict = write_exchanges()
+    node_map = tmp_path / coupling_dict["mf6_msw_node_map"]
+    modified = node_map.stat().st_mtime_ns
+    assert len(derived) == 1
+
+    # unchanged inputs and outputs
+    assert write_exchanges() == coupling_dict
+    assert len(derived) == 1
+    assert node_map.stat().st_mtime_ns == modified
+
+    # modified output
+    node_map.write_text("")
+    assert write_exchanges() == coupling_dict
+    assert len(derived) == 2
+    assert node_map.read_text() != ""
+
+    # modified input
+    rch = coupled_mf6_model["GWF_1"]["rch_msw"]
+    rch.dataset["rate"] = rch.dataset["rate"] + 0.001
+    write_exchanges()
+    assert len(derived) == 3
+
+
+def test_metamod_write_exchanges_incremental_conductivity(
+    prepared_msw_model, coupled_mf6_model, fixed_format_parser, tmp_path
+):
+    # Wells with a screen over layers 2 and 3 are assigned to the layers with a
+    # conductivity of at least minimum_k: initially only layer 3
+    gwf_model = coupled_mf6_model["GWF_1"]
+    layered_well = gwf_model["wells_msw"].dataset
+    gwf_model["wells_msw"] = mf6.Well(
+        x=layered_well["x"].to_numpy(),
+        y=layered_well["y"].to_numpy(),
+        screen_top=np.full(layered_well["x"].size, -5.0),
+        screen_bottom=np.full(layered_well["x"].size, -50.0),
+        rate=np.zeros(layered_well["x"].size),
+        minimum_k=0.1,
+    )
+    driver_coupling = MetaModDriverCoupling(
+        mf6_model="GWF_1", mf6_wel_package="wells_msw", mf6_recharge_package="rch_msw"
+    )
+    coupled_models = MetaMod(
+        prepared_msw_model, coupled_mf6_model, coupling_list=[driver_coupling]
+    )
+
+    def write_exchanges() -> dict:
+        manifest = WriteManifest(tmp_path)
+        coupling_dict = coupled_models.write_exchanges(tmp_path, manifest=manifest)
+        manifest.save()
+        return fixed_format_parser(
+            tmp_path / coupling_dict["mf6_msw_sprinkling_map_groundwater"],
+            WellSvatMapping._metadata_dict,
+        )
+
+    assert set(write_exchanges()["layer"]) == {3}
+
+    # a conductive second layer changes the layers the wells are assigned to
+    gwf_model["npf"].dataset["k"] = xr.ones_like(gwf_model["npf"].dataset["k"])
+    assert set(write_exchanges()["layer"]) == {2, 3}
+
+
 def test_metamod_write_exchange_no_sprinkling(
     prepared_msw_model, coupled_mf6_model, fixed_format_parser, tmp_path
 ):
@@ -137,6 +137,37 @@ def test_ribamod_write(
     assert exchange_df.equals(expected_df)
 
 
+def test_ribamod_write_exchanges_n_workers(
+    ribasim_bucket_model, mf6_bucket_model, basin_definition, tmp_path
+):
+    mf6_modelname, mf6_model = get_mf6_gwf_modelnames(mf6_bucket_model)[0]
+    conductance = mf6_model["riv-1"]["conductance"]
+    bottom_elevation = mf6_model["riv-1"]["bottom_elevation"]
+    mf6_packages = ["drn-1", "drn-2", "drn-3"]
+    for key in mf6_packages:
+        mf6_model[key] = Drainage(elevation=bottom_elevation, conductance=conductance)
+
+    driver_coupling = RibaModPassiveDriverCoupling(
+        mf6_model=mf6_modelname,
+        ribasim_basin_definition=basin_definition,
+        mf6_packages=mf6_packages,
+    )
+    coupled_models = RibaMod(
+        ribasim_bucket_model,
+        mf6_bucket_model,
+        coupling_list=[driver_coupling],
+    )
+    serial_dict = coupled_models.write_exchanges(tmp_path / "serial")
+    parallel_dict = coupled_models.write_exchanges(tmp_path / "parallel", n_workers=3)
+
+    assert parallel_dict == serial_dict
+    assert list(parallel_dict["mf6_passive_drainage_packages"]) == mf6_packages
+    for filename in serial_dict["mf6_passive_drainage_packages"].values():
+        serial_df = pd.read_csv(tmp_path / "serial" / filename, sep="\t")
+        parallel_df = pd.read_csv(tmp_path / "parallel" / filename, sep="\t")
+        assert parallel_df.equals(serial_df)
+
+
 def test_ribamod_write_toml(
     ribasim_bucket_model, mf6_bucket_model, basin_definition, tmp_path
 ):
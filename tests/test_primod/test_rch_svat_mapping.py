@@ -7,6 +7,7 @@ import xarray as xr
 from imod import mf6
 from numpy import nan
 from numpy.testing import assert_equal
+from primod.mapping import mappingbase
 from primod.mapping.rch_svat_mapping import RechargeSvatMapping
 
 
@@ -62,6 +63,60 @@ def test_simple_model(fixed_format_parser):
     assert_equal(results["layer"], np.array([1, 1, 1, 1]))
 
 
+def test_simple_model_chunked(fixed_format_parser, monkeypatch, tmp_path):
+    # write the mapping of a dask-backed svat grid one row at a time
+    monkeypatch.setattr(mappingbase, "_WRITE_BLOCK_ROWS", 1)
+    x = [1.0, 2.0, 3.0]
+    y = [3.0, 2.0, 1.0]
+    subunit = [0, 1]
+    dx = 1.0
+    dy = -1.0
+    # fmt: off
+    svat = xr.DataArray(
+        np.array(
+            [
+                [[0, 1, 0],
+                 [0, 0, 0],
+                 [0, 2, 0]],
+
+                [[0, 3, 0],
+                 [0, 4, 0],
+                 [0, 0, 0]],
+            ]
+        ),
+        dims=("subunit", "y", "x"),
+        coords={"subunit": subunit, "y": y, "x": x, "dx": dx, "dy": dy}
+    )
+    index = (svat != 0).to_numpy().ravel()
+    rate = xr.DataArray(
+        np.array(
+            [[nan, 0.0, 0.0],
+             [nan, 0.0, 0.0],
+             [nan, 0.0, 0.0]],
+        ),
+        dims=("y", "x"),
+        coords={"layer": 1, "y": y, "x": x}
+    )
+    # fmt: on
+    recharge = mf6.Recharge(rate)
+
+    grid_data = RechargeSvatMapping(svat.chunk({"y": 1}), recharge, index=index)
+    grid_data.write(tmp_path)
+    grid_data.write(tmp_path, binary=True)
+
+    results = fixed_format_parser(
+        tmp_path / RechargeSvatMapping._file_name,
+        RechargeSvatMapping._metadata_dict,
+    )
+    assert_equal(results["rch_id"], np.array([1, 5, 1, 3]))
+    assert_equal(results["svat"], np.array([1, 2, 3, 4]))
+    assert_equal(results["layer"], np.array([1, 1, 1, 1]))
+    assert_equal(
+        np.load(tmp_path / "rchindex2svat.npy"),
+        np.array([[1, 1, 1], [5, 2, 1], [1, 3, 1], [3, 4, 1]], dtype=np.int32),
+    )
+
+
 def test_simple_model_1_subunit(fixed_format_parser):
     x = [1.0, 2.0, 3.0]
     y = [3.0, 2.0, 1.0]
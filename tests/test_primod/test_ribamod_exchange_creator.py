@@ -197,6 +197,29 @@ def test_get_conductance_xy():
     )
 
 
+def test_get_conductance_xy_layered():
+    rng = np.random.default_rng(0)
+    data = np.where(rng.random((3, 7, 6)) < 0.3, 1.0, np.nan)
+    coords = {
+        "layer": [1, 2, 3],
+        "y": np.arange(7.0, 0.0, -1.0),
+        "x": np.arange(6.0) + 0.5,
+    }
+    da = xr.DataArray(data=data, coords=coords, dims=("layer", "y", "x"))
+    include = da.notnull().to_numpy()
+    xy = ActiveNodeBasinMapping._get_conductance_xy(da, include)
+
+    yy, xx = np.meshgrid(coords["y"], coords["x"], indexing="ij")
+    expected = np.column_stack(
+        (
+            np.broadcast_to(xx, include.shape)[include],
+            np.broadcast_to(yy, include.shape)[include],
+        )
+    )
+    assert xy.shape == (include.sum(), 2)
+    np.testing.assert_array_equal(xy, expected)
+
+
 def test_find_nearest_subgrid_elements():
     conductance_xy = np.array(
         [